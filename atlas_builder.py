@@ -0,0 +1,143 @@
+"""Сборка атласов кадров для папок Спрайты/<папка>.
+
+Запуск: python atlas_builder.py [папка ...]
+Без аргументов собирает атласы для всех персонажей и стендов. Для каждой
+пары (папка, префикс) кадры из таблиц анимаций упаковываются в несколько
+листов <префикс>_atlas_<n>.png и индекс <префикс>_atlas.json рядом с ними.
+Прозрачные поля кадров обрезаются, а в индексе сохраняется смещение центра
+обрезанного кадра относительно центра исходного (в пикселях, ось Y вверх),
+чтобы на экране кадр оказался на прежнем месте. Флаг --no-trim отключает обрезку.
+После изменения кадров или таблиц анимаций атлас нужно пересобрать.
+"""
+import json
+import sys
+from pathlib import Path
+
+from PIL import Image
+
+from harakteristici import CHARACTERS_DB, STANDS_DB, get_used_frames, get_used_stand_frames
+
+SPRITES_ROOT = Path("Спрайты")
+ATLAS_MAX_SIZE = 4096
+ATLAS_PADDING = 1
+ATLAS_VERSION = 2
+
+
+def get_atlas_sources():
+    """Все пары (папка, префикс) с номерами кадров, которые использует игра"""
+    sources = {}
+    for name, data in CHARACTERS_DB.items():
+        sources[(name, data["file_prefix"])] = get_used_frames(name)
+    for name, data in STANDS_DB.items():
+        key = (data["folder_name"], data["file_prefix"])
+        frames = set(sources.get(key, [])) | set(get_used_stand_frames(name))
+        sources[key] = sorted(frames)
+    return sources
+
+
+def get_atlas_index_path(folder, prefix, sprites_root=SPRITES_ROOT):
+    return Path(sprites_root) / folder / f"{prefix}_atlas.json"
+
+
+def trim_frame(image):
+    """Обрезка по непрозрачной области: (картинка, смещение_x, смещение_y)"""
+    width, height = image.size
+    bbox = image.getchannel("A").getbbox()
+    if bbox is None:
+        bbox = (0, 0, 1, 1)
+    left, top, right, bottom = bbox
+    offset_x = (left + right) / 2 - width / 2
+    offset_y = height / 2 - (top + bottom) / 2
+    return image.crop(bbox), offset_x, offset_y
+
+
+def pack_shelves(sizes, max_size=ATLAS_MAX_SIZE, padding=ATLAS_PADDING):
+    """Раскладка прямоугольников по полкам: [(лист, x, y)] в порядке sizes"""
+    placements = []
+    sheet, x, y, shelf_height = 0, 0, 0, 0
+    for width, height in sizes:
+        if x + width > max_size:
+            x = 0
+            y += shelf_height + padding
+            shelf_height = 0
+        if y + height > max_size:
+            sheet += 1
+            x, y, shelf_height = 0, 0, 0
+        placements.append((sheet, x, y))
+        x += width + padding
+        shelf_height = max(shelf_height, height)
+    return placements
+
+
+def build_atlas(folder, prefix, frames, sprites_root=SPRITES_ROOT, trim=True):
+    folder_path = Path(sprites_root) / folder
+    images = {}
+    anchors = {}
+    missing = []
+    for i in frames:
+        file_path = folder_path / f"{prefix}_0-{i}.png"
+        if file_path.exists():
+            image = Image.open(file_path).convert("RGBA")
+            source_width, source_height = image.size
+            offset_x, offset_y = 0, 0
+            if trim:
+                image, offset_x, offset_y = trim_frame(image)
+            images[i] = image
+            anchors[i] = [offset_x, offset_y, source_width, source_height]
+        else:
+            missing.append(i)
+    # Высокие кадры первыми - полки заполняются плотнее
+    order = sorted(images, key=lambda i: (-images[i].size[1], i))
+    placements = pack_shelves([images[i].size for i in order])
+    sheet_sizes = {}
+    for i, (sheet, x, y) in zip(order, placements):
+        width, height = images[i].size
+        old_w, old_h = sheet_sizes.get(sheet, (0, 0))
+        sheet_sizes[sheet] = (max(old_w, x + width), max(old_h, y + height))
+    sheets = [Image.new("RGBA", sheet_sizes[n], (0, 0, 0, 0)) for n in sorted(sheet_sizes)]
+    index_frames = {}
+    for i, (sheet, x, y) in zip(order, placements):
+        sheets[sheet].paste(images[i], (x, y))
+        width, height = images[i].size
+        index_frames[str(i)] = [sheet, x, y, width, height] + anchors[i]
+    for old_sheet in folder_path.glob(f"{prefix}_atlas_*.png"):
+        old_sheet.unlink()
+    sheet_names = []
+    for n, sheet_image in enumerate(sheets):
+        sheet_name = f"{prefix}_atlas_{n}.png"
+        sheet_image.save(folder_path / sheet_name, optimize=True)
+        sheet_names.append(sheet_name)
+    index = {
+        "version": ATLAS_VERSION,
+        "prefix": prefix,
+        "sheets": sheet_names,
+        "frames": index_frames,
+        "missing": missing,
+    }
+    with open(get_atlas_index_path(folder, prefix, sprites_root), "w", encoding="utf-8") as f:
+        json.dump(index, f)
+    return index
+
+
+def main(folders=None, trim=True):
+    source_pixels = 0
+    atlas_pixels = 0
+    for (folder, prefix), frames in get_atlas_sources().items():
+        if folders and folder not in folders:
+            continue
+        if not (SPRITES_ROOT / folder).exists():
+            print(f"Нет папки {SPRITES_ROOT / folder}, пропускаем")
+            continue
+        index = build_atlas(folder, prefix, frames, trim=trim)
+        print(f"{folder}/{prefix}: кадров {len(index['frames'])}, листов {len(index['sheets'])}, "
+              f"отсутствует {len(index['missing'])}")
+        for sheet, x, y, width, height, offset_x, offset_y, source_width, source_height in index["frames"].values():
+            source_pixels += source_width * source_height
+            atlas_pixels += width * height
+    if source_pixels:
+        print(f"Пикселей кадров: {atlas_pixels} из {source_pixels} ({100 * atlas_pixels / source_pixels:.0f}%)")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    main([a for a in args if a != "--no-trim"], trim="--no-trim" not in args)
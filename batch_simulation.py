@@ -0,0 +1,990 @@
+"""Пакетная симуляция боёв на NumPy для подбора баланса.
+
+BatchMatch ведёт N независимых матчей одновременно: координаты, скорости,
+здоровье, шкала стенда, перезарядки и таймеры бойцов и стендов хранятся
+массивами длины N, а каждый кадр считается масками по тем же правилам, что
+FighterState, StandState и Match из simulation.py. Звуки не считаются,
+закончившийся матч замирает на кадре, где у бойца кончилось здоровье.
+
+Запуск: python batch_simulation.py [матчей_на_пару] [seed]
+Печатает долю побед и урон в секунду для каждой пары персонажей.
+Нужен numpy (pip install numpy); сама игра от него не зависит.
+"""
+import sys
+
+import numpy as np
+
+from harakteristici import (
+    SCREEN_WIDTH, SCREEN_HEIGHT, GRAVITY, GROUND_LEVEL,
+    get_available_characters,
+    get_character_data,
+    get_stand_data
+)
+from simulation import (
+    BLOCK_DURATION, KNOCKBACK_DURATION, INTRO_ANIMATION_DURATION,
+    STAND_METER_MAX, STAND_METER_SUMMON_COST,
+    STAND_METER_BLOCK_DRAIN, STAND_METER_BLOCK_DRAIN_NO_STAND,
+    STAND_METER_GAIN_ON_HIT, STAND_METER_GAIN_ON_BLOCK,
+    STAND_METER_GAIN_ON_ATTACK, STAND_METER_PASSIVE_GAIN,
+    STAND_DAMAGE_DRAIN, STAND_DAMAGE_DRAIN_NO_STAND,
+    DEFAULT_FRAME_SIZE,
+    INPUT_LEFT, INPUT_RIGHT, INPUT_UP, INPUT_DOWN, INPUT_DASH,
+    INPUT_ATTACK1, INPUT_ATTACK2, INPUT_ATTACK3, INPUT_STAND, INPUT_RUSH,
+    get_fighter_frame_sizes
+)
+
+FPS = 60
+# Матч, не закончившийся за это число кадров боя, считается ничьей
+BATCH_MAX_FIGHT_FRAMES = 5 * 60 * FPS
+
+ACTIONS = (
+    "idle", "move_left", "move_right", "jump", "crouch", "dash_forward", "dash_backward",
+    "stand_summon", "attack1", "attack2", "attack3", "stand_attack1", "stand_attack2", "stand_attack3",
+    "hit", "intro", "victory", "defeat"
+)
+STAND_ACTIONS = (
+    "idle", "block", "move_forward", "move_backward", "jump", "dash_forward", "dash_backward",
+    "summon", "attack1", "attack2", "attack3", "rush"
+)
+ATTACKS = ("attack1", "attack2", "attack3", "stand_attack1", "stand_attack2", "stand_attack3")
+
+IDLE, MOVE_LEFT, MOVE_RIGHT, JUMP, CROUCH, DASH_FORWARD, DASH_BACKWARD = range(7)
+STAND_SUMMON, ATTACK1, ATTACK2, ATTACK3, STAND_ATTACK1, STAND_ATTACK2, STAND_ATTACK3 = range(7, 14)
+HIT, INTRO, VICTORY, DEFEAT = range(14, 18)
+(S_IDLE, S_BLOCK, S_MOVE_FORWARD, S_MOVE_BACKWARD, S_JUMP, S_DASH_FORWARD, S_DASH_BACKWARD,
+ S_SUMMON, S_ATTACK1, S_ATTACK2, S_ATTACK3, S_RUSH) = range(12)
+# current_attack: номер в ATTACKS, NO_ATTACK для None и RUSH_ATTACK для "stand_rush"
+NO_ATTACK = -1
+RUSH_ATTACK = len(ATTACKS)
+
+_ATTACK_ACTIONS = np.array([ATTACK1, ATTACK2, ATTACK3, STAND_ATTACK1, STAND_ATTACK2, STAND_ATTACK3])
+# Куда стенд повторяет действие бойца, -1 - не повторяет
+_STAND_FOLLOW = np.full(len(ACTIONS), -1)
+_STAND_FOLLOW[[IDLE, MOVE_LEFT, MOVE_RIGHT, JUMP, CROUCH, DASH_FORWARD, DASH_BACKWARD]] = [
+    S_IDLE, S_MOVE_BACKWARD, S_MOVE_FORWARD, S_JUMP, S_IDLE, S_DASH_FORWARD, S_DASH_BACKWARD]
+
+
+class CharacterTables:
+    """Данные персонажей и стендов в виде массивов; строка - номер персонажа в roster"""
+
+    def __init__(self, roster):
+        self.roster = list(roster)
+        count = len(self.roster)
+        self.index = {name: c for c, name in enumerate(self.roster)}
+        self.has_action = np.zeros((count, len(ACTIONS)), bool)
+        self.action_start = np.zeros((count, len(ACTIONS)), np.int64)
+        self.action_end = np.zeros((count, len(ACTIONS)), np.int64)
+        self.action_speed = np.zeros((count, len(ACTIONS)), np.int64)
+        self.idle_speed = np.zeros(count, np.int64)
+        self.max_health = np.zeros(count)
+        self.movement_speed = np.zeros(count)
+        self.jump_speed = np.zeros(count)
+        self.dash_speed = np.zeros(count)
+        self.dash_distance = np.zeros(count)
+        self.dash_cooldown = np.zeros(count, np.int64)
+        self.hurtbox_half_w = np.zeros(count, np.int64)
+        self.hurtbox_half_h = np.zeros(count, np.int64)
+        self.sprite_scale = np.zeros(count)
+        self.stand_damage_drain = np.zeros(count)
+        self.stand_damage_drain_no_stand = np.zeros(count)
+        self.has_jump_loop = np.zeros(count, bool)
+        self.jump_loop_start = np.zeros(count, np.int64)
+        self.jump_loop_end = np.zeros(count, np.int64)
+        self.crouch_hold_frame = np.zeros(count, np.int64)
+        self.has_attack = np.zeros((count, len(ATTACKS)), bool)
+        self.attack_active_start = np.zeros((count, len(ATTACKS)), np.int64)
+        self.attack_active_end = np.zeros((count, len(ATTACKS)), np.int64)
+        self.attack_w = np.zeros((count, len(ATTACKS)), np.int64)
+        self.attack_h = np.zeros((count, len(ATTACKS)), np.int64)
+        self.attack_offset_x = np.zeros((count, len(ATTACKS)), np.int64)
+        self.attack_offset_y = np.zeros((count, len(ATTACKS)), np.int64)
+        self.attack_damage = np.zeros((count, len(ATTACKS)))
+        self.attack_knockback = np.zeros((count, len(ATTACKS)))
+        self.has_rush = np.zeros(count, bool)
+        self.rush_cooldown = np.zeros(count, np.int64)
+        self.rush_damage = np.zeros(count)
+        self.rush_knockback = np.zeros(count)
+        self.rush_w = np.zeros(count, np.int64)
+        self.rush_h = np.zeros(count, np.int64)
+        self.stand_has_action = np.zeros((count, len(STAND_ACTIONS)), bool)
+        self.stand_action_start = np.zeros((count, len(STAND_ACTIONS)), np.int64)
+        self.stand_action_end = np.zeros((count, len(STAND_ACTIONS)), np.int64)
+        self.stand_action_speed = np.full((count, len(STAND_ACTIONS)), 5, np.int64)
+        self.stand_has_jump_loop = np.zeros(count, bool)
+        self.stand_jump_loop_start = np.zeros(count, np.int64)
+        self.stand_jump_loop_end = np.zeros(count, np.int64)
+        self.rush_main_start = np.zeros(count, np.int64)
+        self.rush_main_end = np.zeros(count, np.int64)
+        self.rush_active_start = np.zeros(count, np.int64)
+        self.rush_attack_start = np.zeros(count, np.int64)
+        self.rush_attack_end = np.zeros(count, np.int64)
+        self.rush_offset_x = np.zeros(count)
+        self.rush_offset_y = np.zeros(count)
+        frame_sizes = [get_fighter_frame_sizes(name) for name in self.roster]
+        max_frame = max([0] + [max(sizes, default=0) for sizes in frame_sizes])
+        for name in self.roster:
+            for (start, end), speed in get_character_data(name)["animations"].values():
+                max_frame = max(max_frame, end)
+        self.frame_w = np.full((count, max_frame + 2), float(DEFAULT_FRAME_SIZE[0]))
+        self.frame_h = np.full((count, max_frame + 2), float(DEFAULT_FRAME_SIZE[1]))
+        for c, name in enumerate(self.roster):
+            self._fill_character(c, get_character_data(name), frame_sizes[c])
+            self._fill_stand(c, get_stand_data(name))
+
+    def _fill_character(self, c, data, frame_sizes):
+        base_speed = data.get("animation_speed", 5)
+        animations = data["animations"]
+        for a, action in enumerate(ACTIONS):
+            if action in animations:
+                (start, end), speed = animations[action]
+                self.has_action[c, a] = True
+                self.action_start[c, a] = start
+                self.action_end[c, a] = end
+                self.action_speed[c, a] = speed
+        self.idle_speed[c] = animations["idle"][1] if "idle" in animations else base_speed
+        self.max_health[c] = data.get("health", 100)
+        self.movement_speed[c] = data.get("movement_speed", 3)
+        self.jump_speed[c] = data.get("jump_speed", 15)
+        self.dash_speed[c] = data.get("dash_speed", 8)
+        self.dash_distance[c] = data.get("dash_distance", 100)
+        self.dash_cooldown[c] = data.get("dash_cooldown", 45)
+        width, height = data.get("hitbox_size", (60, 120))
+        self.hurtbox_half_w[c] = width // 2
+        self.hurtbox_half_h[c] = height // 2
+        self.sprite_scale[c] = data.get("sprite_scale", 0.5)
+        self.stand_damage_drain[c] = data.get("stand_damage_drain", STAND_DAMAGE_DRAIN)
+        self.stand_damage_drain_no_stand[c] = data.get("stand_damage_drain_no_stand", STAND_DAMAGE_DRAIN_NO_STAND)
+        if data.get("jump_loop"):
+            self.has_jump_loop[c] = True
+            self.jump_loop_start[c], self.jump_loop_end[c] = data["jump_loop"]
+        if "crouch" in animations:
+            start, end = animations["crouch"][0]
+            hold_frame = data.get("crouch_freeze_frame", None)
+            if hold_frame and start <= hold_frame <= end:
+                self.crouch_hold_frame[c] = hold_frame
+            else:
+                self.crouch_hold_frame[c] = (start + end) // 2
+        attacks = data.get("attacks", {})
+        for k, attack_name in enumerate(ATTACKS):
+            attack_data = attacks.get(attack_name)
+            if not attack_data:
+                continue
+            # Значения по умолчанию те же, что в check_attack_hit бойца и стенда
+            is_stand = attack_name.startswith("stand_")
+            width, height = attack_data.get("hitbox", (80, 100) if is_stand else (50, 50))
+            self.has_attack[c, k] = True
+            self.attack_active_start[c, k], self.attack_active_end[c, k] = attack_data.get("active_frames", (0, 0))
+            self.attack_w[c, k] = width
+            self.attack_h[c, k] = height
+            self.attack_offset_x[c, k] = attack_data.get("offset_x", 80 if is_stand else 50)
+            self.attack_offset_y[c, k] = attack_data.get("offset_y", 0)
+            self.attack_damage[c, k] = attack_data.get("damage", 15 if is_stand else 10)
+            self.attack_knockback[c, k] = attack_data.get("knockback", 10 if is_stand else 5)
+        rush_data = data.get("stand_rush_data", {})
+        if rush_data:
+            self.has_rush[c] = True
+            self.rush_cooldown[c] = rush_data["cooldown"]
+            self.rush_damage[c] = rush_data["damage_per_hit"]
+            self.rush_knockback[c] = rush_data["knockback_per_hit"]
+            self.rush_w[c] = rush_data["attack_hitbox"]["width"]
+            self.rush_h[c] = rush_data["attack_hitbox"]["height"]
+        for frame, (width, height) in frame_sizes.items():
+            self.frame_w[c, frame] = width
+            self.frame_h[c, frame] = height
+
+    def _fill_stand(self, c, data):
+        animations = data["animations"]
+        for a, action in enumerate(STAND_ACTIONS):
+            if action in animations:
+                (start, end), speed = animations[action]
+                self.stand_has_action[c, a] = True
+                self.stand_action_start[c, a] = start
+                self.stand_action_end[c, a] = end
+                self.stand_action_speed[c, a] = speed
+        if data.get("jump_loop"):
+            self.stand_has_jump_loop[c] = True
+            self.stand_jump_loop_start[c], self.stand_jump_loop_end[c] = data["jump_loop"]
+        rush_data = data.get("rush_data", {})
+        self.rush_main_start[c], self.rush_main_end[c] = rush_data.get("main_frames", (237, 255))
+        self.rush_active_start[c] = rush_data.get("active_frames", (240, 251))[0]
+        self.rush_attack_start[c], self.rush_attack_end[c] = rush_data.get("attack_frames", (296, 319))
+        self.rush_offset_x[c] = rush_data.get("attack_offset_x", 150)
+        self.rush_offset_y[c] = rush_data.get("attack_offset_y", 50)
+
+
+class _Fighters:
+    """Состояние одной стороны всех матчей пакета (поля как у FighterState и StandState)"""
+
+    def __init__(self, tables, chars, start_x, facing_right):
+        n = len(chars)
+        self.char = np.asarray(chars, np.int64)
+        self.opponent = None
+        self.center_x = np.full(n, float(start_x))
+        self.center_y = np.full(n, float(GROUND_LEVEL))
+        self.change_x = np.zeros(n)
+        self.change_y = np.zeros(n)
+        self.facing_right = np.full(n, facing_right)
+        self.current_action = np.full(n, IDLE)
+        self.current_frame = np.zeros(n, np.int64)
+        self.frame_counter = np.zeros(n, np.int64)
+        self.current_animation_speed = tables.idle_speed[self.char].copy()
+        self.current_health = tables.max_health[self.char].copy()
+        self.stand_meter = np.zeros(n)
+        self.attack1_cooldown = np.zeros(n, np.int64)
+        self.attack2_cooldown = np.zeros(n, np.int64)
+        self.attack3_cooldown = np.zeros(n, np.int64)
+        self.stand_rush_cooldown = np.zeros(n, np.int64)
+        self.dash_cooldown = np.zeros(n, np.int64)
+        self.hit_cooldown = np.zeros(n, np.int64)
+        self.hit_timer = np.zeros(n, np.int64)
+        self.block_timer = np.zeros(n, np.int64)
+        self.knockback_timer = np.zeros(n, np.int64)
+        self.knockback_velocity = np.zeros(n)
+        self.current_attack = np.full(n, NO_ATTACK)
+        self.has_hit_in_this_attack = np.zeros(n, bool)
+        self.last_rush_hit_frame = np.full(n, -1)
+        self.rush_hit_counter = np.zeros(n, np.int64)
+        self.is_attacking = np.zeros(n, bool)
+        self.is_hit = np.zeros(n, bool)
+        self.is_hit_animating = np.zeros(n, bool)
+        self.is_dashing = np.zeros(n, bool)
+        self.dash_direction = np.zeros(n, np.int64)
+        self.dash_target_x = np.full(n, np.nan)
+        self.is_jumping = np.zeros(n, bool)
+        self.double_jump_used = np.zeros(n, bool)
+        self.is_crouching = np.zeros(n, bool)
+        self.is_blocking = np.zeros(n, bool)
+        self.crouch_freeze_frame_active = np.full(n, -1)
+        self.crouch_resume_frame = np.full(n, -1)
+        self.stand_active = np.zeros(n, bool)
+        self.is_summoning = np.zeros(n, bool)
+        self.stand_action = np.full(n, S_SUMMON)
+        self.stand_frame = np.zeros(n, np.int64)
+        self.stand_frame_counter = np.zeros(n, np.int64)
+        self.stand_is_summoning = np.zeros(n, bool)
+        self.stand_is_attacking = np.zeros(n, bool)
+        self.stand_is_rushing = np.zeros(n, bool)
+        self.stand_combo = np.zeros(n, np.int64)
+        self.stand_attack_timer = np.zeros(n, np.int64)
+        self.stand_has_hit = np.zeros(n, bool)
+        self.stand_attack_activated = np.zeros(n, bool)
+        self.rush_attack_active = np.zeros(n, bool)
+        self.rush_attack_frame = np.zeros(n, np.int64)
+        self.rush_attack_counter = np.zeros(n, np.int64)
+        self.rush_attack_loops = np.zeros(n, np.int64)
+        self.rush_attack_x = np.zeros(n)
+        self.rush_attack_y = np.zeros(n)
+        self.hits_landed = np.zeros(n, np.int64)
+        self.blocks_successful = np.zeros(n, np.int64)
+
+
+class BatchMatch:
+    """N матчей p1_characters[i] против p2_characters[i], которые идут кадр в кадр"""
+
+    def __init__(self, p1_characters, p2_characters, tables=None):
+        if len(p1_characters) != len(p2_characters):
+            raise ValueError("Списки персонажей игроков должны быть одной длины")
+        if tables is None:
+            tables = CharacterTables(sorted(set(p1_characters) | set(p2_characters)))
+        self.tables = tables
+        self.n = len(p1_characters)
+        self.p1_characters = list(p1_characters)
+        self.p2_characters = list(p2_characters)
+        chars1 = [tables.index[name] for name in p1_characters]
+        chars2 = [tables.index[name] for name in p2_characters]
+        self.fighters = (
+            _Fighters(tables, chars1, SCREEN_WIDTH // 4, True),
+            _Fighters(tables, chars2, 3 * SCREEN_WIDTH // 4, False),
+        )
+        self.fighters[0].opponent = self.fighters[1]
+        self.fighters[1].opponent = self.fighters[0]
+        n = self.n
+        self.frame = 0
+        self.intro_mode = np.ones(n, bool)
+        self.intro_timer = np.zeros(n, np.int64)
+        self.finished = np.zeros(n, bool)
+        # 1 или 2 - номер победителя, 0 - матч ещё идёт
+        self.winner = np.zeros(n, np.int64)
+        self.fight_frames = np.zeros(n, np.int64)
+        self._ignored_input = np.zeros((2, n), np.int64)
+        self._previous_input = np.zeros((2, n), np.int64)
+        self._up_latched = np.zeros((2, n), bool)
+        self._down_latched = np.zeros((2, n), bool)
+        self._stand_pending = np.zeros((2, n), bool)
+        self._rush_pending = np.zeros((2, n), bool)
+        everyone = np.ones(n, bool)
+        for f in self.fighters:
+            has_intro = tables.has_action[f.char, INTRO]
+            self._set_action(f, everyone & has_intro, INTRO)
+            self._set_action(f, everyone & ~has_intro, IDLE)
+
+    @property
+    def is_over(self):
+        return bool(self.finished.all())
+
+    def step(self, p1_input, p2_input):
+        """Кадр для всех незакончившихся матчей; ввод - маски INPUT_* (число или массив длины N)"""
+        self.frame += 1
+        inputs = np.empty((2, self.n), np.int64)
+        inputs[0] = p1_input
+        inputs[1] = p2_input
+        cutscene = self.intro_mode | self.finished
+        self._ignored_input = np.where(cutscene, self._ignored_input | inputs, self._ignored_input & inputs)
+        effective = inputs & ~self._ignored_input
+        fighter1, fighter2 = self.fighters
+        intro = self.intro_mode & ~self.finished
+        if intro.any():
+            self.intro_timer[intro] += 1
+            self._update_fighter(fighter1, intro)
+            self._update_fighter(fighter2, intro)
+            ended = intro & (self.intro_timer >= INTRO_ANIMATION_DURATION)
+            self.intro_mode[ended] = False
+            self.intro_timer[ended] = 0
+            self._set_action(fighter1, ended, IDLE)
+            self._set_action(fighter2, ended, IDLE)
+        fight = ~intro & ~self.finished
+        p1_dead = fight & (fighter1.current_health <= 0)
+        p2_dead = fight & ~p1_dead & (fighter2.current_health <= 0)
+        self.winner[p1_dead] = 2
+        self.winner[p2_dead] = 1
+        self.finished |= p1_dead | p2_dead
+        fight &= ~(p1_dead | p2_dead)
+        if fight.any():
+            self.fight_frames[fight] += 1
+            for i, f in enumerate(self.fighters):
+                self._apply_input(i, f, effective[i], fight)
+            for f in self.fighters:
+                # Лишний сдвиг на скорость, как у PhysicsEngineSimple (см. FighterState.apply_physics)
+                f.center_y[fight] += f.change_y[fight]
+                f.center_x[fight] += f.change_x[fight]
+            for f in self.fighters:
+                self._update_fighter(f, fight)
+                self._update_stand(f, fight & f.stand_active)
+        self._previous_input = inputs
+
+    def run(self, policy, max_fight_frames=BATCH_MAX_FIGHT_FRAMES):
+        """Гоняет матчи до конца; policy(batch) возвращает пару масок ввода для кадра"""
+        while not self.finished.all():
+            self.step(*policy(self))
+            self.finished |= self.fight_frames >= max_fight_frames
+        return self.results()
+
+    def results(self):
+        fighter1, fighter2 = self.fighters
+        seconds = np.maximum(self.fight_frames, 1) / FPS
+        damage1 = self.tables.max_health[fighter2.char] - fighter2.current_health
+        damage2 = self.tables.max_health[fighter1.char] - fighter1.current_health
+        return {
+            "winner": self.winner.copy(),
+            "fight_frames": self.fight_frames.copy(),
+            "p1_damage": damage1,
+            "p2_damage": damage2,
+            "p1_dps": damage1 / seconds,
+            "p2_dps": damage2 / seconds,
+            "p1_hits": fighter1.hits_landed.copy(),
+            "p2_hits": fighter2.hits_landed.copy(),
+        }
+
+    # Ввод игрока, как Match._apply_input
+
+    def _apply_input(self, i, f, bits, m):
+        left = m & (bits & INPUT_LEFT != 0)
+        right = m & (bits & INPUT_RIGHT != 0)
+        up = m & (bits & INPUT_UP != 0)
+        down = bits & INPUT_DOWN != 0
+        pressed = bits & ~self._previous_input[i]
+        self._stand_pending[i] |= m & (pressed & INPUT_STAND != 0)
+        self._rush_pending[i] |= m & (pressed & INPUT_RUSH != 0)
+        self._stand_pending[i] &= ~m | (bits & INPUT_STAND != 0)
+        self._rush_pending[i] &= ~m | (bits & INPUT_RUSH != 0)
+        self._up_latched[i] &= ~m | up
+        blocked = m & (f.is_summoning | f.is_hit)
+        f.change_x[blocked] = 0
+        m = m & ~blocked
+        move = m & ~f.is_dashing & ~f.is_attacking
+        f.change_x[move] = 0
+        walk = move & ~f.is_crouching
+        speed = self.tables.movement_speed[f.char]
+        for pressed_side, sign in ((left, -1), (right, 1)):
+            walk_side = walk & pressed_side
+            f.change_x[walk_side] = sign * speed[walk_side]
+            forward = f.facing_right if sign > 0 else ~f.facing_right
+            animate = walk_side & ~f.is_jumping
+            self._set_action(f, animate, np.where(forward, MOVE_RIGHT, MOVE_LEFT))
+        self._set_action(f, move & ~left & ~right & ~f.is_jumping & ~f.is_attacking & (f.current_action != CROUCH), IDLE)
+        jump = m & up & ~self._up_latched[i]
+        self._jump(f, jump & ~f.is_crouching & ~f.is_dashing & ~f.is_attacking)
+        self._up_latched[i] |= jump
+        crouch = m & down & ~self._down_latched[i]
+        self._crouch(f, crouch, True)
+        self._down_latched[i] |= crouch
+        stand_up = m & ~down & self._down_latched[i]
+        self._crouch(f, stand_up, False)
+        self._down_latched[i] &= ~stand_up
+        dash = m & (bits & INPUT_DASH != 0) & ~f.is_dashing & (f.dash_cooldown == 0)
+        self._dash(f, dash, np.where(left, -1, np.where(right, 1, 0)))
+        self._attack(f, m & (bits & INPUT_ATTACK1 != 0), 1)
+        self._attack(f, m & (bits & INPUT_ATTACK2 != 0), 2)
+        self._attack(f, m & (bits & INPUT_ATTACK3 != 0), 3)
+        rush = m & self._rush_pending[i]
+        self._stand_rush(f, rush)
+        self._rush_pending[i] &= ~rush
+        toggle = m & self._stand_pending[i] & ~f.is_summoning & ~f.is_attacking
+        self._toggle_stand(f, toggle)
+        self._stand_pending[i] &= ~toggle
+
+    # Боец, как FighterState
+
+    def _set_action(self, f, m, action):
+        action = np.broadcast_to(np.asarray(action), f.current_action.shape)
+        m = m & (action != f.current_action)
+        if not m.any():
+            return
+        cutscene = (action == INTRO) | (action == VICTORY) | (action == DEFEAT)
+        allowed = cutscene | (
+            ~(f.is_summoning & (action != STAND_SUMMON) & (action != IDLE)) &
+            ~(f.is_jumping & (action != JUMP) & (action != IDLE)) &
+            ~(f.is_dashing & (action != DASH_FORWARD) & (action != DASH_BACKWARD) & (action != IDLE)))
+        t = self.tables
+        m &= allowed & t.has_action[f.char, action]
+        f.current_action[m] = action[m]
+        f.current_frame[m] = t.action_start[f.char, action][m]
+        f.frame_counter[m] = 0
+        f.current_animation_speed[m] = t.action_speed[f.char, action][m]
+        f.change_x[m & np.isin(action, _ATTACK_ACTIONS)] = 0
+
+    def _dismiss_stand(self, f, m):
+        f.stand_active[m] = False
+
+    def _jump(self, f, m):
+        m = m & ~f.is_summoning & ~f.is_attacking & ~f.is_blocking
+        t = self.tables
+        first = m & ~f.is_jumping & ~f.is_crouching & ~f.is_dashing & (f.center_y <= GROUND_LEVEL)
+        second = m & ~first & f.stand_active & f.is_jumping & ~f.double_jump_used & ~f.is_dashing
+        f.change_y[first] = t.jump_speed[f.char][first]
+        f.is_jumping[first] = True
+        f.double_jump_used[first] = False
+        self._set_action(f, first, JUMP)
+        f.change_y[second] = t.jump_speed[f.char][second]
+        f.double_jump_used[second] = True
+        restart = second & t.has_action[f.char, JUMP]
+        f.current_frame[restart] = t.action_start[f.char, JUMP][restart]
+
+    def _crouch(self, f, m, start_crouch):
+        t = self.tables
+        m = m & t.has_action[f.char, CROUCH] & ~f.is_dashing & ~f.is_summoning & ~f.is_attacking
+        if start_crouch:
+            m &= ~f.is_jumping & ~f.is_crouching
+            f.is_crouching[m] = True
+            f.is_blocking[m] = True
+            f.block_timer[m] = BLOCK_DURATION
+            self._set_action(f, m, CROUCH)
+            f.crouch_freeze_frame_active[m] = t.crouch_hold_frame[f.char][m]
+        else:
+            m &= f.is_crouching
+            f.crouch_resume_frame[m] = f.current_frame[m]
+            f.is_crouching[m] = False
+            f.crouch_freeze_frame_active[m] = -1
+            f.is_blocking[m] = False
+
+    def _dash(self, f, m, move_direction):
+        t = self.tables
+        m = (m & ~f.is_dashing & ~f.is_jumping & ~f.is_crouching & (f.dash_cooldown <= 0) &
+             ~f.is_summoning & ~f.is_attacking & ~f.is_blocking)
+        direction = np.where(move_direction != 0, move_direction, np.where(f.facing_right, 1, -1))
+        f.dash_direction[m] = direction[m]
+        forward = np.where(f.facing_right, f.dash_direction > 0, f.dash_direction < 0)
+        action = np.where(forward, DASH_FORWARD, DASH_BACKWARD)
+        m &= t.has_action[f.char, action]
+        target = np.clip(f.center_x + t.dash_distance[f.char] * f.dash_direction, 0, SCREEN_WIDTH)
+        f.dash_target_x[m] = target[m]
+        f.is_dashing[m] = True
+        self._set_action(f, m, action)
+        f.dash_cooldown[m] = t.dash_cooldown[f.char][m]
+
+    def _toggle_stand(self, f, m):
+        m = m & ~f.is_jumping & ~f.is_dashing & ~f.is_blocking
+        stand_action = (f.current_action >= STAND_ATTACK1) & (f.current_action <= STAND_ATTACK3)
+        m &= ~(f.is_attacking & ~stand_action)
+        dismiss = m & f.stand_active
+        summon = m & ~f.stand_active & (f.stand_meter >= STAND_METER_SUMMON_COST)
+        self._dismiss_stand(f, dismiss)
+        f.stand_meter[summon] -= STAND_METER_SUMMON_COST
+        f.stand_active[summon] = True
+        f.is_summoning[summon] = True
+        self._set_action(f, summon, STAND_SUMMON)
+        self._new_stand(f, summon)
+
+    def _stand_rush(self, f, m):
+        t = self.tables
+        m = (m & f.stand_active & ~f.is_summoning & ~f.is_dashing & ~f.is_jumping & ~f.is_blocking &
+             ~f.is_attacking & t.has_rush[f.char] & (f.stand_rush_cooldown <= 0))
+        f.is_attacking[m] = True
+        f.current_attack[m] = RUSH_ATTACK
+        f.has_hit_in_this_attack[m] = False
+        f.change_x[m] = 0
+        f.last_rush_hit_frame[m] = -1
+        f.rush_hit_counter[m] = 0
+        self._set_action(f, m, IDLE)
+        self._stand_start_rush(f, m)
+        f.stand_rush_cooldown[m] = t.rush_cooldown[f.char][m]
+
+    def _check_stand_rush_hit(self, f, m):
+        t = self.tables
+        m = m & t.has_rush[f.char] & f.rush_attack_active & (f.rush_hit_counter < 12)
+        m &= f.last_rush_hit_frame != f.rush_attack_frame
+        m &= (f.rush_attack_frame - t.rush_attack_start[f.char]) % 2 == 0
+        half_w = t.rush_w[f.char] // 2
+        half_h = t.rush_h[f.char] // 2
+        m &= self._overlaps(f.opponent, f.rush_attack_x - half_w, f.rush_attack_x + half_w,
+                            f.rush_attack_y - half_h, f.rush_attack_y + half_h)
+        self._take_damage(f.opponent, m, t.rush_damage[f.char], t.rush_knockback[f.char])
+        f.last_rush_hit_frame[m] = f.rush_attack_frame[m]
+        f.rush_hit_counter[m] += 1
+        f.hits_landed[m] += 1
+
+    def _attack(self, f, m, number):
+        cooldown = (f.attack1_cooldown, f.attack2_cooldown, f.attack3_cooldown)[number - 1]
+        m = m & (cooldown <= 0) & ~f.is_summoning & ~f.is_dashing & ~f.is_jumping & ~f.is_blocking
+        with_stand = m & f.stand_active & ~f.stand_is_attacking
+        alone = m & ~f.stand_active & self.tables.has_action[f.char, ATTACK1 + number - 1]
+        self._stand_start_attack(f, with_stand, number)
+        self._start_attack(f, with_stand, number + 2)
+        self._start_attack(f, alone, number - 1)
+
+    def _start_attack(self, f, m, attack):
+        if not m.any():
+            return
+        f.current_attack[m] = attack
+        f.is_attacking[m] = True
+        f.has_hit_in_this_attack[m] = False
+        f.change_x[m] = 0
+        number = attack % 3
+        cooldown = (f.attack1_cooldown, f.attack2_cooldown, f.attack3_cooldown)[number]
+        cooldown[m] = (15, 30, 45)[number]
+        self._set_action(f, m, ATTACK1 + attack)
+        if attack < 3:
+            f.stand_meter[m] = np.minimum(STAND_METER_MAX, f.stand_meter[m] + STAND_METER_GAIN_ON_ATTACK)
+
+    def _overlaps(self, target, left, right, bottom, top):
+        t = self.tables
+        half_w = t.hurtbox_half_w[target.char]
+        half_h = t.hurtbox_half_h[target.char]
+        return ((right > target.center_x - half_w) & (left < target.center_x + half_w) &
+                (top > target.center_y - half_h) & (bottom < target.center_y + half_h))
+
+    def _attack_hitbox(self, f, attack):
+        t = self.tables
+        width = t.attack_w[f.char, attack]
+        height = t.attack_h[f.char, attack]
+        offset_x = t.attack_offset_x[f.char, attack]
+        left = np.where(f.facing_right, f.center_x + offset_x, f.center_x - offset_x) - width // 2
+        center_y = f.center_y + t.attack_offset_y[f.char, attack]
+        return left, left + width, center_y - height // 2, center_y + height // 2
+
+    def _check_attack_hit(self, f, m):
+        t = self.tables
+        attack = np.clip(f.current_action - ATTACK1, 0, 2)
+        m = m & ~f.has_hit_in_this_attack & t.has_attack[f.char, attack]
+        m &= (f.current_frame >= t.attack_active_start[f.char, attack])
+        m &= (f.current_frame <= t.attack_active_end[f.char, attack])
+        m &= f.opponent.hit_cooldown <= 0
+        m &= self._overlaps(f.opponent, *self._attack_hitbox(f, attack))
+        f.has_hit_in_this_attack[m] = True
+        direction = np.where(f.facing_right, 1, -1)
+        self._take_damage(f.opponent, m, t.attack_damage[f.char, attack],
+                          t.attack_knockback[f.char, attack] * direction)
+        f.stand_meter[m] = np.minimum(STAND_METER_MAX, f.stand_meter[m] + STAND_METER_GAIN_ON_ATTACK)
+        f.hits_landed[m] += 1
+
+    def _take_damage(self, f, m, damage, knockback):
+        m = m & (f.hit_cooldown <= 0)
+        if not m.any():
+            return
+        t = self.tables
+        with_stand = m & f.stand_active
+        f.stand_meter[with_stand] = np.maximum(0, f.stand_meter - t.stand_damage_drain[f.char])[with_stand]
+        self._dismiss_stand(f, with_stand & (f.stand_meter <= 0))
+        f.stand_meter[with_stand & (f.stand_meter <= 0)] = 0
+        alone = m & ~with_stand
+        f.stand_meter[alone] = np.maximum(0, f.stand_meter - t.stand_damage_drain_no_stand[f.char])[alone]
+        unblocked = m & ~f.is_blocking
+        f.stand_meter[unblocked] = np.minimum(STAND_METER_MAX, f.stand_meter[unblocked] + STAND_METER_GAIN_ON_HIT)
+        animate = m & t.has_action[f.char, HIT]
+        f.is_hit_animating[animate] = True
+        f.hit_timer[animate] = 15
+        self._set_action(f, animate, HIT)
+        blocking = m & f.is_blocking
+        stand_block = blocking & f.stand_active
+        stand_guard = stand_block & (f.stand_meter >= STAND_METER_BLOCK_DRAIN)
+        f.stand_meter[stand_guard] -= STAND_METER_BLOCK_DRAIN
+        f.stand_meter[stand_guard] = np.minimum(STAND_METER_MAX, f.stand_meter[stand_guard] + STAND_METER_GAIN_ON_BLOCK)
+        f.blocks_successful[stand_guard] += 1
+        self._dismiss_stand(f, stand_guard & (f.stand_meter <= 0))
+        f.stand_meter[stand_guard & (f.stand_meter <= 0)] = 0
+        f.center_x[stand_guard] += knockback[stand_guard] * 0.3
+        f.hit_cooldown[stand_guard] = 10
+        guard = blocking & ~stand_block & (f.stand_meter >= STAND_METER_BLOCK_DRAIN_NO_STAND)
+        f.stand_meter[guard] -= STAND_METER_BLOCK_DRAIN_NO_STAND
+        f.blocks_successful[guard] += 1
+        f.current_health[guard] = np.maximum(0, f.current_health[guard] - np.trunc(damage[guard] * 0.5))
+        f.stand_meter[guard] = np.minimum(STAND_METER_MAX, f.stand_meter[guard] + STAND_METER_GAIN_ON_BLOCK)
+        f.hit_cooldown[guard] = 10
+        f.is_hit[guard] = True
+        f.knockback_velocity[guard] = np.trunc(knockback[guard] * 0.5)
+        f.knockback_timer[guard] = KNOCKBACK_DURATION // 2
+        f.is_attacking[guard] = False
+        f.is_dashing[guard] = False
+        f.is_blocking[blocking & ~stand_guard & ~guard] = False
+        hit = m & ~stand_guard & ~guard
+        f.current_health[hit] = np.maximum(0, f.current_health[hit] - damage[hit])
+        f.hit_cooldown[hit] = 5
+        f.is_hit[hit] = True
+        f.knockback_velocity[hit] = knockback[hit]
+        f.knockback_timer[hit] = KNOCKBACK_DURATION
+        f.is_attacking[hit] = False
+        f.is_dashing[hit] = False
+        f.change_x[hit] = 0
+
+    def _update_animation(self, f, m):
+        t = self.tables
+        f.frame_counter[m] += 1
+        m = m & t.has_action[f.char, f.current_action] & (f.frame_counter >= f.current_animation_speed)
+        f.frame_counter[m] = 0
+        action = f.current_action.copy()
+        start = t.action_start[f.char, action]
+        end = t.action_end[f.char, action]
+        frame = f.current_frame
+        to_idle = np.zeros_like(m)
+
+        jump = m & (action == JUMP)
+        looped = jump & t.has_jump_loop[f.char]
+        loop_start = t.jump_loop_start[f.char]
+        loop_end = t.jump_loop_end[f.char]
+        rising = looped & (frame < loop_start)
+        airborne = looped & ~rising & (f.center_y > GROUND_LEVEL + 5)
+        landing = looped & ~rising & ~airborne & (f.center_y <= GROUND_LEVEL)
+        wrap = airborne & (frame >= loop_end)
+        landed = (landing & (frame >= end)) | (jump & ~looped & (frame + 1 > end))
+        frame[rising | (airborne & ~wrap) | (landing & ~landed) | (jump & ~looped)] += 1
+        frame[wrap] = loop_start[wrap]
+        frame[landed] = end[landed]
+        f.is_jumping[landed] = False
+        to_idle |= landed
+
+        clamped = m & ((action == INTRO) | (action == VICTORY) | (action == DEFEAT) | (action == STAND_SUMMON) |
+                       np.isin(action, _ATTACK_ACTIONS) | (action == HIT))
+        frame[clamped] += 1
+        over = clamped & (frame > end)
+        frame[over] = end[over]
+        summoned = over & (action == STAND_SUMMON)
+        f.is_summoning[summoned] = False
+        attack_over = over & np.isin(action, _ATTACK_ACTIONS)
+        f.is_attacking[attack_over] = False
+        hit_over = over & (action == HIT)
+        f.is_hit_animating[hit_over] = False
+        to_idle |= summoned | attack_over | (hit_over & ~f.is_attacking & ~f.is_dashing & ~f.is_jumping)
+
+        crouch = m & (action == CROUCH)
+        holding = crouch & f.is_crouching
+        f.block_timer[holding] = BLOCK_DURATION
+        hold_frame = f.crouch_freeze_frame_active
+        frame[holding & (frame < hold_frame)] += 1
+        frame[holding & (frame >= hold_frame)] = hold_frame[holding & (frame >= hold_frame)]
+        standing = crouch & ~f.is_crouching
+        resume = standing & (f.crouch_resume_frame >= 0)
+        frame[resume] = f.crouch_resume_frame[resume]
+        f.crouch_resume_frame[resume] = -1
+        frame[standing] += 1
+        stood = standing & (frame > end)
+        frame[stood] = end[stood]
+        to_idle |= stood
+
+        dash = m & ((action == DASH_FORWARD) | (action == DASH_BACKWARD))
+        frame[dash] += 1
+        dash_over = dash & (frame > end)
+        stop = dash_over & f.is_dashing
+        f.is_dashing[stop] = False
+        f.dash_target_x[stop] = np.nan
+        f.dash_direction[stop] = 0
+        to_idle |= dash_over
+
+        loop = m & ((action == IDLE) | (action == MOVE_LEFT) | (action == MOVE_RIGHT))
+        frame[loop] += 1
+        wrapped = loop & (frame > end)
+        frame[wrapped] = start[wrapped]
+        self._set_action(f, to_idle, IDLE)
+
+    def _update_fighter(self, f, m):
+        t = self.tables
+        for cooldown in (f.attack1_cooldown, f.attack2_cooldown, f.attack3_cooldown,
+                         f.stand_rush_cooldown, f.dash_cooldown):
+            cooldown[m & (cooldown > 0)] -= 1
+        recovering = m & (f.hit_cooldown > 0)
+        f.hit_cooldown[recovering] -= 1
+        f.is_hit[m & ~recovering] = False
+        stunned = m & (f.hit_timer > 0)
+        f.hit_timer[stunned] -= 1
+        f.is_hit_animating[stunned & (f.hit_timer <= 0)] = False
+        blocking = m & f.is_blocking
+        f.block_timer[blocking] -= 1
+        f.is_blocking[blocking & (f.block_timer <= 0)] = False
+        resting = m & ~f.stand_active
+        f.stand_meter[resting] = np.minimum(STAND_METER_MAX, f.stand_meter[resting] + STAND_METER_PASSIVE_GAIN)
+        knocked = m & (f.knockback_timer > 0)
+        f.knockback_timer[knocked] -= 1
+        f.center_x[knocked] += f.knockback_velocity[knocked]
+        f.knockback_velocity[knocked] *= 0.8
+        normal_attack = (f.current_action >= ATTACK1) & (f.current_action <= ATTACK3)
+        self._check_attack_hit(f, m & f.is_attacking & ~f.stand_active & normal_attack)
+        self._check_stand_rush_hit(f, m & f.is_attacking & (f.current_attack == RUSH_ATTACK) & f.stand_active)
+        stand_done = m & f.stand_active & ~f.stand_is_attacking & f.is_attacking & (f.current_attack >= 3)
+        f.is_attacking[stand_done] = False
+        f.current_attack[stand_done] = NO_ATTACK
+        self._set_action(f, stand_done & ~f.is_jumping & ~f.is_dashing, IDLE)
+        turn = m & ~f.is_attacking & ~f.is_blocking & ~f.is_hit_animating & ~f.is_dashing
+        f.facing_right[turn] = (f.opponent.center_x > f.center_x)[turn]
+        moving = m & ~f.is_attacking & ~f.is_hit & ~f.is_summoning & ~f.is_dashing & ~f.is_blocking & ~f.is_hit_animating
+        f.center_x[moving] += f.change_x[moving]
+        f.change_x[m & ~moving] = 0
+        dashing = m & f.is_dashing & ~np.isnan(f.dash_target_x)
+        distance = f.dash_target_x - f.center_x
+        far = dashing & (np.abs(distance) > t.dash_speed[f.char])
+        f.center_x[far] += np.where(distance > 0, t.dash_speed[f.char], -t.dash_speed[f.char])[far]
+        arrived = dashing & ~far
+        f.center_x[arrived] = f.dash_target_x[arrived]
+        falling = m & ~dashing & ~f.is_crouching & ~f.is_dashing & ~f.is_hit
+        f.change_y[falling] -= GRAVITY
+        f.center_y[m] += f.change_y[m]
+        grounded = m & (f.center_y <= GROUND_LEVEL)
+        f.center_y[grounded] = GROUND_LEVEL
+        f.change_y[grounded] = 0
+        f.double_jump_used[grounded] = False
+        in_jump = f.current_action == JUMP
+        land = grounded & in_jump & ~t.has_jump_loop[f.char]
+        f.is_jumping[land | (grounded & ~in_jump)] = False
+        self._set_action(f, land, IDLE)
+        scale = t.sprite_scale[f.char]
+        frame_width = t.frame_w[f.char, f.current_frame] * scale
+        frame_height = t.frame_h[f.char, f.current_frame] * scale
+        half_width = frame_width / 2
+        left_wall = m & (f.center_x - half_width < 0)
+        f.center_x[left_wall] = half_width[left_wall]
+        self._stop_dash_at_wall(f, left_wall)
+        right_wall = m & (f.center_x + half_width > SCREEN_WIDTH)
+        f.center_x[right_wall] = (SCREEN_WIDTH - half_width)[right_wall]
+        self._stop_dash_at_wall(f, right_wall)
+        ceiling = m & (f.center_y + frame_height / 2 > SCREEN_HEIGHT)
+        f.center_y[ceiling] = (SCREEN_HEIGHT - frame_height / 2)[ceiling]
+        f.change_y[ceiling] = 0
+        self._update_animation(f, m)
+
+    def _stop_dash_at_wall(self, f, m):
+        stop = m & f.is_dashing
+        f.is_dashing[stop] = False
+        f.dash_target_x[stop] = np.nan
+        self._set_action(f, stop, IDLE)
+
+    # Стенд, как StandState и StandAttackState
+
+    def _new_stand(self, f, m):
+        t = self.tables
+        f.stand_action[m] = S_SUMMON
+        f.stand_frame[m] = t.stand_action_start[f.char, S_SUMMON][m]
+        f.stand_frame_counter[m] = 0
+        f.stand_is_summoning[m] = True
+        f.stand_is_attacking[m] = False
+        f.stand_is_rushing[m] = False
+        f.stand_combo[m] = 0
+        f.stand_attack_timer[m] = 0
+        f.stand_has_hit[m] = False
+        f.stand_attack_activated[m] = False
+        f.rush_attack_active[m] = False
+        f.rush_attack_frame[m] = t.rush_attack_start[f.char][m]
+        f.rush_attack_counter[m] = 0
+        f.rush_attack_loops[m] = 0
+        f.rush_attack_x[m] = 0
+        f.rush_attack_y[m] = 0
+
+    def _stand_set_action(self, f, m, action):
+        action = np.broadcast_to(np.asarray(action), f.stand_action.shape)
+        t = self.tables
+        m = m & (action != f.stand_action) & t.stand_has_action[f.char, action]
+        f.stand_action[m] = action[m]
+        f.stand_frame[m] = t.stand_action_start[f.char, action][m]
+        f.stand_frame_counter[m] = 0
+
+    def _stand_start_attack(self, f, m, number):
+        t = self.tables
+        action = S_ATTACK1 + number - 1
+        m = m & t.stand_has_action[f.char, action]
+        f.stand_combo[m] = number
+        f.stand_is_attacking[m] = True
+        f.stand_has_hit[m] = False
+        f.stand_is_rushing[m] = False
+        self._stand_set_action(f, m, action)
+        frame_count = t.stand_action_end[f.char, action] - t.stand_action_start[f.char, action] + 1
+        f.stand_attack_timer[m] = (frame_count * t.stand_action_speed[f.char, action])[m]
+
+    def _stand_start_rush(self, f, m):
+        t = self.tables
+        f.stand_is_rushing[m] = True
+        f.stand_is_attacking[m] = True
+        f.stand_has_hit[m] = False
+        f.stand_combo[m] = 0
+        f.stand_attack_activated[m] = False
+        f.stand_action[m] = S_RUSH
+        f.stand_frame[m] = t.rush_main_start[f.char][m]
+        f.stand_frame_counter[m] = 0
+        f.stand_attack_timer[m] = ((t.rush_main_end[f.char] - t.rush_main_start[f.char] + 1) * 3)[m]
+
+    def _rush_attack_position(self, f, m):
+        t = self.tables
+        direction = np.where(f.facing_right, 1, -1)
+        f.rush_attack_x[m] = (f.center_x + t.rush_offset_x[f.char] * direction)[m]
+        f.rush_attack_y[m] = (f.center_y + t.rush_offset_y[f.char])[m]
+
+    def _stand_check_attack_hit(self, f, m):
+        t = self.tables
+        attack = np.clip(f.stand_combo + 2, 3, 5)
+        m = m & (f.stand_combo >= 1) & ~f.stand_has_hit & t.has_attack[f.char, attack]
+        m &= (f.stand_frame >= t.attack_active_start[f.char, attack])
+        m &= (f.stand_frame <= t.attack_active_end[f.char, attack])
+        m &= f.opponent.hit_cooldown <= 0
+        m &= self._overlaps(f.opponent, *self._attack_hitbox(f, attack))
+        f.stand_has_hit[m] = True
+        direction = np.where(f.facing_right, 1, -1)
+        self._take_damage(f.opponent, m, t.attack_damage[f.char, attack],
+                          t.attack_knockback[f.char, attack] * direction)
+        f.hits_landed[m] += 1
+
+    def _update_stand(self, f, m):
+        t = self.tables
+        timed = m & (f.stand_attack_timer > 0)
+        f.stand_attack_timer[timed] -= 1
+        expired = timed & (f.stand_attack_timer <= 0)
+        f.stand_is_attacking[expired] = False
+        f.stand_is_rushing[expired] = False
+        punching = m & f.rush_attack_active
+        f.rush_attack_counter[punching] += 1
+        advance = punching & (f.rush_attack_counter >= 2)
+        f.rush_attack_counter[advance] = 0
+        f.rush_attack_frame[advance] += 1
+        looped = advance & (f.rush_attack_frame > t.rush_attack_end[f.char])
+        f.rush_attack_loops[looped] += 1
+        again = looped & (f.rush_attack_loops < 2)
+        f.rush_attack_frame[again] = t.rush_attack_start[f.char][again]
+        f.rush_attack_frame[looped & ~again] = t.rush_attack_end[f.char][looped & ~again]
+        self._rush_attack_position(f, punching)
+        self._stand_check_attack_hit(f, m & f.stand_is_attacking & ~f.stand_is_rushing)
+        block = m & f.is_blocking & f.is_crouching
+        self._stand_set_action(f, block & (f.stand_action != S_BLOCK), S_BLOCK)
+        follow = _STAND_FOLLOW[f.current_action]
+        follow_mask = m & ~block & ~f.stand_is_summoning & ~f.stand_is_attacking & (follow >= 0)
+        self._stand_set_action(f, follow_mask, np.maximum(follow, 0))
+        self._update_stand_animation(f, m)
+
+    def _update_stand_animation(self, f, m):
+        t = self.tables
+        f.stand_frame_counter[m] += 1
+        action = f.stand_action.copy()
+        speed = np.where(f.stand_is_rushing, 3, t.stand_action_speed[f.char, action])
+        m = m & (f.stand_frame_counter >= speed)
+        f.stand_frame_counter[m] = 0
+        frame = f.stand_frame
+
+        rushing = m & f.stand_is_rushing
+        frame[rushing] += 1
+        activate = rushing & ~f.stand_attack_activated & (frame >= t.rush_active_start[f.char])
+        f.stand_attack_activated[activate] = True
+        f.rush_attack_active[activate] = True
+        f.rush_attack_frame[activate] = t.rush_attack_start[f.char][activate]
+        f.rush_attack_counter[activate] = 0
+        f.rush_attack_loops[activate] = 0
+        self._rush_attack_position(f, activate)
+        rush_over = rushing & (frame > t.rush_main_end[f.char])
+        f.stand_is_attacking[rush_over] = False
+        f.stand_is_rushing[rush_over] = False
+        f.stand_action[rush_over] = S_IDLE
+        has_idle = rush_over & t.stand_has_action[f.char, S_IDLE]
+        frame[has_idle] = t.stand_action_start[f.char, S_IDLE][has_idle]
+        f.rush_attack_active[rush_over] = False
+        f.stand_attack_activated[rush_over] = False
+
+        animating = m & ~f.stand_is_rushing & ~rushing & t.stand_has_action[f.char, action]
+        start = t.stand_action_start[f.char, action]
+        end = t.stand_action_end[f.char, action]
+        jump = animating & (action == S_JUMP) & t.stand_has_jump_loop[f.char]
+        loop_start = t.stand_jump_loop_start[f.char]
+        loop_end = t.stand_jump_loop_end[f.char]
+        rising = jump & (frame < loop_start)
+        airborne = jump & ~rising & (f.center_y > GROUND_LEVEL + 5)
+        landing = jump & ~rising & ~airborne & (f.center_y <= GROUND_LEVEL)
+        wrap = airborne & (frame >= loop_end)
+        landed = landing & (frame >= end)
+        frame[rising | (airborne & ~wrap) | (landing & ~landed)] += 1
+        frame[wrap] = loop_start[wrap]
+        other = animating & ~jump
+        frame[other] += 1
+        over = other & (frame > end)
+        summoned = over & f.stand_is_summoning & (action == S_SUMMON)
+        f.stand_is_summoning[summoned] = False
+        attack_over = over & ~summoned & (action >= S_ATTACK1) & (action <= S_ATTACK3)
+        f.stand_is_attacking[attack_over] = False
+        restart = over & ~summoned & ~attack_over
+        frame[restart] = start[restart]
+        self._stand_set_action(f, landed | summoned | attack_over, S_IDLE)
+
+
+def random_policy(seed=None, hold_frames=8, press_chance=0.2):
+    """Бот для прогонов: каждые hold_frames кадров жмёт случайный набор кнопок"""
+    rng = np.random.default_rng(seed)
+    bits = np.array([INPUT_LEFT, INPUT_RIGHT, INPUT_UP, INPUT_DOWN, INPUT_DASH,
+                     INPUT_ATTACK1, INPUT_ATTACK2, INPUT_ATTACK3, INPUT_STAND, INPUT_RUSH])
+    held = {}
+
+    def policy(batch):
+        if batch.frame % hold_frames == 0 or not held:
+            pressed = rng.random((2, batch.n, len(bits))) < press_chance
+            held["inputs"] = (pressed * bits).sum(axis=2)
+        return held["inputs"][0], held["inputs"][1]
+    return policy
+
+
+def balance_sweep(characters=None, matches_per_pair=1000, seed=0, policy=None):
+    """Все пары персонажей (включая зеркальные) в одном пакете: доля побед и урон в секунду по парам"""
+    characters = list(characters or get_available_characters())
+    pairs = [(c1, c2) for c1 in characters for c2 in characters]
+    p1_characters = [c1 for c1, c2 in pairs for _ in range(matches_per_pair)]
+    p2_characters = [c2 for c1, c2 in pairs for _ in range(matches_per_pair)]
+    batch = BatchMatch(p1_characters, p2_characters, CharacterTables(characters))
+    results = batch.run(policy or random_policy(seed))
+    report = {}
+    for i, pair in enumerate(pairs):
+        part = slice(i * matches_per_pair, (i + 1) * matches_per_pair)
+        winner = results["winner"][part]
+        report[pair] = {
+            "matches": matches_per_pair,
+            "p1_win_rate": float(np.mean(winner == 1)),
+            "p2_win_rate": float(np.mean(winner == 2)),
+            "draw_rate": float(np.mean(winner == 0)),
+            "p1_dps": float(np.mean(results["p1_dps"][part])),
+            "p2_dps": float(np.mean(results["p2_dps"][part])),
+            "average_seconds": float(np.mean(results["fight_frames"][part]) / FPS),
+        }
+    return report
+
+
+def main(matches_per_pair=1000, seed=0):
+    report = balance_sweep(matches_per_pair=matches_per_pair, seed=seed)
+    print(f"{'P1':<12} {'P2':<12} {'побед P1':>9} {'побед P2':>9} {'ничьих':>7} "
+          f"{'DPS P1':>7} {'DPS P2':>7} {'сек':>6}")
+    for (c1, c2), row in report.items():
+        print(f"{c1:<12} {c2:<12} {row['p1_win_rate']:>9.1%} {row['p2_win_rate']:>9.1%} "
+              f"{row['draw_rate']:>7.1%} {row['p1_dps']:>7.1f} {row['p2_dps']:>7.1f} "
+              f"{row['average_seconds']:>6.1f}")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    main(int(args[0]) if args else 1000, int(args[1]) if len(args) > 1 else 0)
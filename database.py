@@ -0,0 +1,444 @@
+"""База игроков и матчей без отрисовки.
+
+Database и фоновая запись матчей MatchWriter не зависят от arcade и pyglet:
+их используют и игра (main.py), и нагрузочная проверка db_benchmark.py.
+"""
+import json
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+# Миграции схемы базы: (версия, [SQL]); номер применённой версии хранится в PRAGMA user_version.
+# Новые изменения схемы добавляются только в конец списка
+SCHEMA_MIGRATIONS = [
+    (1, [
+        # Таблица лидеров читается целиком из индекса, без обращения к строкам players
+        "CREATE INDEX IF NOT EXISTS idx_players_total_points ON players "
+        "(total_points DESC, name, games_played, wins, losses, kills, hits_landed, combos_completed)",
+        "CREATE INDEX IF NOT EXISTS idx_matches_player1 ON matches (player1_name, match_date)",
+        "CREATE INDEX IF NOT EXISTS idx_matches_player2 ON matches (player2_name, match_date)",
+        "CREATE INDEX IF NOT EXISTS idx_matches_date ON matches (match_date)",
+    ]),
+    (2, [
+        "ALTER TABLE matches ADD COLUMN p1_character TEXT",
+        "ALTER TABLE matches ADD COLUMN p2_character TEXT",
+        # Сводные таблицы обновляются при каждом save_match, читать сырые матчи для них не нужно
+        "CREATE TABLE IF NOT EXISTS character_stats (character TEXT PRIMARY KEY, "
+        "games INTEGER DEFAULT 0, wins INTEGER DEFAULT 0)",
+        "CREATE TABLE IF NOT EXISTS matchup_stats (character TEXT, opponent TEXT, "
+        "games INTEGER DEFAULT 0, wins INTEGER DEFAULT 0, PRIMARY KEY (character, opponent))",
+        "CREATE TABLE IF NOT EXISTS player_character_stats (player_name TEXT, character TEXT, "
+        "games INTEGER DEFAULT 0, wins INTEGER DEFAULT 0, points INTEGER DEFAULT 0, "
+        "PRIMARY KEY (player_name, character))",
+    ]),
+    (3, [
+        # Сводки по персонажам пересчитываются из матчей уже без зеркальных (см. save_match);
+        # как и в save_match, победа игрока 2 - всё, что не победа игрока 1
+        "DELETE FROM character_stats",
+        "DELETE FROM matchup_stats",
+        "INSERT INTO matchup_stats (character, opponent, games, wins) "
+        "SELECT character, opponent, COUNT(*), SUM(won) FROM ("
+        "SELECT p1_character AS character, p2_character AS opponent, winner_name IS player1_name AS won FROM matches "
+        "WHERE p1_character != '' AND p2_character != '' AND p1_character != p2_character "
+        "UNION ALL "
+        "SELECT p2_character, p1_character, 1 - (winner_name IS player1_name) FROM matches "
+        "WHERE p1_character != '' AND p2_character != '' AND p1_character != p2_character"
+        ") GROUP BY character, opponent",
+        "INSERT INTO character_stats (character, games, wins) "
+        "SELECT character, SUM(games), SUM(wins) FROM matchup_stats GROUP BY character",
+    ]),
+]
+# Журнал результатов матчей, ещё не перенесённых фоновым потоком в базу
+MATCH_JOURNAL_PATH = "players_journal.jsonl"
+MATCH_WRITER_BATCH = 32
+# Неудачная пачка повторяется (база могла быть занята); если не вышло - поток останавливается,
+# а записи остаются в журнале до следующего запуска
+MATCH_WRITER_RETRIES = 5
+MATCH_WRITER_RETRY_DELAY = 0.5
+# Таблица лидеров: строк на экране и строк, которые читаются из базы за один запрос
+LEADERBOARD_PAGE_SIZE = 15
+LEADERBOARD_CHUNK_SIZE = 200
+
+class Database:
+    """Одно соединение с файлом базы на весь процесс: WAL, synchronous=NORMAL, общий курсор.
+    SQL-строки постоянные, поэтому sqlite3 переиспользует подготовленные запросы из своего кэша"""
+    _instances = {}
+
+    def __new__(cls, db_name="players.db"):
+        if db_name not in cls._instances:
+            instance = super().__new__(cls)
+            instance.db_name = db_name
+            instance.conn = sqlite3.connect(db_name, check_same_thread=False)
+            instance.conn.execute("PRAGMA journal_mode=WAL")
+            instance.conn.execute("PRAGMA synchronous=NORMAL")
+            instance.cursor = instance.conn.cursor()
+            instance.lock = threading.RLock()
+            instance._transaction_depth = 0
+            instance._update_sql = {}
+            # Куски таблицы лидеров по LEADERBOARD_CHUNK_SIZE строк: номер куска -> строки
+            instance._leaderboard = {}
+            instance._player_count = None
+            instance._character_stats = None
+            instance.init_db()
+            cls._instances[db_name] = instance
+        return cls._instances[db_name]
+
+    def init_db(self):
+        cursor = self.cursor
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS players (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT UNIQUE NOT NULL,
+                total_points INTEGER DEFAULT 0,
+                games_played INTEGER DEFAULT 0,
+                wins INTEGER DEFAULT 0,
+                losses INTEGER DEFAULT 0,
+                kills INTEGER DEFAULT 0,
+                hits_landed INTEGER DEFAULT 0,
+                blocks_successful INTEGER DEFAULT 0,
+                dashes_used INTEGER DEFAULT 0,
+                jumps_used INTEGER DEFAULT 0,
+                stands_summoned INTEGER DEFAULT 0,
+                combos_completed INTEGER DEFAULT 0,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                last_played TIMESTAMP
+            )
+        ''')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS matches (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                player1_name TEXT,
+                player2_name TEXT,
+                winner_name TEXT,
+                player1_points INTEGER,
+                player2_points INTEGER,
+                match_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (player1_name) REFERENCES players(name),
+                FOREIGN KEY (player2_name) REFERENCES players(name),
+                FOREIGN KEY (winner_name) REFERENCES players(name)
+            )
+        ''')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            )
+        ''')
+        self.conn.commit()
+        self.migrate()
+
+    def migrate(self):
+        """Применяет миграции новее версии базы, каждую в своей транзакции"""
+        version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        for target, statements in SCHEMA_MIGRATIONS:
+            if target <= version:
+                continue
+            with self.lock:
+                try:
+                    self.cursor.execute("BEGIN")
+                    for sql in statements:
+                        self.cursor.execute(sql)
+                    self.cursor.execute(f"PRAGMA user_version = {target}")
+                    self.conn.commit()
+                except sqlite3.Error as e:
+                    self.conn.rollback()
+                    # Дальше работать со старой схемой нельзя - запись матчей падала бы на каждом матче
+                    print(f"Ошибка миграции базы до версии {target}: {e}")
+                    raise
+            version = target
+
+    def get_meta(self, key, default=None):
+        with self.lock:
+            self.cursor.execute("SELECT value FROM meta WHERE key = ?", (key,))
+            row = self.cursor.fetchone()
+        return row[0] if row else default
+
+    def set_meta(self, key, value):
+        with self.transaction():
+            self.cursor.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, str(value)))
+
+    @contextmanager
+    def transaction(self):
+        """Все записи внутри блока - одна транзакция с одним fsync; вложенные блоки не коммитят"""
+        with self.lock:
+            self._transaction_depth += 1
+            try:
+                yield self
+            except BaseException:
+                self._transaction_depth -= 1
+                if self._transaction_depth == 0:
+                    self.conn.rollback()
+                raise
+            self._transaction_depth -= 1
+            if self._transaction_depth == 0:
+                self.conn.commit()
+
+    def invalidate_leaderboard(self):
+        """Сбрасывает кэш таблицы лидеров; вызывается при каждом изменении игроков или матчей"""
+        with self.lock:
+            self._leaderboard = {}
+            self._player_count = None
+            self._character_stats = None
+
+    def get_or_create_player(self, name):
+        with self.transaction():
+            self.cursor.execute("INSERT OR IGNORE INTO players (name, total_points) VALUES (?, 0)", (name,))
+            if self.cursor.rowcount > 0:
+                self.invalidate_leaderboard()
+            self.cursor.execute("SELECT * FROM players WHERE name = ?", (name,))
+            return self.cursor.fetchone()
+
+    def update_player_stats(self, name, stats):
+        keys = tuple(stats.keys())
+        sql = self._update_sql.get(keys)
+        if sql is None:
+            set_clause = ", ".join([f"{key} = {key} + ?" for key in keys])
+            sql = f"UPDATE players SET {set_clause}, last_played = CURRENT_TIMESTAMP WHERE name = ?"
+            self._update_sql[keys] = sql
+        with self.transaction():
+            self.cursor.execute(sql, list(stats.values()) + [name])
+            self.invalidate_leaderboard()
+
+    def save_match(self, player1_name, player2_name, winner_name, player1_points, player2_points,
+                   p1_character=None, p2_character=None):
+        """Матч и сводки по персонажам. Зеркальный матч в character_stats и matchup_stats
+        не попадает: персонаж в нём всегда и выигрывает, и проигрывает, и только тянул бы
+        долю побед к 50%. Статистика игроков по персонажам пишется для обоих"""
+        with self.transaction():
+            self.cursor.execute("INSERT INTO matches (player1_name, player2_name, winner_name, player1_points, player2_points, "
+                                "p1_character, p2_character) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                                (player1_name, player2_name, winner_name, player1_points, player2_points,
+                                 p1_character, p2_character))
+            self.invalidate_leaderboard()
+            if p1_character and p2_character:
+                p1_won = 1 if winner_name == player1_name else 0
+                sides = ((player1_name, p1_character, p2_character, p1_won, player1_points),
+                         (player2_name, p2_character, p1_character, 1 - p1_won, player2_points))
+                mirror = p1_character == p2_character
+                for player_name, character, opponent, won, points in sides:
+                    if not mirror:
+                        self.cursor.execute("INSERT INTO character_stats (character, games, wins) VALUES (?, 1, ?) "
+                                            "ON CONFLICT (character) DO UPDATE SET games = games + 1, wins = wins + excluded.wins",
+                                            (character, won))
+                        self.cursor.execute("INSERT INTO matchup_stats (character, opponent, games, wins) VALUES (?, ?, 1, ?) "
+                                            "ON CONFLICT (character, opponent) DO UPDATE SET games = games + 1, wins = wins + excluded.wins",
+                                            (character, opponent, won))
+                    self.cursor.execute("INSERT INTO player_character_stats (player_name, character, games, wins, points) "
+                                        "VALUES (?, ?, 1, ?, ?) ON CONFLICT (player_name, character) DO UPDATE SET "
+                                        "games = games + 1, wins = wins + excluded.wins, points = points + excluded.points",
+                                        (player_name, character, won, points))
+
+    def save_match_record(self, record):
+        """Все записи одного матча: оба игрока, их статистика и сам матч"""
+        with self.transaction():
+            self.get_or_create_player(record["p1_name"])
+            self.get_or_create_player(record["p2_name"])
+            self.update_player_stats(record["p1_name"], record["p1_stats"])
+            self.update_player_stats(record["p2_name"], record["p2_stats"])
+            self.save_match(record["p1_name"], record["p2_name"], record["winner_name"],
+                            record["p1_points"], record["p2_points"],
+                            record.get("p1_character"), record.get("p2_character"))
+
+    def get_leaderboard(self, limit=10, offset=0):
+        """Строки таблицы лидеров с offset по offset + limit; повторное чтение берётся из кэша"""
+        if limit <= 0:
+            return []
+        with self.lock:
+            first = offset // LEADERBOARD_CHUNK_SIZE
+            last = (offset + limit - 1) // LEADERBOARD_CHUNK_SIZE
+            rows = []
+            for index in range(first, last + 1):
+                rows.extend(self._get_leaderboard_chunk(index))
+            start = offset - first * LEADERBOARD_CHUNK_SIZE
+            return rows[start:start + limit]
+
+    def _get_leaderboard_chunk(self, index):
+        # Читаются только куски вокруг нужной строки. Следующий за прочитанным кусок
+        # продолжается по ключу последней строки, дальний прыжок (End) - через OFFSET:
+        # SQLite пропускает строки внутри покрывающего индекса, не отдавая их в Python
+        rows = self._leaderboard.get(index)
+        if rows is not None:
+            return rows
+        columns = "name, total_points, games_played, wins, losses, kills, hits_landed, combos_completed"
+        previous = self._leaderboard.get(index - 1)
+        if previous and len(previous) == LEADERBOARD_CHUNK_SIZE:
+            last = previous[-1]
+            self.cursor.execute(f"SELECT {columns} FROM players "
+                                "WHERE total_points < ? OR (total_points = ? AND name > ?) "
+                                "ORDER BY total_points DESC, name LIMIT ?",
+                                (last[1], last[1], last[0], LEADERBOARD_CHUNK_SIZE))
+        else:
+            self.cursor.execute(f"SELECT {columns} FROM players ORDER BY total_points DESC, name LIMIT ? OFFSET ?",
+                                (LEADERBOARD_CHUNK_SIZE, index * LEADERBOARD_CHUNK_SIZE))
+        rows = self.cursor.fetchall()
+        self._leaderboard[index] = rows
+        return rows
+
+    def get_player_count(self):
+        # Кэш читается без блокировки: иначе чтение ждёт, пока поток записи матчей
+        # держит транзакцию. Значение берётся в локальную переменную один раз, так что
+        # сброс кэша между проверкой и возвратом ничего не ломает
+        count = self._player_count
+        if count is not None:
+            return count
+        with self.lock:
+            if self._player_count is None:
+                self.cursor.execute("SELECT COUNT(*) FROM players")
+                self._player_count = self.cursor.fetchone()[0]
+            return self._player_count
+
+    def get_character_stats(self):
+        """[(персонаж, игр, побед, доля побед)] по убыванию доли побед"""
+        stats = self._character_stats
+        if stats is not None:
+            return stats
+        with self.lock:
+            if self._character_stats is None:
+                self.cursor.execute("SELECT character, games, wins, CAST(wins AS REAL) / games FROM character_stats "
+                                    "WHERE games > 0 ORDER BY 4 DESC, games DESC")
+                self._character_stats = self.cursor.fetchall()
+            return self._character_stats
+
+    def get_matchup_stats(self, character):
+        """[(соперник, игр, побед, доля побед)] персонажа против каждого соперника"""
+        with self.lock:
+            self.cursor.execute("SELECT opponent, games, wins, CAST(wins AS REAL) / games FROM matchup_stats "
+                                "WHERE character = ? AND games > 0 ORDER BY 4 DESC", (character,))
+            return self.cursor.fetchall()
+
+    def get_player_character_stats(self, name):
+        """[(персонаж, игр, побед, очков)] игрока по персонажам"""
+        with self.lock:
+            self.cursor.execute("SELECT character, games, wins, points FROM player_character_stats "
+                                "WHERE player_name = ? ORDER BY games DESC", (name,))
+            return self.cursor.fetchall()
+
+    def get_player_history(self, name, limit=5):
+        # Каждая половина читается по своему индексу уже в порядке даты
+        with self.lock:
+            self.cursor.execute('''
+                SELECT * FROM (
+                    SELECT player1_name, player2_name, winner_name, player1_points, player2_points, match_date
+                    FROM matches WHERE player1_name = ? ORDER BY match_date DESC LIMIT ?
+                )
+                UNION ALL
+                SELECT * FROM (
+                    SELECT player1_name, player2_name, winner_name, player1_points, player2_points, match_date
+                    FROM matches WHERE player2_name = ? AND player1_name != ? ORDER BY match_date DESC LIMIT ?
+                )
+                ORDER BY match_date DESC LIMIT ?
+            ''', (name, limit, name, name, limit, limit))
+            return self.cursor.fetchall()
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+        Database._instances.pop(self.db_name, None)
+
+    @classmethod
+    def close_all(cls):
+        for database in list(cls._instances.values()):
+            database.close()
+
+class MatchWriter:
+    """Фоновая запись результатов матчей: GameView отдаёт запись и сразу уходит в меню.
+    Запись сначала дописывается в журнал на диске, поток переносит журнал в базу пачками.
+    Номер последней перенесённой записи хранится в базе в той же транзакции, поэтому после
+    сбоя недописанное повторяется при следующем запуске ровно один раз"""
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._start()
+        return cls._instance
+
+    def _start(self):
+        self.db = Database()
+        self.journal_path = Path(MATCH_JOURNAL_PATH)
+        self._queue = queue.Queue()
+        self._journal_lock = threading.Lock()
+        self.applied_seq = int(self.db.get_meta("match_journal_seq", 0))
+        self._next_seq = self.applied_seq + 1
+        for seq, record in self._read_journal():
+            if seq > self.applied_seq:
+                self._queue.put((seq, record))
+                self._next_seq = max(self._next_seq, seq + 1)
+        self._journal = open(self.journal_path, "a", encoding="utf-8")
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _read_journal(self):
+        if not self.journal_path.exists():
+            return []
+        entries = []
+        with open(self.journal_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # Строка, оборванная при сбое, - запись так и не была отдана потоку
+                    continue
+                entries.append((entry.pop("seq"), entry))
+        return entries
+
+    def submit(self, record):
+        with self._journal_lock:
+            seq = self._next_seq
+            self._next_seq += 1
+            self._journal.write(json.dumps(dict(record, seq=seq), ensure_ascii=False) + "\n")
+            self._journal.flush()
+        self._queue.put((seq, record))
+
+    def _run(self):
+        stop = False
+        while not stop:
+            item = self._queue.get()
+            if item is None:
+                break
+            batch = [item]
+            while len(batch) < MATCH_WRITER_BATCH:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+            for attempt in range(MATCH_WRITER_RETRIES):
+                if self._write(batch):
+                    break
+                time.sleep(MATCH_WRITER_RETRY_DELAY)
+            else:
+                # Номер в базе не сдвигается за неперенесённую запись, журнал не очищается
+                print("Запись матчей остановлена, результаты останутся в журнале до следующего запуска")
+                return
+
+    def _write(self, batch):
+        last_seq = max(seq for seq, record in batch)
+        try:
+            with self.db.transaction():
+                for seq, record in batch:
+                    self.db.save_match_record(record)
+                self.db.set_meta("match_journal_seq", last_seq)
+        except Exception as e:
+            print(f"Ошибка записи матчей в базу: {e}")
+            return False
+        self.applied_seq = last_seq
+        with self._journal_lock:
+            # Всё отданное уже в базе - журнал можно начать заново
+            if self.applied_seq == self._next_seq - 1:
+                self._journal.seek(0)
+                self._journal.truncate()
+        return True
+
+    def shutdown(self):
+        """Дописывает очередь в базу; вызывается при выходе из игры"""
+        self._queue.put(None)
+        self._thread.join()
+        self._journal.close()
+        MatchWriter._instance = None
@@ -0,0 +1,88 @@
+"""Нагрузочная проверка базы игроков.
+
+Запуск: python db_benchmark.py [матчей] [игроков]
+Создаёт временную базу через Database из database.py (со всеми миграциями),
+заполняет её случайными матчами (по умолчанию 1 000 000 на 10 000 игроков) и
+замеряет таблицу лидеров (из кэша, без кэша и глубокую страницу) и историю
+матчей игрока. Запрос должен укладываться в DB_BENCHMARK_LIMIT_MS, иначе
+скрипт завершается с кодом 1.
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from database import Database
+
+DB_BENCHMARK_LIMIT_MS = 5
+DB_BENCHMARK_REPEATS = 200
+
+
+def fill_database(db, matches, players, seed=0):
+    rng = random.Random(seed)
+    names = [f"player_{i}" for i in range(players)]
+    start = datetime(2024, 1, 1)
+    with db.transaction():
+        db.cursor.executemany("INSERT INTO players (name, total_points, games_played) VALUES (?, ?, ?)",
+                              [(name, rng.randint(0, 100000), rng.randint(0, 500)) for name in names])
+        batch = []
+        for i in range(matches):
+            p1, p2 = rng.sample(names, 2)
+            date = start + timedelta(seconds=rng.randint(0, 3 * 365 * 24 * 3600))
+            batch.append((p1, p2, p1 if rng.random() < 0.5 else p2, rng.randint(0, 500), rng.randint(0, 500),
+                          date.strftime("%Y-%m-%d %H:%M:%S")))
+            if len(batch) == 50000:
+                db.cursor.executemany("INSERT INTO matches (player1_name, player2_name, winner_name, player1_points, "
+                                      "player2_points, match_date) VALUES (?, ?, ?, ?, ?, ?)", batch)
+                batch = []
+        if batch:
+            db.cursor.executemany("INSERT INTO matches (player1_name, player2_name, winner_name, player1_points, "
+                                  "player2_points, match_date) VALUES (?, ?, ?, ?, ?, ?)", batch)
+    return names
+
+
+def measure(query, repeats=DB_BENCHMARK_REPEATS):
+    """Среднее и худшее время запроса в миллисекундах"""
+    times = []
+    for i in range(repeats):
+        started = time.perf_counter()
+        query(i)
+        times.append((time.perf_counter() - started) * 1000)
+    return sum(times) / len(times), max(times)
+
+
+def main(matches=1000000, players=10000):
+    path = os.path.join(tempfile.mkdtemp(), "benchmark.db")
+    db = Database(path)
+    started = time.time()
+    names = fill_database(db, matches, players)
+    print(f"База {path}: матчей {matches}, игроков {players}, заполнение {time.time() - started:.1f} с")
+    results = {
+        "get_leaderboard(15)": measure(lambda i: db.get_leaderboard(15)),
+        "get_leaderboard(15) без кэша": measure(lambda i: (db.invalidate_leaderboard(), db.get_leaderboard(15))),
+        "get_leaderboard(15, 5000) без кэша": measure(lambda i: (db.invalidate_leaderboard(),
+                                                                 db.get_leaderboard(15, 5000))),
+        "get_player_history(5)": measure(lambda i: db.get_player_history(names[i * 37 % len(names)], 5)),
+    }
+    plans = {
+        "get_leaderboard": "SELECT name, total_points FROM players WHERE total_points < 0 OR "
+                           "(total_points = 0 AND name > '') ORDER BY total_points DESC, name LIMIT 200",
+        "get_player_history": "SELECT * FROM matches WHERE player1_name = 'x' ORDER BY match_date DESC LIMIT 5",
+    }
+    for name, sql in plans.items():
+        plan = " | ".join(row[-1] for row in db.conn.execute("EXPLAIN QUERY PLAN " + sql))
+        print(f"План {name}: {plan}")
+    failed = False
+    for name, (average, worst) in results.items():
+        ok = average <= DB_BENCHMARK_LIMIT_MS
+        failed = failed or not ok
+        print(f"{name}: в среднем {average:.2f} мс, худшее {worst:.2f} мс {'OK' if ok else 'МЕДЛЕННО'}")
+    db.close()
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:3]]
+    sys.exit(main(*args))
@@ -1,5 +1,3 @@
-import arcade
-
 DIO_CHARACTER = {
     "display_name": "DIO",
     "file_prefix": "DIO",
@@ -118,6 +116,20 @@ DIO_CHARACTER = {
         "stand_active_frames": (240, 251),
     },
 
+    "sound_cues": {
+        "attack1": "Attack 1.wav",
+        "attack2": "Attack 1.wav",
+        "attack3": "Attack 1.wav",
+        "stand_attack1": "Attack 2.wav",
+        "stand_attack2": "Attack 3.wav",
+        "stand_attack3": "Attack 4.wav",
+        "stand_summon": "Stand On.wav",
+        "hit": ("Hurt 1.wav", "Hurt 2.wav", "Hurt 3.wav"),
+        "death": "Death Scream.wav",
+        "victory": "Win.wav",
+        "defeat": "Death Scream.wav",
+    },
+
     "combo_window": 30,
     "crouch_freeze_frame": 45,
     "movement_speed": 2,
@@ -126,7 +138,7 @@ DIO_CHARACTER = {
     "dash_distance": 250,
     "dash_cooldown": 35,
     "sprite_scale": 2,
-    "color": arcade.color.YELLOW
+    "color": (255, 255, 0, 255)
 }
 
 DIO_STAND = {
@@ -162,5 +174,5 @@ DIO_STAND = {
     "sprite_scale": 2,
     "offset_x": 0,
     "offset_y": 0,
-    "color": arcade.color.GOLD
+    "color": (255, 215, 0, 255)
 }
\ No newline at end of file
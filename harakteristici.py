@@ -1,4 +1,6 @@
-import arcade
+import json
+import struct
+from pathlib import Path
 
 # Импортируем данные из отдельных файлов персонажей
 from dio_data import DIO_CHARACTER, DIO_STAND
@@ -109,4 +111,160 @@ def get_attack_data(character_name, attack_name):
 def get_combo_window(character_name):
     if character_name in CHARACTERS_DB:
         return CHARACTERS_DB[character_name].get("combo_window", 30)
-    return 30
\ No newline at end of file
+    return 30
+
+def _add_frame_range(frames, frame_range):
+    if frame_range:
+        start, end = frame_range
+        frames.update(range(start, end + 1))
+
+
+def get_used_frames(character_name):
+    """Номера кадров персонажа, на которые ссылаются таблицы анимаций"""
+    if character_name not in CHARACTERS_DB:
+        return []
+    data = CHARACTERS_DB[character_name]
+    frames = {0}  # первый кадр нужен для начальной текстуры спрайта
+    for frame_range, speed in data.get("animations", {}).values():
+        _add_frame_range(frames, frame_range)
+    for attack in data.get("attacks", {}).values():
+        _add_frame_range(frames, attack.get("active_frames"))
+    for key in ("jump_loop", "dash_forward_loop", "dash_backward_loop", "block_frames"):
+        _add_frame_range(frames, data.get(key))
+    if data.get("crouch_freeze_frame") is not None:
+        frames.add(data["crouch_freeze_frame"])
+    return sorted(frames)
+
+
+def get_used_stand_frames(character_name):
+    """Номера кадров стенда (вместе с кадрами ударов раша), на которые ссылаются таблицы"""
+    data = STANDS_DB.get(character_name)
+    if not data:
+        return []
+    frames = set()
+    for frame_range, speed in data.get("animations", {}).values():
+        _add_frame_range(frames, frame_range)
+    for key in ("jump_loop", "dash_forward_loop", "dash_backward_loop"):
+        _add_frame_range(frames, data.get(key))
+    rush_data = data.get("rush_data", {})
+    for key in ("main_frames", "active_frames", "attack_frames"):
+        _add_frame_range(frames, rush_data.get(key))
+    rush_character_data = CHARACTERS_DB[character_name].get("stand_rush_data", {})
+    _add_frame_range(frames, rush_character_data.get("stand_active_frames"))
+    return sorted(frames)
+
+
+def _png_size(file_path):
+    # Ширина и высота из заголовка IHDR, без декодирования картинки
+    with open(file_path, "rb") as f:
+        header = f.read(24)
+    return struct.unpack(">II", header[16:24])
+
+
+def get_frame_sizes(character_name, sprites_root="Спрайты"):
+    """Размеры исходных кадров персонажа {кадр: (ширина, высота)} - из индекса атласа или заголовков PNG"""
+    data = CHARACTERS_DB[character_name]
+    folder = Path(sprites_root) / character_name
+    prefix = data["file_prefix"]
+    index_path = folder / f"{prefix}_atlas.json"
+    if index_path.exists():
+        with open(index_path, encoding="utf-8") as f:
+            frames = json.load(f)["frames"]
+        return {int(i): (entry[7], entry[8]) for i, entry in frames.items() if len(entry) >= 9}
+    sizes = {}
+    for i in get_used_frames(character_name):
+        file_path = folder / f"{prefix}_0-{i}.png"
+        if file_path.exists():
+            sizes[i] = _png_size(file_path)
+    return sizes
+
+
+SOUNDS_ROOT = "Звук"
+SOUND_MANIFEST_NAME = "sound_manifest.json"
+_sound_cues_cache = {}
+
+
+def get_sound_folder(character_name):
+    if character_name == "JotaroKujo":
+        return "Jotaro"
+    return character_name
+
+
+def get_sound_cues(character_name):
+    """Таблица звуков персонажа, собранная один раз: {событие или (анимация, кадр): (звук, ...)}.
+
+    В файле данных персонажа "sound_cues" - словарь событие -> имя файла из папки звуков
+    персонажа или кортеж имён (тогда звук выбирается случайно). События: имя атаки
+    (attack1-3, stand_attack1-3, звук в начале атаки), stand_summon, hit, death, victory,
+    defeat; ключ (анимация, кадр) - звук на этом кадре анимации.
+    """
+    cues = _sound_cues_cache.get(character_name)
+    if cues is None:
+        # Таблица объявлена только в файле данных персонажа; без неё персонаж беззвучен
+        declared = CHARACTERS_DB[character_name].get("sound_cues", {})
+        cues = {trigger: (sounds,) if isinstance(sounds, str) else tuple(sounds)
+                for trigger, sounds in declared.items()}
+        _sound_cues_cache[character_name] = cues
+    return cues
+
+
+def get_used_sounds(character_name):
+    """Файлы звуков, которые встречаются в таблице персонажа - только их и стоит загружать"""
+    return sorted({sound for sounds in get_sound_cues(character_name).values() for sound in sounds})
+
+
+def load_sound_manifest(sounds_root=SOUNDS_ROOT):
+    """Манифест sound_builder.py: {"sounds": {путь в Звук: файл}, "missing": [...]} или None"""
+    manifest_path = Path(sounds_root) / SOUND_MANIFEST_NAME
+    if not manifest_path.exists():
+        return None
+    try:
+        with open(manifest_path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Ошибка чтения манифеста звуков: {e}")
+        return None
+
+
+def frame_usage_report(character_name, sprites_root="Спрайты"):
+    """Сколько текстур и байт экономит загрузка только используемых кадров"""
+    data = CHARACTERS_DB[character_name]
+    sources = [(character_name, data["file_prefix"], get_used_frames(character_name),
+                max(end for (start, end), speed in data["animations"].values()))]
+    stand = STANDS_DB.get(character_name)
+    if stand:
+        # Раньше стенд всегда грузил кадры 0..319
+        sources.append((stand["folder_name"], stand["file_prefix"], get_used_stand_frames(character_name), 319))
+    report = []
+    for folder, prefix, used, old_max_frame in sources:
+        used = set(used)
+        skipped = [i for i in range(old_max_frame + 1) if i not in used]
+        textures = 0
+        disk_bytes = 0
+        memory_bytes = 0
+        for i in skipped:
+            file_path = Path(sprites_root) / folder / f"{prefix}_0-{i}.png"
+            if file_path.exists():
+                textures += 1
+                disk_bytes += file_path.stat().st_size
+                width, height = _png_size(file_path)
+                memory_bytes += width * height * 4
+        report.append({
+            "folder": folder,
+            "used": len(used),
+            "old": old_max_frame + 1,
+            # Только кадры с файлом на диске; отражённые копии не хранятся (отражение при отрисовке)
+            "textures_saved": textures,
+            "disk_bytes_saved": disk_bytes,
+            "memory_bytes_saved": memory_bytes,
+        })
+    return report
+
+
+if __name__ == "__main__":
+    for name in get_available_characters():
+        for row in frame_usage_report(name):
+            print(f"{name}/{row['folder']}: кадров {row['used']} вместо {row['old']}, "
+                  f"текстур сэкономлено {row['textures_saved']}, "
+                  f"диск {row['disk_bytes_saved'] / 1024:.0f} КБ, "
+                  f"память {row['memory_bytes_saved'] / (1024 * 1024):.1f} МБ")
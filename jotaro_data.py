@@ -1,5 +1,3 @@
-import arcade
-
 JOTARO_CHARACTER = {
     "display_name": "Jotaro Kujo",
     "file_prefix": "Jot",
@@ -118,6 +116,20 @@ JOTARO_CHARACTER = {
         "stand_active_frames": (240, 251),
     },
 
+    "sound_cues": {
+        "attack1": "Attack 1.wav",
+        "attack2": "Attack 1.wav",
+        "attack3": "Attack 1.wav",
+        "stand_attack1": "Attack 2.wav",
+        "stand_attack2": "Attack 3.wav",
+        "stand_attack3": "Attack 4.wav",
+        "stand_summon": "Stand On.wav",
+        "hit": ("Hurt 1.wav", "Hurt 2.wav", "Hurt 3.wav"),
+        "death": "Death Scream.wav",
+        "victory": "Win.wav",
+        "defeat": "Death Scream.wav",
+    },
+
     "combo_window": 30,
     "crouch_freeze_frame": 31,
     "movement_speed": 3,
@@ -126,7 +138,7 @@ JOTARO_CHARACTER = {
     "dash_distance": 250,
     "dash_cooldown": 35,
     "sprite_scale": 2,
-    "color": arcade.color.BLUE
+    "color": (0, 0, 255, 255)
 }
 
 JOTARO_STAND = {
@@ -163,5 +175,5 @@ JOTARO_STAND = {
     "sprite_scale": 2,
     "offset_x": -40,
     "offset_y": 0,
-    "color": arcade.color.PURPLE
+    "color": (128, 0, 128, 255)
 }
@@ -1,5 +1,3 @@
-import arcade
-
 KAKYOIN_CHARACTER = {
     "display_name": "Noriaki Kakyoin",
     "file_prefix": "kakven",
@@ -100,6 +98,20 @@ KAKYOIN_CHARACTER = {
             "active_frames": (180, 181),
         },
     },
+    "sound_cues": {
+        "attack1": "kakyoin_attack1.wav",
+        "attack2": "kakyoin_attack1.wav",
+        "attack3": "kakyoin_attack1.wav",
+        "stand_attack1": "kakyoin_attack2.wav",
+        "stand_attack2": "kakyoin_attack3.wav",
+        "stand_attack3": "kakyoin_attack4.wav",
+        "stand_summon": "kakyoin_standsummon.wav",
+        "hit": ("kakyoin_hurt1.wav", "kakyoin_hurt2.wav", "kakyoin_hurt3.wav"),
+        "death": "kakyoin_deathscream.wav",
+        "victory": ("kakyoin_win1.wav", "kakyoin_win2.wav"),
+        "defeat": "kakyoin_deathscream.wav",
+    },
+
     "combo_window": 30,
     "crouch_freeze_frame": 45,
     "movement_speed": 2,
@@ -108,7 +120,7 @@ KAKYOIN_CHARACTER = {
     "dash_distance": 250,
     "dash_cooldown": 35,
     "sprite_scale": 2,
-    "color": arcade.color.EMERALD
+    "color": (80, 200, 120, 255)
 }
 
 KAKYOIN_STAND = {
@@ -134,5 +146,5 @@ KAKYOIN_STAND = {
     "sprite_scale": 2,
     "offset_x": 0,
     "offset_y": 0,
-    "color": arcade.color.GREEN
+    "color": (0, 255, 0, 255)
 }
\ No newline at end of file
@@ -1,199 +1,607 @@
 import arcade
+import json
 import random
-import sqlite3
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from arcade.gl import geometry as gl_geometry
+from PIL import Image
+from pyglet import graphics, media
 from harakteristici import (
-    SCREEN_WIDTH, SCREEN_HEIGHT, SCREEN_TITLE, GRAVITY, GROUND_LEVEL,
+    SCREEN_WIDTH, SCREEN_HEIGHT, SCREEN_TITLE, GROUND_LEVEL,
     get_available_characters,
     character_exists,
     get_character_data,
     get_stand_data,
-    get_attack_data
+    get_used_frames,
+    get_used_stand_frames,
+    SOUNDS_ROOT,
+    get_used_sounds,
+    get_sound_folder,
+    load_sound_manifest
+)
+from database import (
+    LEADERBOARD_PAGE_SIZE,
+    Database,
+    MatchWriter
+)
+from simulation import (
+    STAND_METER_MAX, STAND_METER_SUMMON_COST,
+    INPUT_LEFT, INPUT_RIGHT, INPUT_UP, INPUT_DOWN, INPUT_DASH,
+    INPUT_ATTACK1, INPUT_ATTACK2, INPUT_ATTACK3, INPUT_STAND, INPUT_RUSH,
+    ROUND_START_SOUND_1, ROUND_START_SOUND_2,
+    PlayerStats,
+    Match
 )
 
 MENU_FONT_SIZE = 24
 MENU_FONT_COLOR = arcade.color.WHITE
 MENU_SELECTED_COLOR = arcade.color.YELLOW
 
-ATTACK_COOLDOWN = 20
-HIT_COOLDOWN = 30
-KNOCKBACK_DURATION = 10
-COMBO_WINDOW = 30
-BLOCK_DURATION = 30
-INTRO_ANIMATION_DURATION = 240
-VICTORY_ANIMATION_DURATION = 200
-
-STAND_METER_MAX = 100
-STAND_METER_SUMMON_COST = 10
-STAND_METER_BLOCK_DRAIN = 20
-STAND_METER_BLOCK_DRAIN_NO_STAND = 10
-STAND_METER_GAIN_ON_HIT = 15
-STAND_METER_GAIN_ON_BLOCK = 5
-STAND_METER_GAIN_ON_ATTACK = 2
-STAND_METER_PASSIVE_GAIN = 0.1
-
-POINTS_PER_KILL = 100
-POINTS_PER_HIT = 10
-POINTS_PER_COMBO = 25
-POINTS_PER_BLOCK = 5
-POINTS_PER_DASH = 2
-POINTS_PER_JUMP = 1
-POINTS_PER_STAND_SUMMON = 15
-POINTS_WIN_BONUS = 50
-
-STAND_DAMAGE_DRAIN = 15
-STAND_DAMAGE_DRAIN_NO_STAND = 5
-
 STICK_DEAD_ZONE = 0.3
 
-def get_sound_folder(character_name):
-    if character_name == "JotaroKujo":
-        return "Jotaro"
-    return character_name
-
-class Database:
-    def __init__(self, db_name="players.db"):
-        self.db_name = db_name
-        self.init_db()
-
-    def init_db(self):
-        conn = sqlite3.connect(self.db_name)
-        cursor = conn.cursor()
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS players (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT UNIQUE NOT NULL,
-                total_points INTEGER DEFAULT 0,
-                games_played INTEGER DEFAULT 0,
-                wins INTEGER DEFAULT 0,
-                losses INTEGER DEFAULT 0,
-                kills INTEGER DEFAULT 0,
-                hits_landed INTEGER DEFAULT 0,
-                blocks_successful INTEGER DEFAULT 0,
-                dashes_used INTEGER DEFAULT 0,
-                jumps_used INTEGER DEFAULT 0,
-                stands_summoned INTEGER DEFAULT 0,
-                combos_completed INTEGER DEFAULT 0,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                last_played TIMESTAMP
-            )
-        ''')
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS matches (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                player1_name TEXT,
-                player2_name TEXT,
-                winner_name TEXT,
-                player1_points INTEGER,
-                player2_points INTEGER,
-                match_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (player1_name) REFERENCES players(name),
-                FOREIGN KEY (player2_name) REFERENCES players(name),
-                FOREIGN KEY (winner_name) REFERENCES players(name)
-            )
-        ''')
-        conn.commit()
-        conn.close()
-
-    def get_or_create_player(self, name):
-        conn = sqlite3.connect(self.db_name)
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM players WHERE name = ?", (name,))
-        player = cursor.fetchone()
-        if not player:
-            cursor.execute("INSERT INTO players (name, total_points) VALUES (?, 0)", (name,))
-            conn.commit()
-            cursor.execute("SELECT * FROM players WHERE name = ?", (name,))
-            player = cursor.fetchone()
-        conn.close()
-        return player
-
-    def update_player_stats(self, name, stats):
-        conn = sqlite3.connect(self.db_name)
-        cursor = conn.cursor()
-        set_clause = ", ".join([f"{key} = {key} + ?" for key in stats.keys()])
-        values = list(stats.values()) + [name]
-        cursor.execute(f"UPDATE players SET {set_clause}, last_played = CURRENT_TIMESTAMP WHERE name = ?", values)
-        conn.commit()
-        conn.close()
-
-    def save_match(self, player1_name, player2_name, winner_name, player1_points, player2_points):
-        conn = sqlite3.connect(self.db_name)
-        cursor = conn.cursor()
-        cursor.execute("INSERT INTO matches (player1_name, player2_name, winner_name, player1_points, player2_points) VALUES (?, ?, ?, ?, ?)",
-                      (player1_name, player2_name, winner_name, player1_points, player2_points))
-        conn.commit()
-        conn.close()
-
-    def get_leaderboard(self, limit=10):
-        conn = sqlite3.connect(self.db_name)
-        cursor = conn.cursor()
-        cursor.execute('''
-            SELECT name, total_points, games_played, wins, losses, kills, hits_landed, combos_completed
-            FROM players ORDER BY total_points DESC LIMIT ?
-        ''', (limit,))
-        leaders = cursor.fetchall()
-        conn.close()
-        return leaders
-
-class PlayerStats:
-    def __init__(self, player_name):
-        self.player_name = player_name
-        self.hits_landed = 0
-        self.blocks_successful = 0
-        self.dashes_used = 0
-        self.jumps_used = 0
-        self.stands_summoned = 0
-        self.combos_completed = 0
-        self.kills = 0
-        self.points_earned = 0
-
-    def add_hit(self):
-        self.hits_landed += 1
-        self.points_earned += POINTS_PER_HIT
-
-    def add_block(self):
-        self.blocks_successful += 1
-        self.points_earned += POINTS_PER_BLOCK
-
-    def add_dash(self):
-        self.dashes_used += 1
-        self.points_earned += POINTS_PER_DASH
-
-    def add_jump(self):
-        self.jumps_used += 1
-        self.points_earned += POINTS_PER_JUMP
-
-    def add_stand_summon(self):
-        self.stands_summoned += 1
-        self.points_earned += POINTS_PER_STAND_SUMMON
-
-    def add_combo(self):
-        self.combos_completed += 1
-        self.points_earned += POINTS_PER_COMBO
-
-    def add_kill(self):
-        self.kills += 1
-        self.points_earned += POINTS_PER_KILL
-
-    def add_win_bonus(self):
-        self.points_earned += POINTS_WIN_BONUS
-
-    def get_stats_dict(self):
+P1_KEY_MAP = {
+    arcade.key.A: INPUT_LEFT,
+    arcade.key.D: INPUT_RIGHT,
+    arcade.key.W: INPUT_UP,
+    arcade.key.S: INPUT_DOWN,
+    arcade.key.LSHIFT: INPUT_DASH,
+    arcade.key.RSHIFT: INPUT_DASH,
+    arcade.key.J: INPUT_ATTACK1,
+    arcade.key.I: INPUT_ATTACK2,
+    arcade.key.L: INPUT_ATTACK3,
+    arcade.key.K: INPUT_STAND,
+    arcade.key.U: INPUT_RUSH,
+}
+P2_KEY_MAP = {
+    arcade.key.LEFT: INPUT_LEFT,
+    arcade.key.RIGHT: INPUT_RIGHT,
+    arcade.key.UP: INPUT_UP,
+    arcade.key.DOWN: INPUT_DOWN,
+    arcade.key.RCTRL: INPUT_DASH,
+    arcade.key.SPACE: INPUT_ATTACK1,
+    arcade.key.NUM_1: INPUT_STAND,
+    arcade.key.NUM_2: INPUT_RUSH,
+}
+PAD_BUTTON_MAP = {
+    "a": INPUT_STAND,
+    "x": INPUT_ATTACK1,
+    "y": INPUT_ATTACK2,
+    "b": INPUT_ATTACK3,
+    "leftshoulder": INPUT_DASH,
+    "rightshoulder": INPUT_RUSH,
+}
+
+# Лимит памяти общего кэша текстур (байты несжатых RGBA-кадров). Персонаж со стендом занимает
+# 116 МБ (DIO) - 141 МБ (Jotaro): в лимит входят оба бойца и ещё один, загружаемый на выборе
+TEXTURE_CACHE_MAX_BYTES = 384 * 1024 * 1024
+# Поворот влево через отрицательный масштаб при отрисовке вместо хранения отражённых копий кадров
+MIRROR_AT_DRAW_TIME = True
+PRELOAD_WORKERS = 4
+PRELOAD_UPLOADS_PER_FRAME = 16
+# Столбцы таблицы лидеров: заголовок и смещение от центра экрана
+LEADERBOARD_COLUMNS = (("№", -350), ("ИМЯ", -250), ("ОЧКИ", -100), ("ИГРЫ", 0),
+                       ("ПОБЕДЫ", 100), ("УБИЙСТВА", 200), ("КОМБО", 300))
+# Лимит общего банка звуков (по размеру файлов); звуки, которые кто-то держит, не вытесняются
+SOUND_BANK_MAX_BYTES = 96 * 1024 * 1024
+# Длинные реплики не декодируются целиком, а читаются кусками в фоновом потоке проигрывателя
+STREAMED_SOUND_NAMES = {ROUND_START_SOUND_1, ROUND_START_SOUND_2, "Win.wav"}
+# Микшер звуков боя: общее число голосов, лимит и приоритет каждой категории
+SFX_VOICES = 8
+SFX_CATEGORY_LIMITS = {"hurt": 2, "attack": 3, "voice": 2}
+SFX_CATEGORY_PRIORITY = {"hurt": 0, "attack": 1, "voice": 2}
+
+# Бой считается фиксированными шагами 60 раз в секунду, отрисовка - с любой частотой
+SIMULATION_FPS = 60
+SIMULATION_STEP = 1 / SIMULATION_FPS
+# Сколько шагов можно догнать за один вызов on_update, остальное отставание отбрасывается
+MAX_SIMULATION_STEPS = 5
+# Сдвиг больше этого за шаг - телепорт (смена стороны, новый раунд), его не сглаживаем
+INTERPOLATION_SNAP_DISTANCE = 100
+RENDER_FPS = 240
+# Слои сцены боя снизу вверх; внутри слоя игрок 1 рисуется под игроком 2
+SCENE_LAYER_STAND = 0
+SCENE_LAYER_STAND_ATTACK = 1
+SCENE_LAYER_FIGHTER = 2
+# Фон меню: плитка fon_menu.png, сколько плиток по ширине экрана и скорость прокрутки вниз (пикс/с)
+MENU_BACKGROUND_PATH = Path("Лого") / "fon_menu.png"
+MENU_BACKGROUND_COLUMNS = 5
+MENU_BACKGROUND_SPEED = 180.0
+MENU_BACKGROUND_VERTEX_SHADER = """
+#version 330
+in vec2 in_vert;
+in vec2 in_uv;
+out vec2 uv;
+void main() {
+    gl_Position = vec4(in_vert, 0.0, 1.0);
+    uv = in_uv;
+}
+"""
+MENU_BACKGROUND_FRAGMENT_SHADER = """
+#version 330
+uniform sampler2D tile;
+uniform vec2 tiles;
+uniform float scroll;
+in vec2 uv;
+out vec4 fragColor;
+void main() {
+    fragColor = texture(tile, vec2(uv.x * tiles.x, uv.y * tiles.y + scroll));
+}
+"""
+
+def interpolate_position(previous, x, y, alpha):
+    """Позиция между предыдущим и текущим шагом симуляции"""
+    if previous is None:
+        return x, y
+    previous_x, previous_y = previous
+    if abs(x - previous_x) > INTERPOLATION_SNAP_DISTANCE or abs(y - previous_y) > INTERPOLATION_SNAP_DISTANCE:
+        return x, y
+    return previous_x + (x - previous_x) * alpha, previous_y + (y - previous_y) * alpha
+
+def add_to_scene(scene, sprite, layer, order):
+    """Добавляет спрайт в общий список сцены и держит список отсортированным по слоям"""
+    sprite.scene_depth = (layer, order)
+    scene.append(sprite)
+    scene.sort(key=lambda s: s.scene_depth)
+
+
+class TextureCache:
+    """Общий для всего процесса кэш кадров по ключу (папка, префикс, кадр, отражение)"""
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._textures = OrderedDict()
+            cls._instance._sizes = {}
+            cls._instance._atlases = {}
+            cls._instance._atlas_lock = threading.Lock()
+            cls._instance.total_bytes = 0
+            cls._instance.max_bytes = TEXTURE_CACHE_MAX_BYTES
+            cls._instance.mirror_at_draw_time = MIRROR_AT_DRAW_TIME
+        return cls._instance
+
+    def get(self, folder, prefix, frame, mirrored=False):
+        key = (folder, prefix, frame, mirrored)
+        if key in self._textures:
+            self._textures.move_to_end(key)
+            return self._textures[key]
+        if mirrored:
+            texture_normal = self.get(folder, prefix, frame, False)
+            texture = texture_normal.flip_left_right() if texture_normal else None
+        else:
+            texture = self._load(folder, prefix, frame)
+        self.put(key, texture)
+        return texture
+
+    def _load(self, folder, prefix, frame):
+        atlas = self._get_atlas(folder, prefix)
+        if atlas is not None:
+            if frame in atlas["missing"]:
+                return None
+            if frame in atlas["frames"]:
+                return self._load_from_atlas(atlas, folder, prefix, frame)
+        file_path = Path("Спрайты") / folder / f"{prefix}_0-{frame}.png"
+        if not file_path.exists():
+            return None
+        try:
+            return arcade.load_texture(str(file_path))
+        except Exception as e:
+            return None
+
+    def _get_atlas(self, folder, prefix):
+        # Индекс атласа из atlas_builder.py читается один раз, листы - при первом обращении
+        with self._atlas_lock:
+            if (folder, prefix) not in self._atlases:
+                atlas = None
+                index_path = Path("Спрайты") / folder / f"{prefix}_atlas.json"
+                if index_path.exists():
+                    try:
+                        with open(index_path, encoding="utf-8") as f:
+                            index = json.load(f)
+                        atlas = {
+                            "sheets": [Path("Спрайты") / folder / name for name in index["sheets"]],
+                            "images": {},
+                            "frames": {int(i): tuple(rect) for i, rect in index["frames"].items()},
+                            "missing": set(index.get("missing", [])),
+                        }
+                        atlas["not_cropped"] = set(atlas["frames"])
+                    except Exception as e:
+                        print(f"Ошибка чтения атласа {index_path}: {e}")
+                self._atlases[(folder, prefix)] = atlas
+            return self._atlases[(folder, prefix)]
+
+    def get_anchor(self, folder, prefix, frame):
+        """(смещение_x, смещение_y, ширина, высота) исходного кадра до обрезки, либо None"""
+        atlas = self._get_atlas(folder, prefix)
+        if atlas is not None and frame in atlas["frames"] and len(atlas["frames"][frame]) >= 9:
+            return tuple(atlas["frames"][frame][5:9])
+        texture = self.get(folder, prefix, frame, False)
+        if texture is None:
+            return None
+        return 0, 0, texture.width, texture.height
+
+    def load_anchors(self, folder, prefix, frames):
+        # Та же раскладка, что у all_textures: у отражённого кадра смещение по X меняет знак
+        all_anchors = [{}, {}]
+        for i in frames:
+            anchor = self.get_anchor(folder, prefix, i)
+            if anchor:
+                offset_x, offset_y, width, height = anchor
+                all_anchors[0][i] = anchor
+                all_anchors[1][i] = (-offset_x, offset_y, width, height)
+        return all_anchors
+
+    def _load_from_atlas(self, atlas, folder, prefix, frame):
+        sheet, x, y, width, height = atlas["frames"][frame][:5]
+        try:
+            with self._atlas_lock:
+                if sheet not in atlas["images"]:
+                    sheet_image = Image.open(atlas["sheets"][sheet]).convert("RGBA")
+                    sheet_image.load()
+                    atlas["images"][sheet] = sheet_image
+                image = atlas["images"][sheet].crop((x, y, x + width, y + height))
+                # Лист больше не держим в памяти, когда из него вырезаны все кадры
+                atlas["not_cropped"].discard(frame)
+                if not any(atlas["frames"][i][0] == sheet for i in atlas["not_cropped"]):
+                    del atlas["images"][sheet]
+            return arcade.Texture(image, hash=f"{folder}/{prefix}_0-{frame}")
+        except Exception as e:
+            return None
+
+    def put(self, key, texture):
+        if key in self._textures:
+            self.total_bytes -= self._sizes.pop(key)
+        size = 0
+        # Отражённая текстура использует то же изображение, что и исходная
+        if texture is not None and not key[3]:
+            size = texture.width * texture.height * 4
+        self._textures[key] = texture
+        self._sizes[key] = size
+        self.total_bytes += size
+        while self.total_bytes > self.max_bytes and len(self._textures) > 1:
+            old_key, old_texture = self._textures.popitem(last=False)
+            self.total_bytes -= self._sizes.pop(old_key)
+            if old_texture is not None:
+                self._release(old_texture)
+
+    def _release(self, texture):
+        # Вытесненный кадр убирается и из атласа окна, иначе место на GPU не освобождается.
+        # Атлас arcade 3 ручное удаление не поддерживает (RuntimeError) и освобождает место сам,
+        # когда на текстуру не остаётся ссылок - кэш свою ссылку уже отпустил
+        try:
+            arcade.get_window().ctx.default_atlas.remove(texture)
+        except Exception as e:
+            pass
+
+    def __contains__(self, key):
+        return key in self._textures
+
+    def load_frames(self, folder, prefix, frames):
+        if self.mirror_at_draw_time:
+            # Оба направления смотрят в один словарь, отражает спрайт при отрисовке
+            textures = {i: self.get(folder, prefix, i, False) for i in frames}
+            return [textures, textures]
+        all_textures = [{}, {}]
+        for i in frames:
+            all_textures[0][i] = self.get(folder, prefix, i, False)
+            all_textures[1][i] = self.get(folder, prefix, i, True)
+        return all_textures
+
+    def drop_mirrored(self):
+        for key in [key for key in self._textures if key[3]]:
+            texture = self._textures.pop(key)
+            self.total_bytes -= self._sizes.pop(key)
+            if texture is not None:
+                self._release(texture)
+
+    def memory_report(self):
+        normal = 0
+        mirrored = 0
+        for key, texture in self._textures.items():
+            if texture is None:
+                continue
+            if key[3]:
+                mirrored += 1
+            else:
+                normal += 1
         return {
-            "total_points": self.points_earned,
-            "games_played": 1,
-            "wins": 1 if self.kills > 0 else 0,
-            "losses": 1 if self.kills == 0 else 0,
-            "kills": self.kills,
-            "hits_landed": self.hits_landed,
-            "blocks_successful": self.blocks_successful,
-            "dashes_used": self.dashes_used,
-            "jumps_used": self.jumps_used,
-            "stands_summoned": self.stands_summoned,
-            "combos_completed": self.combos_completed
+            "mode": "draw" if self.mirror_at_draw_time else "stored",
+            "textures": normal + mirrored,
+            "normal": normal,
+            "mirrored": mirrored,
+            "image_bytes": self.total_bytes,
         }
 
+    def clear(self):
+        self._textures.clear()
+        self._sizes.clear()
+        self._atlases.clear()
+        self.total_bytes = 0
+
+def get_texture_frames(character_name):
+    """Кадры, которые загружают персонаж, его стенд и атака стенда: {(папка, префикс): кадры}"""
+    character_data = get_character_data(character_name)
+    texture_frames = {(character_name, character_data["file_prefix"]): get_used_frames(character_name)}
+    stand_data = get_stand_data(character_name)
+    if stand_data:
+        texture_frames[(stand_data["folder_name"], stand_data["file_prefix"])] = get_used_stand_frames(character_name)
+    return texture_frames
+
+class AssetPreloader:
+    """Фоновая загрузка кадров: декодирование в потоках, выгрузка на GPU небольшими порциями"""
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._executor = None
+            cls._instance._pending = {}
+            cls._instance._totals = {}
+            cls._instance._ready = set()
+        return cls._instance
+
+    def request(self, character_name):
+        # Загруженный раньше персонаж проверяется по кэшу заново: его кадры могли быть вытеснены
+        if character_name in self._pending or not character_exists(character_name):
+            return
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=PRELOAD_WORKERS, thread_name_prefix="preload")
+        cache = TextureCache()
+        jobs = deque()
+        for (folder, prefix), frames in get_texture_frames(character_name).items():
+            for i in frames:
+                key = (folder, prefix, i, False)
+                if key not in cache:
+                    jobs.append((key, self._executor.submit(cache._load, folder, prefix, i)))
+        if not jobs:
+            self._ready.add(character_name)
+            return
+        self._ready.discard(character_name)
+        self._pending[character_name] = jobs
+        self._totals[character_name] = len(jobs)
+
+    def progress(self, character_name):
+        jobs = self._pending.get(character_name)
+        if jobs is None:
+            return 1.0 if character_name in self._ready else 0.0
+        return 1.0 - len(jobs) / self._totals[character_name]
+
+    def pump(self, budget=PRELOAD_UPLOADS_PER_FRAME):
+        for name, jobs in list(self._pending.items()):
+            while jobs and budget > 0 and jobs[0][1].done():
+                key, future = jobs.popleft()
+                self._publish(key, future.result())
+                budget -= 1
+            if not jobs:
+                self._done(name)
+
+    def finish(self, character_names):
+        for name in character_names:
+            self.request(name)
+            jobs = self._pending.get(name)
+            while jobs:
+                key, future = jobs.popleft()
+                self._publish(key, future.result())
+            if jobs is not None:
+                self._done(name)
+
+    def _done(self, character_name):
+        del self._pending[character_name]
+        del self._totals[character_name]
+        self._ready.add(character_name)
+
+    def _publish(self, key, texture):
+        cache = TextureCache()
+        if key in cache:
+            return
+        cache.put(key, texture)
+        if texture is None:
+            return
+        try:
+            arcade.get_window().ctx.default_atlas.add(texture)
+        except Exception as e:
+            pass
+
+    def shutdown(self):
+        if self._executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+class SoundBank:
+    """Общий для всего процесса банк звуков по пути файла: каждый файл декодируется один раз,
+    освобождённые звуки остаются в памяти до превышения лимита и вытесняются по давности"""
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._sounds = OrderedDict()
+            cls._instance._sizes = {}
+            cls._instance._refs = {}
+            cls._instance._missing = set()
+            cls._instance._manifest = None
+            cls._instance.total_bytes = 0
+            cls._instance.max_bytes = SOUND_BANK_MAX_BYTES
+        return cls._instance
+
+    def resolve(self, path):
+        """Файл, который надо читать вместо пути из кода, или None, если звука нет.
+        Если собран манифест (sound_builder.py), дубликаты и перекодированные копии берутся из него"""
+        key = str(path)
+        if key in self._missing:
+            return None
+        if self._manifest is None:
+            self._manifest = load_sound_manifest() or {}
+        try:
+            relative = Path(key).relative_to(SOUNDS_ROOT).as_posix()
+        except ValueError:
+            relative = None
+        if relative in self._manifest.get("sounds", {}):
+            return self._manifest["sounds"][relative]
+        if relative in self._manifest.get("missing", ()) or not Path(key).exists():
+            self._missing.add(key)
+            return None
+        return key
+
+    def get(self, path):
+        """Звук по пути без захвата ссылки; None, если файла нет или он не читается"""
+        key = str(path)
+        if key in self._sounds:
+            self._sounds.move_to_end(key)
+            return self._sounds[key]
+        file_path = self.resolve(key)
+        if file_path is None:
+            return None
+        try:
+            sound = arcade.load_sound(file_path)
+        except Exception as e:
+            print(f"Ошибка загрузки звука {file_path}: {e}")
+            self._missing.add(key)
+            return None
+        self._sounds[key] = sound
+        self._sizes[key] = Path(file_path).stat().st_size
+        self.total_bytes += self._sizes[key]
+        self._evict()
+        return sound
+
+    def acquire(self, path):
+        sound = self.get(path)
+        if sound is not None:
+            key = str(path)
+            self._refs[key] = self._refs.get(key, 0) + 1
+        return sound
+
+    def release(self, path):
+        key = str(path)
+        count = self._refs.get(key, 0) - 1
+        if count > 0:
+            self._refs[key] = count
+        else:
+            self._refs.pop(key, None)
+        self._evict()
+
+    def play(self, path, volume=1.0):
+        sound = self.get(path)
+        if sound is None:
+            return None
+        return arcade.play_sound(sound, volume=volume)
+
+    def open_stream(self, path):
+        """Потоковый звук: в памяти только текущий кусок, а не весь трек.
+        Потоковый источник проигрывается один раз, поэтому открывается заново при каждом запуске"""
+        key = str(path)
+        file_path = self.resolve(key)
+        if file_path is None:
+            return None
+        try:
+            return arcade.load_sound(file_path, streaming=True)
+        except Exception as e:
+            print(f"Ошибка загрузки звука {file_path}: {e}")
+            self._missing.add(key)
+            return None
+
+    def stream(self, path, volume=1.0, loop=False):
+        sound = self.open_stream(path)
+        if sound is None:
+            return None
+        return arcade.play_sound(sound, volume=volume, loop=loop)
+
+    def _evict(self):
+        for key in list(self._sounds):
+            if self.total_bytes <= self.max_bytes:
+                break
+            if self._refs.get(key):
+                continue
+            del self._sounds[key]
+            self.total_bytes -= self._sizes.pop(key)
+
+def get_sound_category(sound_name):
+    if sound_name.startswith("Hurt"):
+        return "hurt"
+    if sound_name.startswith("Attack"):
+        return "attack"
+    return "voice"
+
+class SfxPlayer(media.Player):
+    """Проигрыватель голоса: в конце звука встаёт на паузу в начале звука, а не сбрасывает
+    источник - иначе pyglet удаляет звуковой плеер драйвера и создаёт его заново"""
+
+    def on_eos(self):
+        self.pause()
+        self.seek(0.0)
+
+class SfxVoice:
+    """Голос микшера: проигрыватель и плеер драйвера создаются один раз, дальше голос
+    только получает новые звуки"""
+
+    def __init__(self):
+        self.player = None
+        self.category = None
+        self.priority = -1
+        self.started = 0
+
+    def is_busy(self):
+        return self.player is not None and self.player.playing
+
+    def start(self, sound, category, volume, started):
+        if self.player is None:
+            self.player = SfxPlayer()
+            self.player.queue(sound.source)
+        else:
+            self.player.pause()
+            # Новый звук ставится в очередь до переключения: очередь не пустеет,
+            # и pyglet передаёт его тому же плееру драйвера
+            self.player.queue(sound.source)
+            self.player.next_source()
+        self.category = category
+        self.priority = SFX_CATEGORY_PRIORITY[category]
+        self.started = started
+        self.player.volume = volume
+        self.player.play()
+
+    def stop(self):
+        if self.player is not None:
+            self.player.pause()
+            self.player.seek(0.0)
+
+class SfxMixer:
+    """Звуки боя на фиксированном наборе голосов. Категория, набравшая свой лимит, заменяет
+    свой самый старый звук; когда заняты все голоса, вытесняется самый старый звук с
+    наименьшим приоритетом, но не выше приоритета нового"""
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._voices = [SfxVoice() for _ in range(SFX_VOICES)]
+            cls._instance._started = 0
+        return cls._instance
+
+    def play(self, sound, category, volume=1.0):
+        if sound is None:
+            return None
+        busy = [voice for voice in self._voices if voice.is_busy()]
+        same = [voice for voice in busy if voice.category == category]
+        if len(same) >= SFX_CATEGORY_LIMITS[category]:
+            voice = min(same, key=lambda v: v.started)
+        elif len(busy) < len(self._voices):
+            voice = next(voice for voice in self._voices if not voice.is_busy())
+        else:
+            priority = SFX_CATEGORY_PRIORITY[category]
+            candidates = [voice for voice in busy if voice.priority <= priority]
+            if not candidates:
+                return None
+            voice = min(candidates, key=lambda v: (v.priority, v.started))
+        self._started += 1
+        voice.start(sound, category, volume, self._started)
+        return voice
+
+    def stop_all(self):
+        for voice in self._voices:
+            voice.stop()
+
 class MusicManager:
     _instance = None
     _current_music = None
@@ -211,17 +619,158 @@ class MusicManager:
         music_path = Path("Звук") / "Menu" / "jojo_menu.mp3"
         if music_path.exists():
             self.stop_music()
-            self._current_music = arcade.load_sound(str(music_path))
-            if self._current_music:
-                self._music_player = arcade.play_sound(self._current_music, volume=0.5)
+            self._current_music = music_path
+            self._music_player = SoundBank().stream(music_path, volume=0.5)
+            if self._music_player:
                 self._is_playing = True
 
     def stop_music(self):
         if self._current_music and self._is_playing:
+            if self._music_player:
+                arcade.stop_sound(self._music_player)
             self._current_music = None
             self._music_player = None
             self._is_playing = False
 
+class Hud:
+    """Надписи и прямоугольники интерфейса, которые живут между кадрами и рисуются двумя вызовами.
+    Каждый кадр вид заново перечисляет нужные элементы через text() и rect(); arcade.Text и
+    прямоугольник-спрайт создаются один раз на ключ, а текст, цвет, позиция и размер меняются,
+    только если стали другими. Элементы, не запрошенные в этом кадре, скрываются.
+    Прямоугольники рисуются под надписями в порядке создания"""
+
+    def __init__(self):
+        self.batch = graphics.Batch()
+        self.labels = {}
+        self.state = {}
+        self.sprites = arcade.SpriteList()
+        self.rects = {}
+        self.geometry = {}
+        self.shown = set()
+
+    def begin(self):
+        self.shown = set()
+
+    def text(self, key, value, x, y, color, font_size, **kwargs):
+        label = self.labels.get(key)
+        if label is None:
+            label = arcade.Text(str(value), x, y, color, font_size, batch=self.batch, **kwargs)
+            self.labels[key] = label
+            self.state[key] = (x, y, tuple(color))
+        else:
+            label.text = value
+            x_old, y_old, color_old = self.state[key]
+            if (x_old, y_old) != (x, y):
+                label.position = (x, y)
+            if color_old != tuple(color):
+                label.color = color
+            self.state[key] = (x, y, tuple(color))
+        self.shown.add(key)
+        return label
+
+    def rect(self, key, left, bottom, width, height, color):
+        sprite = self.rects.get(key)
+        if sprite is None:
+            sprite = arcade.SpriteSolidColor(1, 1, color=color)
+            self.rects[key] = sprite
+            self.sprites.append(sprite)
+        geometry = (left, bottom, width, height, tuple(color))
+        if self.geometry.get(key) != geometry:
+            sprite.size = (width, height)
+            sprite.position = (left + width / 2, bottom + height / 2)
+            sprite.color = color
+            self.geometry[key] = geometry
+        self.shown.add(key)
+        return sprite
+
+    def draw(self):
+        for key, sprite in self.rects.items():
+            sprite.visible = key in self.shown
+        for key, label in self.labels.items():
+            label.visible = key in self.shown
+        self.sprites.draw()
+        self.batch.draw()
+
+class MenuBackground:
+    """Прокручиваемый фон всех меню: один полноэкранный прямоугольник, плитка повторяется
+    в шейдере, а прокрутка - это сдвиг текстурных координат. Один на процесс, поэтому
+    при переходе между меню ничего не создаётся и прокрутка продолжается с того же места"""
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance.scroll = 0.0
+            cls._instance.ready = False
+            cls._instance.texture = None
+        return cls._instance
+
+    def _setup(self):
+        # Ресурсы GL создаются при первой отрисовке, когда окно уже есть
+        self.ready = True
+        if not MENU_BACKGROUND_PATH.exists():
+            return
+        ctx = arcade.get_window().ctx
+        image = Image.open(MENU_BACKGROUND_PATH).convert("RGBA").transpose(Image.Transpose.FLIP_TOP_BOTTOM)
+        self.texture = ctx.texture(image.size, components=4, data=image.tobytes(),
+                                   wrap_x=ctx.REPEAT, wrap_y=ctx.REPEAT)
+        self.program = ctx.program(vertex_shader=MENU_BACKGROUND_VERTEX_SHADER,
+                                   fragment_shader=MENU_BACKGROUND_FRAGMENT_SHADER)
+        self.quad = gl_geometry.quad_2d_fs()
+        tile_height = image.height * SCREEN_WIDTH / (MENU_BACKGROUND_COLUMNS * image.width)
+        self.program["tiles"] = (MENU_BACKGROUND_COLUMNS, SCREEN_HEIGHT / tile_height)
+        self.tile_height = tile_height
+
+    def update(self, delta_time):
+        if self.texture:
+            # Сдвиг хранится в долях плитки и не растёт бесконечно
+            self.scroll = (self.scroll + MENU_BACKGROUND_SPEED * delta_time / self.tile_height) % 1.0
+
+    def draw(self):
+        if not self.ready:
+            self._setup()
+        if not self.texture:
+            return
+        self.program["scroll"] = self.scroll
+        self.texture.use(0)
+        self.quad.render(self.program)
+
+class ViewNavigator:
+    """Переходы между видами. Каждый вид меню создаётся (и читает свои файлы) один раз за игру,
+    при показе ему передаются общие звуки и музыка, параметры показа записываются в его атрибуты,
+    а своё состояние вид сбрасывает в on_show_view"""
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance.views = {}
+            cls._instance.select_sound = None
+            cls._instance.confirm_sound = None
+            cls._instance.music_manager = MusicManager()
+        return cls._instance
+
+    def get(self, view_class):
+        view = self.views.get(view_class)
+        if view is None:
+            view = view_class()
+            self.views[view_class] = view
+        return view
+
+    def show(self, view_class, **params):
+        view = self.get(view_class)
+        for name, value in params.items():
+            setattr(view, name, value)
+        return self.show_new(view)
+
+    def show_new(self, view):
+        """Показывает вид, который не хранится (бой создаётся на каждый матч)"""
+        view.select_sound = self.select_sound
+        view.confirm_sound = self.confirm_sound
+        view.music_manager = self.music_manager
+        arcade.get_window().show_view(view)
+        return view
+
 class StartView(arcade.View):
     def __init__(self):
         super().__init__()
@@ -237,17 +786,17 @@ class StartView(arcade.View):
         self.select_sound = None
         self.confirm_sound = None
         self.load_sounds()
+        # Пока идёт заставка, подгружаем персонажа под курсором выбора по умолчанию
+        AssetPreloader().request(get_available_characters()[0])
 
     def load_sounds(self):
-        try:
-            select_path = Path("Звук") / "Menu" / "Menu Select.wav"
-            if select_path.exists():
-                self.select_sound = arcade.load_sound(str(select_path))
-            confirm_path = Path("Звук") / "Menu" / "Menu Confirm.wav"
-            if confirm_path.exists():
-                self.confirm_sound = arcade.load_sound(str(confirm_path))
-        except Exception as e:
-            print(f"Ошибка загрузки звуков: {e}")
+        # Звуки меню держатся всё время работы игры
+        self.select_sound = SoundBank().acquire(Path("Звук") / "Menu" / "Menu Select.wav")
+        self.confirm_sound = SoundBank().acquire(Path("Звук") / "Menu" / "Menu Confirm.wav")
+        navigator = ViewNavigator()
+        navigator.select_sound = self.select_sound
+        navigator.confirm_sound = self.confirm_sound
+        navigator.music_manager = self.music_manager
 
     def on_draw(self):
         self.clear()
@@ -258,6 +807,7 @@ class StartView(arcade.View):
             self.text_obj.draw()
 
     def on_update(self, delta_time):
+        AssetPreloader().pump()
         self.timer += delta_time
         if self.timer > 0.5:
             self.show_text = not self.show_text
@@ -269,913 +819,250 @@ class StartView(arcade.View):
             if self.confirm_sound:
                 arcade.play_sound(self.confirm_sound)
             self.music_manager.play_menu_music()
-            mode_menu_view = ModeMenuView()
-            mode_menu_view.select_sound = self.select_sound
-            mode_menu_view.confirm_sound = self.confirm_sound
-            mode_menu_view.music_manager = self.music_manager
-            self.window.show_view(mode_menu_view)
+            ViewNavigator().show(ModeMenuView)
 
 class StandAttack(arcade.Sprite):
-    def __init__(self, owner_stand):
+    def __init__(self, state):
         super().__init__()
-        self.owner_stand = owner_stand
-        self.owner = owner_stand.owner
-        self.stand_data = owner_stand.stand_data
-        self.rush_data = self.stand_data.get("rush_data", {})
-        self.attack_frames = self.rush_data.get("attack_frames", (296, 319))
-        self.offset_x = self.rush_data.get("attack_offset_x", 150)
-        self.offset_y = self.rush_data.get("attack_offset_y", 50)
+        self.state = state
+        self.owner = state.owner
+        self.stand_data = state.stand_data
+        self.attack_frames = state.attack_frames
         self.folder_name = self.stand_data["folder_name"]
         self.file_prefix = self.stand_data["file_prefix"]
         self.scale = self.stand_data["sprite_scale"]
         self.all_textures = [{}, {}]
+        self.draw_offset_x = 0
+        self.draw_offset_y = 0
+        self.shown_frame = None
+        self.previous_position = None
         self.load_attack_textures()
-        self.current_frame = self.attack_frames[0]
-        self.frame_counter = 0
-        self.is_active = False
-        self.animation_speed = 2
-        self.loop_count = 0
-        self.max_loops = 2
-        texture = self.get_current_texture(self.current_frame)
-        if texture:
-            self.texture = texture
+        self.sync()
 
     def load_attack_textures(self):
-        stand_path = Path("Спрайты") / self.folder_name
         start_frame, end_frame = self.attack_frames
-        for i in range(start_frame, end_frame + 1):
-            filename = f"{self.file_prefix}_0-{i}.png"
-            file_path = stand_path / filename
-            if file_path.exists():
-                try:
-                    texture_normal = arcade.load_texture(str(file_path))
-                    self.all_textures[0][i] = texture_normal
-                    self.all_textures[1][i] = texture_normal.flip_left_right()
-                except Exception as e:
-                    self.all_textures[0][i] = None
-                    self.all_textures[1][i] = None
-            else:
-                self.all_textures[0][i] = None
-                self.all_textures[1][i] = None
+        frames = range(start_frame, end_frame + 1)
+        self.all_textures = TextureCache().load_frames(self.folder_name, self.file_prefix, frames)
+        self.frame_anchors = TextureCache().load_anchors(self.folder_name, self.file_prefix, frames)
+        self.shown_frame = None
 
     def get_current_texture(self, frame_number):
         direction = self.owner.current_direction
         if frame_number in self.all_textures[direction] and self.all_textures[direction][frame_number]:
+            self._set_frame_anchor(direction, frame_number)
             return self.all_textures[direction][frame_number]
         other_dir = 1 - direction
         if frame_number in self.all_textures[other_dir] and self.all_textures[other_dir][frame_number]:
+            self._set_frame_anchor(other_dir, frame_number)
             return self.all_textures[other_dir][frame_number]
         return None
 
-    def activate(self):
-        self.is_active = True
-        self.current_frame = self.attack_frames[0]
-        self.frame_counter = 0
-        self.loop_count = 0
-        self.update_position()
-
-    def deactivate(self):
-        self.is_active = False
-
-    def update_position(self):
-        if not self.owner:
-            return
-        dir_mult = 1 if self.owner.facing_right else -1
-        self.center_x = self.owner.center_x + (self.offset_x * dir_mult)
-        self.center_y = self.owner.center_y + self.offset_y
-
-    def update_animation(self):
-        if not self.is_active:
-            return
-        self.frame_counter += 1
-        if self.frame_counter >= self.animation_speed:
-            self.frame_counter = 0
-            self.current_frame += 1
-            if self.current_frame > self.attack_frames[1]:
-                self.loop_count += 1
-                if self.loop_count < self.max_loops:
-                    self.current_frame = self.attack_frames[0]
-                else:
-                    self.current_frame = self.attack_frames[1]
-            texture = self.get_current_texture(self.current_frame)
+    def _set_frame_anchor(self, direction, frame_number):
+        scale = self.stand_data["sprite_scale"]
+        mirrored = TextureCache().mirror_at_draw_time and direction == 1
+        self.scale_x = -scale if mirrored else scale
+        anchor = self.frame_anchors[direction].get(frame_number)
+        if anchor:
+            self.draw_offset_x = anchor[0] * scale
+            self.draw_offset_y = anchor[1] * scale
+
+    def remember_position(self):
+        self.previous_position = (self.state.center_x, self.state.center_y)
+
+    def sync(self, alpha=1.0):
+        # Эффект раша рисуется только пока активен; точка удара - в состоянии, спрайт сдвинут на смещение кадра
+        self.visible = self.state.is_active
+        frame = (self.state.current_frame, self.owner.current_direction)
+        if frame != self.shown_frame:
+            texture = self.get_current_texture(self.state.current_frame)
             if texture:
                 self.texture = texture
-        self.update_position()
-
-    def draw(self):
-        if self.is_active and self.texture:
-            super().draw()
+            self.shown_frame = frame
+        x, y = interpolate_position(self.previous_position, self.state.center_x, self.state.center_y, alpha)
+        self.center_x = x + self.draw_offset_x
+        self.center_y = y + self.draw_offset_y
 
 class Stand(arcade.Sprite):
-    def __init__(self, owner):
+    def __init__(self, state):
         super().__init__()
-        self.owner = owner
-        self.stand_data = get_stand_data(owner.character_name)
+        self.state = state
+        self.owner = state.owner
+        self.stand_data = state.stand_data
         self.folder_name = self.stand_data["folder_name"]
         self.file_prefix = self.stand_data["file_prefix"]
-        self.animations = self.stand_data["animations"]
-        self.frame_ranges = {}
-        self.animation_speeds = {}
-        for anim_name, (frames, speed) in self.animations.items():
-            self.frame_ranges[anim_name] = frames
-            self.animation_speeds[anim_name] = speed
-        self.jump_loop = self.stand_data.get("jump_loop", None)
         self.scale = self.stand_data["sprite_scale"]
         self.all_textures = [{}, {}]
+        self.draw_offset_x = 0
+        self.draw_offset_y = 0
+        self.shown_frame = None
+        self.previous_position = None
         self.load_all_textures()
-        self.current_direction = owner.current_direction
-        self.current_action = "summon"
-        self.current_frame = self.frame_ranges["summon"][0]
-        self.frame_counter = 0
-        self.is_summoning = True
-        self.is_attacking = False
-        self.is_rushing = False
-        self.current_combo = 0
-        self.attack_timer = 0
-        self.has_hit_in_this_attack = False
-        self.attack_duration = 0
-        self.rush_data = self.stand_data.get("rush_data", {})
-        self.rush_main_frames = self.rush_data.get("main_frames", (237, 255))
-        self.rush_active_frames = self.rush_data.get("active_frames", (240, 251))
-        self.stand_attack = StandAttack(self)
-        self.attack_activated = False
-        texture = self.get_current_texture(self.current_frame)
-        if texture:
-            self.texture = texture
+        self.stand_attack = StandAttack(state.stand_attack)
+        self.sync()
 
     def load_all_textures(self):
-        stand_path = Path("Спрайты") / self.folder_name
-        max_frame = 319
-        for i in range(max_frame + 1):
-            filename = f"{self.file_prefix}_0-{i}.png"
-            file_path = stand_path / filename
-            if file_path.exists():
-                try:
-                    texture_normal = arcade.load_texture(str(file_path))
-                    self.all_textures[0][i] = texture_normal
-                    self.all_textures[1][i] = texture_normal.flip_left_right()
-                except Exception as e:
-                    self.all_textures[0][i] = None
-                    self.all_textures[1][i] = None
-            else:
-                self.all_textures[0][i] = None
-                self.all_textures[1][i] = None
+        frames = get_texture_frames(self.owner.character_name)[(self.folder_name, self.file_prefix)]
+        self.all_textures = TextureCache().load_frames(self.folder_name, self.file_prefix, frames)
+        self.frame_anchors = TextureCache().load_anchors(self.folder_name, self.file_prefix, frames)
+        self.shown_frame = None
 
     def get_current_texture(self, frame_number):
-        if frame_number in self.all_textures[self.current_direction] and self.all_textures[self.current_direction][frame_number]:
-            return self.all_textures[self.current_direction][frame_number]
-        other_dir = 1 - self.current_direction
+        direction = self.state.current_direction
+        if frame_number in self.all_textures[direction] and self.all_textures[direction][frame_number]:
+            self._set_frame_anchor(direction, frame_number)
+            return self.all_textures[direction][frame_number]
+        other_dir = 1 - direction
         if frame_number in self.all_textures[other_dir] and self.all_textures[other_dir][frame_number]:
+            self._set_frame_anchor(other_dir, frame_number)
             return self.all_textures[other_dir][frame_number]
         return None
 
-    def set_action(self, new_action):
-        if new_action == self.current_action or new_action not in self.frame_ranges:
-            return
-        self.current_action = new_action
-        self.current_frame = self.frame_ranges[new_action][0]
-        self.frame_counter = 0
-
-    def start_attack(self, combo_number):
-        attack_name = f"attack{combo_number}"
-        if attack_name not in self.frame_ranges:
-            return False
-        self.current_combo = combo_number
-        self.is_attacking = True
-        self.has_hit_in_this_attack = False
-        self.is_rushing = False
-        self.set_action(attack_name)
-        start_frame, end_frame = self.frame_ranges[attack_name]
-        frame_count = end_frame - start_frame + 1
-        anim_speed = self.animation_speeds.get(attack_name, 5)
-        self.attack_duration = frame_count * anim_speed
-        self.attack_timer = self.attack_duration
-        return True
-
-    def start_rush(self):
-        if not self.rush_main_frames:
-            return False
-        self.is_rushing = True
-        self.is_attacking = True
-        self.has_hit_in_this_attack = False
-        self.current_combo = 0
-        self.attack_activated = False
-        self.current_action = "rush"
-        self.current_frame = self.rush_main_frames[0]
-        self.frame_counter = 0
-        frame_count = self.rush_main_frames[1] - self.rush_main_frames[0] + 1
-        anim_speed = 3
-        self.attack_duration = frame_count * anim_speed
-        self.attack_timer = self.attack_duration
-        return True
-
-    def check_attack_hit(self, opponent):
-        if not self.is_attacking or self.has_hit_in_this_attack or not opponent or self.is_rushing:
-            return False
-        stand_attack_name = f"stand_attack{self.current_combo}"
-        attack_data = get_attack_data(self.owner.character_name, stand_attack_name)
-        if not attack_data:
-            return False
-        active_frames = attack_data.get("active_frames", (0, 0))
-        if self.current_frame < active_frames[0] or self.current_frame > active_frames[1]:
-            return False
-        if opponent.hit_cooldown > 0:
-            return False
-        hitbox_width, hitbox_height = attack_data.get("hitbox", (80, 100))
-        offset_x = attack_data.get("offset_x", 80)
-        offset_y = attack_data.get("offset_y", 0)
-        if self.owner.facing_right:
-            hitbox_left = self.owner.center_x + offset_x - hitbox_width // 2
-        else:
-            hitbox_left = self.owner.center_x - offset_x - hitbox_width // 2
-        hitbox_right = hitbox_left + hitbox_width
-        hitbox_center_y = self.owner.center_y + offset_y
-        hitbox_bottom = hitbox_center_y - hitbox_height // 2
-        hitbox_top = hitbox_center_y + hitbox_height // 2
-        if hasattr(opponent, '_custom_hitbox') and opponent._custom_hitbox:
-            opp_width, opp_height = opponent._custom_hitbox
-            opponent_left = opponent.center_x - opp_width // 2
-            opponent_right = opponent.center_x + opp_width // 2
-            opponent_bottom = opponent.center_y - opp_height // 2
-            opponent_top = opponent.center_y + opp_height // 2
-        else:
-            opponent_left = opponent.center_x - opponent.width // 2
-            opponent_right = opponent.center_x + opponent.width // 2
-            opponent_bottom = opponent.center_y - opponent.height // 2
-            opponent_top = opponent.center_y + opponent.height // 2
-        if (hitbox_right > opponent_left and hitbox_left < opponent_right and
-                hitbox_top > opponent_bottom and hitbox_bottom < opponent_top):
-            self.has_hit_in_this_attack = True
-            damage = attack_data.get("damage", 15)
-            knockback = attack_data.get("knockback", 10)
-            knockback_dir = 1 if self.owner.facing_right else -1
-            opponent.take_damage(damage, knockback * knockback_dir)
-            self.owner.attack_hit = True
-            if hasattr(self.owner, 'stats') and self.owner.stats is not None:
-                self.owner.stats.add_hit()
-            return True
-        return False
-
-    def update_animation(self):
-        self.frame_counter += 1
-        if self.is_rushing:
-            anim_speed = 3
-        else:
-            anim_speed = self.animation_speeds.get(self.current_action, 5)
-        if self.frame_counter >= anim_speed:
-            self.frame_counter = 0
-            if self.is_rushing:
-                start_frame, end_frame = self.rush_main_frames
-                self.current_frame += 1
-                if not self.attack_activated and self.current_frame >= self.rush_active_frames[0]:
-                    self.attack_activated = True
-                    self.stand_attack.activate()
-                if self.current_frame > end_frame:
-                    self.is_attacking = False
-                    self.is_rushing = False
-                    self.current_action = "idle"
-                    if "idle" in self.frame_ranges:
-                        self.current_frame = self.frame_ranges["idle"][0]
-                    self.stand_attack.deactivate()
-                    self.attack_activated = False
-                else:
-                    texture = self.get_current_texture(self.current_frame)
-                    if texture:
-                        self.texture = texture
-            else:
-                if self.current_action in self.frame_ranges:
-                    start_frame, end_frame = self.frame_ranges[self.current_action]
-                    if self.current_action == "jump" and self.jump_loop:
-                        loop_start, loop_end = self.jump_loop
-                        if self.current_frame < loop_start:
-                            self.current_frame += 1
-                        elif self.owner.center_y > GROUND_LEVEL + 5:
-                            if self.current_frame >= loop_end:
-                                self.current_frame = loop_start
-                            else:
-                                self.current_frame += 1
-                        elif self.owner.center_y <= GROUND_LEVEL:
-                            if self.current_frame < end_frame:
-                                self.current_frame += 1
-                            else:
-                                self.set_action("idle")
-                    else:
-                        self.current_frame += 1
-                        if self.current_frame > end_frame:
-                            if self.is_summoning and self.current_action == "summon":
-                                self.is_summoning = False
-                                self.set_action("idle")
-                            elif "attack" in self.current_action:
-                                self.is_attacking = False
-                                self.set_action("idle")
-                            else:
-                                self.current_frame = start_frame
-                    texture = self.get_current_texture(self.current_frame)
-                    if texture:
-                        self.texture = texture
-
-    def draw(self):
-        super().draw()
-        if hasattr(self, 'stand_attack') and self.stand_attack.is_active:
-            self.stand_attack.draw()
-
-    def update(self):
-        if self.attack_timer > 0:
-            self.attack_timer -= 1
-            if self.attack_timer <= 0:
-                self.is_attacking = False
-                self.is_rushing = False
-        dir_mult = 1 if self.owner.facing_right else -1
-        self.center_x = self.owner.center_x - (self.stand_data["offset_x"] * dir_mult)
-        self.center_y = self.owner.center_y + self.stand_data["offset_y"]
-        self.current_direction = self.owner.current_direction
-        if hasattr(self, 'stand_attack'):
-            self.stand_attack.update_animation()
-        if self.is_attacking and not self.is_rushing and self.owner.opponent:
-            self.check_attack_hit(self.owner.opponent)
-        if self.owner.is_blocking and self.owner.is_crouching:
-            if self.current_action != "block" and "block" in self.frame_ranges:
-                self.set_action("block")
-        elif not self.is_summoning and not self.is_attacking:
-            owner_action = self.owner.current_action
-            if owner_action in ["idle", "move_left", "move_right", "jump", "crouch", "dash_forward", "dash_backward"]:
-                if owner_action == "move_left":
-                    stand_action = "move_backward"
-                elif owner_action == "move_right":
-                    stand_action = "move_forward"
-                elif owner_action == "jump":
-                    stand_action = "jump"
-                elif owner_action in ["dash_forward", "dash_backward"]:
-                    stand_action = owner_action
-                else:
-                    stand_action = "idle"
-                self.set_action(stand_action)
-        self.update_animation()
+    def _set_frame_anchor(self, direction, frame_number):
+        scale = self.stand_data["sprite_scale"]
+        mirrored = TextureCache().mirror_at_draw_time and direction == 1
+        self.scale_x = -scale if mirrored else scale
+        anchor = self.frame_anchors[direction].get(frame_number)
+        if anchor:
+            self.draw_offset_x = anchor[0] * scale
+            self.draw_offset_y = anchor[1] * scale
+
+    def remember_position(self):
+        self.previous_position = (self.state.center_x, self.state.center_y)
+        self.stand_attack.remember_position()
+
+    def sync(self, alpha=1.0):
+        frame = (self.state.current_frame, self.state.current_direction)
+        if frame != self.shown_frame:
+            texture = self.get_current_texture(self.state.current_frame)
+            if texture:
+                self.texture = texture
+            self.shown_frame = frame
+        x, y = interpolate_position(self.previous_position, self.state.center_x, self.state.center_y, alpha)
+        self.center_x = x + self.draw_offset_x
+        self.center_y = y + self.draw_offset_y
+        self.stand_attack.sync(alpha)
 
 class Character(arcade.Sprite):
-    def __init__(self, character_name, start_pos_x, start_pos_y, player_number=1, opponent=None):
-        if not character_exists(character_name):
-            raise ValueError(f"Персонаж {character_name} не найден!")
-        self.character_data = get_character_data(character_name)
-        self.character_name = character_name
+    """Спрайт бойца: рисует состояние FighterState из simulation и проигрывает его звуки"""
+
+    def __init__(self, fighter, scene=None):
+        self.fighter = fighter
+        self.scene = scene
+        self.character_data = fighter.character_data
+        self.character_name = fighter.character_name
         self.file_prefix = self.character_data["file_prefix"]
-        self.player_number = player_number
-        self.opponent = opponent
-        self.combo_cooldown = 0
-        self.stats = None
-        self.hitbox_size = self.character_data.get("hitbox_size", (60, 120))
-        self.sprite_scale = self.character_data.get("sprite_scale", 0.5)
-        self.animations = self.character_data["animations"]
-        self.frame_ranges = {}
-        self.animation_speeds = {}
-        for anim_name, (frames, speed) in self.animations.items():
-            self.frame_ranges[anim_name] = frames
-            self.animation_speeds[anim_name] = speed
+        self.player_number = fighter.player_number
+        self.sprite_scale = fighter.sprite_scale
+        self.draw_offset_x = 0
+        self.draw_offset_y = 0
         self._load_textures_only()
         self.sound_folder = get_sound_folder(self.character_name)
+        # Загружаются только звуки из таблицы персонажа, из общего банка: в зеркальном матче
+        # и реванше файлы не декодируются заново
         self.sounds = {}
-        sound_names = [
-            "Attack 1.wav", "Attack 2.wav", "Attack 3.wav", "Attack 4.wav",
-            "Hurt 1.wav", "Hurt 2.wav", "Hurt 3.wav",
-            "Stand On.wav", "Win.wav", "Death Scream.wav"
-        ]
-
-        for s_name in sound_names:
+        self.sound_paths = []
+        self.streamed_sounds = {}
+        for s_name in get_used_sounds(self.character_name):
             path = Path("Звук") / self.sound_folder / s_name
-            if path.exists():
-                try:
-                    self.sounds[s_name] = arcade.load_sound(str(path))
-                except Exception as e:
-                    self.sounds[s_name] = None
-            else:
-                self.sounds[s_name] = None
+            if s_name in STREAMED_SOUND_NAMES:
+                self.streamed_sounds[s_name] = path
+                continue
+            self.sounds[s_name] = SoundBank().acquire(path)
+            if self.sounds[s_name]:
+                self.sound_paths.append(path)
         first_texture = None
         if 0 in self.all_textures[0] and self.all_textures[0][0]:
             first_texture = self.all_textures[0][0]
         super().__init__(first_texture, scale=self.sprite_scale)
-        self._custom_hitbox = self.hitbox_size
-        self.max_health = self.character_data.get("health", 100)
-        self.current_health = self.max_health
-        self.movement_speed = self.character_data.get("movement_speed", 3)
-        self.jump_speed = self.character_data.get("jump_speed", 15)
-        self.base_animation_speed = self.character_data.get("animation_speed", 5)
-        self.crouch_freeze_frame = self.character_data.get("crouch_freeze_frame", None)
-        self.jump_loop = self.character_data.get("jump_loop", None)
-        self.attacks_data = self.character_data.get("attacks", {})
-        self.attack1_cooldown_max = 15
-        self.attack2_cooldown_max = 30
-        self.attack3_cooldown_max = 45
-        self.attack1_cooldown = 0
-        self.attack2_cooldown = 0
-        self.attack3_cooldown = 0
-        self.stand_rush_cooldown = 0
-        self.stand_rush_data = self.character_data.get("stand_rush_data", {})
-        self.last_rush_hit_frame = -1
-        self.is_attacking = False
-        self.current_attack = None
-        self.attack_hit = False
-        self.has_hit_in_this_attack = False
-        self.hit_cooldown = 0
-        self.is_hit = False
-        self.knockback_velocity = 0
-        self.knockback_timer = 0
-        self.is_hit_animating = False
-        self.hit_timer = 0
-        self.dash_speed = self.character_data.get("dash_speed", 8)
-        self.dash_distance = self.character_data.get("dash_distance", 100)
-        self.dash_cooldown_max = self.character_data.get("dash_cooldown", 45)
-        self.dash_cooldown = 0
-        self.is_dashing = False
-        self.dash_direction = 0
-        self.dash_target_x = None
-        self.dash_start_x = None
-        self.stand = None
-        self.stand_active = False
-        self.is_summoning = False
-        self.double_jump_used = False
-        self.stand_sprite_list = arcade.SpriteList()
-        self.is_blocking = False
-        self.block_timer = 0
-        self.stand_meter = 0
-        self.stand_meter_max = STAND_METER_MAX
-        self.center_x = start_pos_x
-        self.center_y = start_pos_y
-        self.facing_right = True if player_number == 1 else False
-        self.current_direction = 0
-        self.current_frame = 0
-        self.frame_counter = 0
-        self.current_action = "idle"
-        self.current_animation_speed = self.get_action_animation_speed("idle")
-        self.is_jumping = False
-        self.is_crouching = False
-        self.crouch_freeze_frame_active = None
-        self.crouch_resume_frame = None
-        self.intro_frames = self.character_data.get("intro_frames", (0, 37))
-        self.victory_frames = self.character_data.get("victory_frames", (0, 37))
-        self.defeat_frames = self.character_data.get("defeat_frames", (0, 37))
-        self.change_x = 0
-        self.change_y = 0
         if first_texture:
-            self.texture = first_texture
+            self._set_frame_anchor(0, 0)
+        self.stand = None
+        self.shown_frame = None
+        self.previous_position = None
+        if scene is not None:
+            add_to_scene(scene, self, SCENE_LAYER_FIGHTER, self.player_number)
+        self.sync()
 
     def play_sound(self, sound_name):
-        if self.sounds.get(sound_name):
-            arcade.play_sound(self.sounds[sound_name])
-
-    @property
-    def hit_box(self):
-        if hasattr(self, '_custom_hitbox') and self._custom_hitbox:
-            width, height = self._custom_hitbox
-            return [
-                (-width / 2, -height / 2),
-                (width / 2, -height / 2),
-                (width / 2, height / 2),
-                (-width / 2, height / 2)
-            ]
-        return super().hit_box
-
-    @hit_box.setter
-    def hit_box(self, value):
-        pass
+        if sound_name in self.streamed_sounds:
+            sound = SoundBank().open_stream(self.streamed_sounds[sound_name])
+        else:
+            sound = self.sounds.get(sound_name)
+        SfxMixer().play(sound, get_sound_category(sound_name))
+
+    def release_sounds(self):
+        for path in self.sound_paths:
+            SoundBank().release(path)
+        self.sound_paths = []
+        self.sounds = {}
 
     def _load_textures_only(self):
-        character_path = Path("Спрайты") / self.character_name
-        max_frame = 0
-        for start, end in self.frame_ranges.values():
-            max_frame = max(max_frame, end)
-        self.all_textures = [{}, {}]
-        for i in range(max_frame + 1):
-            filename = f"{self.file_prefix}_0-{i}.png"
-            file_path = character_path / filename
-            if file_path.exists():
-                try:
-                    texture_normal = arcade.load_texture(str(file_path))
-                    self.all_textures[0][i] = texture_normal
-                    self.all_textures[1][i] = texture_normal.flip_left_right()
-                except Exception as e:
-                    self.all_textures[0][i] = None
-                    self.all_textures[1][i] = None
-            else:
-                self.all_textures[0][i] = None
-                self.all_textures[1][i] = None
-
-    def get_action_animation_speed(self, action):
-        if action in self.animation_speeds:
-            return self.animation_speeds[action]
-        return self.base_animation_speed
-
-    def set_opponent(self, opponent):
-        self.opponent = opponent
-
-    def update_facing_direction(self):
-        if self.opponent and not self.is_attacking and not self.is_dashing and not self.is_blocking:
-            if self.opponent.center_x > self.center_x:
-                self.facing_right = True
-                self.current_direction = 0
-            else:
-                self.facing_right = False
-                self.current_direction = 1
+        frames = get_texture_frames(self.character_name)[(self.character_name, self.file_prefix)]
+        self.all_textures = TextureCache().load_frames(self.character_name, self.file_prefix, frames)
+        self.frame_anchors = TextureCache().load_anchors(self.character_name, self.file_prefix, frames)
+        self.shown_frame = None
+
+    def _set_frame_anchor(self, direction, frame_number):
+        mirrored = TextureCache().mirror_at_draw_time and direction == 1
+        self.scale_x = -self.sprite_scale if mirrored else self.sprite_scale
+        anchor = self.frame_anchors[direction].get(frame_number)
+        if anchor:
+            self.draw_offset_x = anchor[0] * self.sprite_scale
+            self.draw_offset_y = anchor[1] * self.sprite_scale
+
+    def reload_textures(self):
+        self._load_textures_only()
+        if self.stand:
+            self.stand.load_all_textures()
+            self.stand.stand_attack.load_attack_textures()
+        self.sync()
 
     def get_current_texture(self, frame_number):
-        if frame_number in self.all_textures[self.current_direction] and self.all_textures[self.current_direction][frame_number]:
-            texture = self.all_textures[self.current_direction][frame_number]
-            try:
-                self.texture = texture
-            except AttributeError:
-                self._texture = texture
-            return texture
-        other_direction = 1 - self.current_direction
+        direction = self.fighter.current_direction
+        if frame_number in self.all_textures[direction] and self.all_textures[direction][frame_number]:
+            self._set_frame_anchor(direction, frame_number)
+            return self.all_textures[direction][frame_number]
+        other_direction = 1 - direction
         if frame_number in self.all_textures[other_direction] and self.all_textures[other_direction][frame_number]:
-            texture = self.all_textures[other_direction][frame_number]
-            try:
-                self.texture = texture
-            except AttributeError:
-                self._texture = texture
-            return texture
+            self._set_frame_anchor(other_direction, frame_number)
+            return self.all_textures[other_direction][frame_number]
         return None
 
-    def get_action_for_movement(self, moving_left, moving_right):
-        if self.facing_right:
-            if moving_left:
-                return "move_left"
-            elif moving_right:
-                return "move_right"
-        else:
-            if moving_left:
-                return "move_right"
-            elif moving_right:
-                return "move_left"
-        return None
-
-    def jump(self):
-        if self.is_summoning or self.is_attacking or self.is_blocking:
-            return False
-        if not self.is_jumping and not self.is_crouching and not self.is_dashing and self.center_y <= GROUND_LEVEL:
-            self.change_y = self.jump_speed
-            self.is_jumping = True
-            self.double_jump_used = False
-            self.set_action("jump")
-            if hasattr(self, 'stats') and self.stats is not None:
-                self.stats.add_jump()
-            return True
-        elif self.stand_active and self.is_jumping and not self.double_jump_used and not self.is_dashing:
-            self.change_y = self.jump_speed
-            self.double_jump_used = True
-            if "jump" in self.frame_ranges:
-                self.current_frame = self.frame_ranges["jump"][0]
-            if hasattr(self, 'stats') and self.stats is not None:
-                self.stats.add_jump()
-            return True
-        return False
-
-    def crouch(self, start_crouch=True):
-        if "crouch" not in self.frame_ranges or self.is_dashing or self.is_summoning or self.is_attacking:
-            return
-        start_frame, end_frame = self.frame_ranges["crouch"]
-        if start_crouch:
-            if not self.is_jumping and not self.is_crouching and not self.is_dashing:
-                self.is_crouching = True
-                self.is_blocking = True
-                self.block_timer = BLOCK_DURATION
-                self.set_action("crouch")
-                if self.crouch_freeze_frame and start_frame <= self.crouch_freeze_frame <= end_frame:
-                    self.crouch_freeze_frame_active = self.crouch_freeze_frame
-                else:
-                    self.crouch_freeze_frame_active = (start_frame + end_frame) // 2
-        else:
-            if self.is_crouching:
-                self.crouch_resume_frame = self.current_frame
-                self.is_crouching = False
-                self.crouch_freeze_frame_active = None
-                self.is_blocking = False
-
-    def dash(self, move_direction=None):
-        if self.is_dashing or self.is_jumping or self.is_crouching or self.dash_cooldown > 0 or self.is_summoning or self.is_attacking or self.is_blocking:
-            return False
-        if move_direction is not None:
-            self.dash_direction = move_direction
-        else:
-            if self.facing_right:
-                self.dash_direction = 1
-            else:
-                self.dash_direction = -1
-        if self.facing_right:
-            dash_action = "dash_forward" if self.dash_direction > 0 else "dash_backward"
-        else:
-            dash_action = "dash_forward" if self.dash_direction < 0 else "dash_backward"
-        if dash_action not in self.frame_ranges:
-            return False
-        self.dash_start_x = self.center_x
-        self.dash_target_x = self.center_x + (self.dash_distance * self.dash_direction)
-        if self.dash_target_x < 0:
-            self.dash_target_x = 0
-        elif self.dash_target_x > SCREEN_WIDTH:
-            self.dash_target_x = SCREEN_WIDTH
-        self.is_dashing = True
-        self.set_action(dash_action)
-        self.dash_cooldown = self.dash_cooldown_max
-        if hasattr(self, 'stats') and self.stats is not None:
-            self.stats.add_dash()
-        return True
-
-    def toggle_stand(self):
-        if self.is_jumping or self.is_dashing or self.is_blocking:
-            return
-        if self.is_attacking and "stand_attack" not in self.current_action:
-            return
-        if self.stand_active:
-            self.stand_active = False
+    def remember_position(self):
+        """Запоминает позиции перед шагом симуляции, чтобы рисовать между двумя шагами"""
+        self.previous_position = (self.fighter.center_x, self.fighter.center_y)
+        if self.stand:
+            self.stand.remember_position()
+
+    def sync(self, alpha=1.0):
+        """Переносит состояние бойца и его стенда на спрайты; alpha - доля пути до следующего шага"""
+        fighter = self.fighter
+        stand_state = fighter.stand if fighter.stand_active else None
+        if (self.stand.state if self.stand else None) is not stand_state:
+            if self.stand and self.scene is not None:
+                self.scene.remove(self.stand)
+                self.scene.remove(self.stand.stand_attack)
             self.stand = None
-            self.stand_sprite_list.clear()
-            return True
-        else:
-            if self.stand_meter >= STAND_METER_SUMMON_COST:
-                self.play_sound("Stand On.wav")
-                self.stand_meter -= STAND_METER_SUMMON_COST
-                self.stand_active = True
-                self.is_summoning = True
-                self.set_action("stand_summon")
-                self.stand = Stand(self)
-                self.stand_sprite_list.append(self.stand)
-                if hasattr(self, 'stats') and self.stats is not None:
-                    self.stats.add_stand_summon()
-                return True
-            else:
-                return False
-
-    def stand_rush(self):
-        if not self.stand_active:
-            return False
-        if self.is_summoning or self.is_dashing or self.is_jumping or self.is_blocking or self.is_attacking:
-            return False
-        if not self.stand_rush_data:
-            return False
-        if self.stand_rush_cooldown > 0:
-            return False
-        self.is_attacking = True
-        self.current_attack = "stand_rush"
-        self.attack_hit = False
-        self.has_hit_in_this_attack = False
-        self.change_x = 0
-        self.last_rush_hit_frame = -1
-        self.rush_hit_counter = 0
-        self.rush_max_hits = 12
-        self.set_action("idle")
+            if stand_state:
+                self.stand = Stand(stand_state)
+                if self.scene is not None:
+                    add_to_scene(self.scene, self.stand, SCENE_LAYER_STAND, self.player_number)
+                    add_to_scene(self.scene, self.stand.stand_attack, SCENE_LAYER_STAND_ATTACK, self.player_number)
         if self.stand:
-            self.stand.start_rush()
-        self.stand_rush_cooldown = self.stand_rush_data["cooldown"]
-        return True
-
-    def check_stand_rush_hit(self):
-        if not self.opponent or not self.stand:
-            return
-        if not self.stand_rush_data:
-            return
-        if not self.stand.stand_attack.is_active:
-            return
-        if not hasattr(self, 'rush_hit_counter'):
-            self.rush_hit_counter = 0
-            self.rush_max_hits = 12
-        if self.rush_hit_counter >= self.rush_max_hits:
-            return
-        current_attack_frame = self.stand.stand_attack.current_frame
-        if hasattr(self, 'last_rush_hit_frame') and self.last_rush_hit_frame == current_attack_frame:
-            return
-        frame_index = current_attack_frame - self.stand.stand_attack.attack_frames[0]
-        if frame_index % 2 != 0:
-            return
-        hitbox_data = self.stand_rush_data["attack_hitbox"]
-        hitbox_width = hitbox_data["width"]
-        hitbox_height = hitbox_data["height"]
-        attack_sprite = self.stand.stand_attack
-        hitbox_left = attack_sprite.center_x - hitbox_width // 2
-        hitbox_right = attack_sprite.center_x + hitbox_width // 2
-        hitbox_bottom = attack_sprite.center_y - hitbox_height // 2
-        hitbox_top = attack_sprite.center_y + hitbox_height // 2
-        if hasattr(self.opponent, '_custom_hitbox') and self.opponent._custom_hitbox:
-            opp_width, opp_height = self.opponent._custom_hitbox
-            opponent_left = self.opponent.center_x - opp_width // 2
-            opponent_right = self.opponent.center_x + opp_width // 2
-            opponent_bottom = self.opponent.center_y - opp_height // 2
-            opponent_top = self.opponent.center_y + opp_height // 2
-        else:
-            opponent_left = self.opponent.center_x - self.opponent.width // 2
-            opponent_right = self.opponent.center_x + self.opponent.width // 2
-            opponent_bottom = self.opponent.center_y - self.opponent.height // 2
-            opponent_top = self.opponent.center_y + self.opponent.height // 2
-        if (hitbox_right > opponent_left and hitbox_left < opponent_right and
-                hitbox_top > opponent_bottom and hitbox_bottom < opponent_top):
-            damage = self.stand_rush_data["damage_per_hit"]
-            knockback = self.stand_rush_data["knockback_per_hit"]
-            self.opponent.take_damage(damage, knockback)
-            self.last_rush_hit_frame = current_attack_frame
-            self.rush_hit_counter += 1
-            self.attack_hit = True
-            if hasattr(self, 'stats') and self.stats is not None:
-                self.stats.add_hit()
-
-    def attack1(self):
-        if self.attack1_cooldown > 0 or self.is_summoning or self.is_dashing or self.is_jumping or self.is_blocking:
-            return False
-        if self.stand_active:
-            if self.stand and not self.stand.is_attacking:
-                self.stand.start_attack(1)
-                self.start_attack("stand_attack1")
-                return True
-        else:
-            if "attack1" not in self.frame_ranges:
-                return False
-            self.start_attack("attack1")
-            return True
-        return False
-
-    def attack2(self):
-        if self.attack2_cooldown > 0 or self.is_summoning or self.is_dashing or self.is_jumping or self.is_blocking:
-            return False
-        if self.stand_active:
-            if self.stand and not self.stand.is_attacking:
-                self.stand.start_attack(2)
-                self.start_attack("stand_attack2")
-                return True
-        else:
-            if "attack2" not in self.frame_ranges:
-                return False
-            self.start_attack("attack2")
-            return True
-        return False
-
-    def attack3(self):
-        if self.attack3_cooldown > 0 or self.is_summoning or self.is_dashing or self.is_jumping or self.is_blocking:
-            return False
-        if self.stand_active:
-            if self.stand and not self.stand.is_attacking:
-                self.stand.start_attack(3)
-                self.start_attack("stand_attack3")
-                return True
-        else:
-            if "attack3" not in self.frame_ranges:
-                return False
-            self.start_attack("attack3")
-            return True
-        return False
-
-    def start_attack(self, attack_name):
-        self.current_attack = attack_name
-        self.is_attacking = True
-        self.attack_hit = False
-        self.has_hit_in_this_attack = False
-        self.change_x = 0
-        if attack_name in ["attack1", "attack2", "attack3"]:
-            self.play_sound("Attack 1.wav")
-        elif attack_name == "stand_attack1":
-            self.play_sound("Attack 2.wav")
-        elif attack_name == "stand_attack2":
-            self.play_sound("Attack 3.wav")
-        elif attack_name == "stand_attack3":
-            self.play_sound("Attack 4.wav")
-        if attack_name == "attack1" or attack_name == "stand_attack1":
-            self.attack1_cooldown = self.attack1_cooldown_max
-        elif attack_name == "attack2" or attack_name == "stand_attack2":
-            self.attack2_cooldown = self.attack2_cooldown_max
-        elif attack_name == "attack3" or attack_name == "stand_attack3":
-            self.attack3_cooldown = self.attack3_cooldown_max
-        self.set_action(attack_name)
-        if "stand_" not in attack_name:
-            self.stand_meter = min(self.stand_meter_max, self.stand_meter + STAND_METER_GAIN_ON_ATTACK)
-        return True
-
-    def check_attack_hit(self):
-        if not self.is_attacking or self.has_hit_in_this_attack or not self.opponent:
-            return False
-        if "stand_" in self.current_action:
-            return False
-        attack_data = get_attack_data(self.character_name, self.current_action)
-        if not attack_data:
-            return False
-        active_frames = attack_data.get("active_frames", (0, 0))
-        if self.current_frame < active_frames[0] or self.current_frame > active_frames[1]:
-            return False
-        if self.opponent.hit_cooldown > 0:
-            return False
-        hitbox_width, hitbox_height = attack_data.get("hitbox", (50, 50))
-        offset_x = attack_data.get("offset_x", 50)
-        offset_y = attack_data.get("offset_y", 0)
-        if self.facing_right:
-            hitbox_left = self.center_x + offset_x - hitbox_width // 2
-        else:
-            hitbox_left = self.center_x - offset_x - hitbox_width // 2
-        hitbox_right = hitbox_left + hitbox_width
-        hitbox_center_y = self.center_y + offset_y
-        hitbox_bottom = hitbox_center_y - hitbox_height // 2
-        hitbox_top = hitbox_center_y + hitbox_height // 2
-        if hasattr(self.opponent, '_custom_hitbox') and self.opponent._custom_hitbox:
-            opp_width, opp_height = self.opponent._custom_hitbox
-            opponent_left = self.opponent.center_x - opp_width // 2
-            opponent_right = self.opponent.center_x + opp_width // 2
-            opponent_bottom = self.opponent.center_y - opp_height // 2
-            opponent_top = self.opponent.center_y + opp_height // 2
-        else:
-            opponent_left = self.opponent.center_x - self.opponent.width // 2
-            opponent_right = self.opponent.center_x + self.opponent.width // 2
-            opponent_bottom = self.opponent.center_y - self.opponent.height // 2
-            opponent_top = self.opponent.center_y + self.opponent.height // 2
-        if (hitbox_right > opponent_left and hitbox_left < opponent_right and
-                hitbox_top > opponent_bottom and hitbox_bottom < opponent_top):
-            self.attack_hit = True
-            self.has_hit_in_this_attack = True
-            damage = attack_data.get("damage", 10)
-            knockback = attack_data.get("knockback", 5)
-            knockback_dir = 1 if self.facing_right else -1
-            self.opponent.take_damage(damage, knockback * knockback_dir)
-            self.stand_meter = min(self.stand_meter_max, self.stand_meter + STAND_METER_GAIN_ON_ATTACK)
-            if hasattr(self, 'stats') and self.stats is not None:
-                self.stats.add_hit()
-            return True
-        return False
-
-    def start_hit_animation(self):
-        if "hit" in self.animations:
-            self.is_hit_animating = True
-            self.hit_timer = 15
-            self.set_action("hit")
-            hurt_sound = random.choice(["Hurt 1.wav", "Hurt 2.wav", "Hurt 3.wav"])
-            self.play_sound(hurt_sound)
-
-    def take_damage(self, damage, knockback_force):
-        if self.hit_cooldown > 0:
-            return
-        if self.stand_active:
-            drain_amount = self.character_data.get("stand_damage_drain", STAND_DAMAGE_DRAIN)
-            self.stand_meter = max(0, self.stand_meter - drain_amount)
-            if self.stand_meter <= 0:
-                self.stand_meter = 0
-                self.stand_active = False
-                self.stand = None
-                self.stand_sprite_list.clear()
-        else:
-            drain_amount = self.character_data.get("stand_damage_drain_no_stand", STAND_DAMAGE_DRAIN_NO_STAND)
-            self.stand_meter = max(0, self.stand_meter - drain_amount)
-        if not self.is_blocking:
-            self.stand_meter = min(self.stand_meter_max, self.stand_meter + STAND_METER_GAIN_ON_HIT)
-        self.start_hit_animation()
-        if self.is_blocking:
-            if self.stand_active:
-                if self.stand_meter >= STAND_METER_BLOCK_DRAIN:
-                    self.stand_meter -= STAND_METER_BLOCK_DRAIN
-                    self.stand_meter = min(self.stand_meter_max, self.stand_meter + STAND_METER_GAIN_ON_BLOCK)
-                    if hasattr(self, 'stats') and self.stats is not None:
-                        self.stats.add_block()
-                    if self.stand_meter <= 0:
-                        self.stand_meter = 0
-                        self.stand_active = False
-                        self.stand = None
-                        self.stand_sprite_list.clear()
-                    # ИСПРАВЛЕНО: отталкивание в сторону атакующего
-                    self.center_x += knockback_force * 0.3
-                    self.hit_cooldown = 10
-                    return
-                else:
-                    self.is_blocking = False
-            else:
-                if self.stand_meter >= STAND_METER_BLOCK_DRAIN_NO_STAND:
-                    self.stand_meter -= STAND_METER_BLOCK_DRAIN_NO_STAND
-                    if hasattr(self, 'stats') and self.stats is not None:
-                        self.stats.add_block()
-                    reduced_damage = int(damage * 0.5)
-                    reduced_knockback = int(knockback_force * 0.5)
-                    self.current_health -= reduced_damage
-                    if self.current_health < 0:
-                        self.current_health = 0
-                    self.stand_meter = min(self.stand_meter_max, self.stand_meter + STAND_METER_GAIN_ON_BLOCK)
-                    self.hit_cooldown = 10
-                    self.is_hit = True
-                    # ИСПРАВЛЕНО: отталкивание в сторону атакующего
-                    self.knockback_velocity = reduced_knockback
-                    self.knockback_timer = KNOCKBACK_DURATION // 2
-                    self.is_attacking = False
-                    self.is_dashing = False
-                    return
-                else:
-                    self.is_blocking = False
-        self.current_health -= damage
-        if self.current_health < 0:
-            self.current_health = 0
-        self.hit_cooldown = 5
-        self.is_hit = True
-        # ИСПРАВЛЕНО: отталкивание в сторону атакующего (убран множитель направления)
-        self.knockback_velocity = knockback_force
-        self.knockback_timer = KNOCKBACK_DURATION
-        self.is_attacking = False
-        self.is_dashing = False
-        self.change_x = 0
-        if self.current_health <= 0:
-            self.play_sound("Death Scream.wav")
-
-    def draw_stand(self):
-        if self.stand_active and self.stand:
-            self.stand_sprite_list.draw()
-
-    def draw_health_bar(self):
+            self.stand.sync(alpha)
+        frame = (fighter.current_frame, fighter.current_direction)
+        if frame != self.shown_frame:
+            texture = self.get_current_texture(fighter.current_frame)
+            if texture:
+                self.texture = texture
+            self.shown_frame = frame
+        # Обрезанный кадр сдвигается на своё место в исходном кадре, как у стенда
+        x, y = interpolate_position(self.previous_position, fighter.center_x, fighter.center_y, alpha)
+        self.center_x = x + self.draw_offset_x
+        self.center_y = y + self.draw_offset_y
+
+    def draw_health_bar(self, hud):
+        fighter = self.fighter
         if self.player_number == 1:
             x = SCREEN_WIDTH // 4
         else:
@@ -1183,22 +1070,24 @@ class Character(arcade.Sprite):
         y = SCREEN_HEIGHT - 50
         width = 300
         height = 30
+        prefix = f"p{self.player_number}"
         left = x - width // 2
         bottom = y - height // 2
-        arcade.draw_lbwh_rectangle_filled(left, bottom, width, height, arcade.color.DARK_RED)
-        if self.current_health > 0:
-            health_width = (self.current_health / self.max_health) * (width - 4)
+        hud.rect(f"{prefix}_health_back", left, bottom, width, height, arcade.color.DARK_RED)
+        if fighter.current_health > 0:
+            health_width = (fighter.current_health / fighter.max_health) * (width - 4)
             left = x - width // 2 + 2
             bottom = y - height // 2 + 2
-            arcade.draw_lbwh_rectangle_filled(left, bottom, health_width, height - 4, arcade.color.GREEN)
-        arcade.draw_text(f"{int(self.current_health)}/{self.max_health}",
-                         x, y - height - 5,
-                         arcade.color.WHITE, 14, anchor_x="center")
-        arcade.draw_text(f"{self.character_data['display_name']}",
-                         x, y + height // 2 + 5,
-                         arcade.color.WHITE, 16, anchor_x="center", bold=True)
-
-    def draw_stand_meter(self):
+            hud.rect(f"{prefix}_health_bar", left, bottom, health_width, height - 4, arcade.color.GREEN)
+        hud.text(f"{prefix}_health", f"{int(fighter.current_health)}/{fighter.max_health}",
+                 x, y - height - 5,
+                 arcade.color.WHITE, 14, anchor_x="center")
+        hud.text(f"{prefix}_display_name", self.character_data['display_name'],
+                 x, y + height // 2 + 5,
+                 arcade.color.WHITE, 16, anchor_x="center", bold=True)
+
+    def draw_stand_meter(self, hud):
+        fighter = self.fighter
         if self.player_number == 1:
             x = SCREEN_WIDTH // 4
         else:
@@ -1206,270 +1095,43 @@ class Character(arcade.Sprite):
         y = SCREEN_HEIGHT - 100
         width = 300
         height = 15
+        prefix = f"p{self.player_number}"
         left = x - width // 2
         bottom = y - height // 2
-        arcade.draw_lbwh_rectangle_filled(left, bottom, width, height, arcade.color.DARK_GRAY)
-        if self.stand_meter > 0:
-            meter_width = (self.stand_meter / self.stand_meter_max) * (width - 4)
+        hud.rect(f"{prefix}_meter_back", left, bottom, width, height, arcade.color.DARK_GRAY)
+        if fighter.stand_meter > 0:
+            meter_width = (fighter.stand_meter / fighter.stand_meter_max) * (width - 4)
             left = x - width // 2 + 2
             bottom = y - height // 2 + 2
-            if self.stand_active:
+            if fighter.stand_active:
                 color = arcade.color.GOLD
             else:
                 color = arcade.color.LIGHT_BLUE
-            arcade.draw_lbwh_rectangle_filled(left, bottom, meter_width, height - 4, color)
-            if not self.stand_active:
+            hud.rect(f"{prefix}_meter_bar", left, bottom, meter_width, height - 4, color)
+            if not fighter.stand_active:
                 summon_cost_x = x - width // 2 + (STAND_METER_SUMMON_COST / STAND_METER_MAX) * width
-                arcade.draw_line(summon_cost_x, y - height, summon_cost_x, y + height,
-                                 arcade.color.WHITE, 2)
-        stand_text = "STAND" if self.stand_active else "STAND METER"
-        arcade.draw_text(stand_text, x, y - height - 10,
-                         arcade.color.WHITE, 12, anchor_x="center")
-        percent = int(self.stand_meter)
-        arcade.draw_text(f"{percent}%", x, y,
-                         arcade.color.WHITE, 10, anchor_x="center", anchor_y="center")
-        if self.stand_rush_cooldown > 0:
-            cd_text = f"RUSH: {self.stand_rush_cooldown//60}.{self.stand_rush_cooldown%60:02d}"
-            arcade.draw_text(cd_text, x, y - 30,
-                            arcade.color.RED, 12, anchor_x="center")
-
-    def can_move(self):
-        if self.is_attacking:
-            return False
-        if self.is_hit:
-            return False
-        if self.is_summoning:
-            return False
-        if self.is_dashing:
-            return False
-        if self.is_blocking:
-            return False
-        return True
-
-    def set_action(self, new_action):
-        if new_action == self.current_action:
-            return
-        if new_action == "victory":
-            self.play_sound("Win.wav")
-        elif new_action == "defeat":
-            self.play_sound("Death Scream.wav")
-        if new_action in ["intro", "victory", "defeat"]:
-            pass
-        elif self.is_summoning and new_action not in ["stand_summon", "idle"]:
-            if new_action != "stand_summon":
-                return
-        elif self.is_jumping and new_action not in ["jump", "idle"]:
-            return
-        elif self.is_dashing and new_action not in ["dash_forward", "dash_backward", "idle"]:
-            return
-        if new_action in self.frame_ranges:
-            self.current_action = new_action
-            self.current_frame = self.frame_ranges[new_action][0]
-            self.frame_counter = 0
-            self.current_animation_speed = self.get_action_animation_speed(new_action)
-            texture = self.get_current_texture(self.current_frame)
-            if texture:
-                self.texture = texture
-            if "attack" in new_action:
-                self.change_x = 0
-
-    def update_animation(self):
-        self.frame_counter += 1
-        if self.current_action not in self.frame_ranges:
-            return
-        start_frame, end_frame = self.frame_ranges[self.current_action]
-        if self.frame_counter >= self.current_animation_speed:
-            self.frame_counter = 0
-            if self.current_action == "jump":
-                if self.jump_loop:
-                    loop_start, loop_end = self.jump_loop
-                    if self.current_frame < loop_start:
-                        self.current_frame += 1
-                    elif self.center_y > GROUND_LEVEL + 5:
-                        if self.current_frame >= loop_end:
-                            self.current_frame = loop_start
-                        else:
-                            self.current_frame += 1
-                    elif self.center_y <= GROUND_LEVEL:
-                        if self.current_frame < end_frame:
-                            self.current_frame += 1
-                        else:
-                            self.current_frame = end_frame
-                            self.is_jumping = False
-                            self.set_action("idle")
-                else:
-                    self.current_frame += 1
-                    if self.current_frame > end_frame:
-                        self.current_frame = end_frame
-                        self.is_jumping = False
-                        self.set_action("idle")
-            elif self.current_action in ["intro", "victory", "defeat"]:
-                self.current_frame += 1
-                if self.current_frame > end_frame:
-                    self.current_frame = end_frame
-            elif self.current_action == "stand_summon":
-                self.current_frame += 1
-                if self.current_frame > end_frame:
-                    self.current_frame = end_frame
-                    self.is_summoning = False
-                    self.set_action("idle")
-            elif self.current_action == "crouch":
-                if self.is_crouching:
-                    self.block_timer = BLOCK_DURATION
-                    if self.crouch_freeze_frame_active is not None:
-                        if self.current_frame < self.crouch_freeze_frame_active:
-                            self.current_frame += 1
-                        else:
-                            self.current_frame = self.crouch_freeze_frame_active
-                    else:
-                        self.current_frame += 1
-                        if self.current_frame > end_frame:
-                            self.current_frame = end_frame
-                else:
-                    if self.crouch_resume_frame is not None:
-                        self.current_frame = self.crouch_resume_frame
-                        self.crouch_resume_frame = None
-                    self.current_frame += 1
-                    if self.current_frame > end_frame:
-                        self.current_frame = end_frame
-                        self.set_action("idle")
-            elif self.current_action in ["dash_forward", "dash_backward"]:
-                self.current_frame += 1
-                if self.current_frame > end_frame:
-                    if self.is_dashing:
-                        self.is_dashing = False
-                        self.dash_target_x = None
-                        self.dash_start_x = None
-                        self.dash_direction = 0
-                    self.set_action("idle")
-            elif "attack" in self.current_action:
-                self.current_frame += 1
-                if self.current_frame > end_frame:
-                    self.current_frame = end_frame
-                    self.is_attacking = False
-                    self.set_action("idle")
-            elif self.current_action == "hit":
-                self.current_frame += 1
-                if self.current_frame > end_frame:
-                    self.current_frame = end_frame
-                    if self.is_hit_animating:
-                        self.is_hit_animating = False
-                    if not self.is_attacking and not self.is_dashing and not self.is_jumping:
-                        self.set_action("idle")
-            else:
-                self.current_frame += 1
-                if self.current_frame > end_frame:
-                    self.current_frame = start_frame
-            texture = self.get_current_texture(self.current_frame)
-            if texture:
-                self.texture = texture
-
-    def update(self):
-        if self.attack1_cooldown > 0:
-            self.attack1_cooldown -= 1
-        if self.attack2_cooldown > 0:
-            self.attack2_cooldown -= 1
-        if self.attack3_cooldown > 0:
-            self.attack3_cooldown -= 1
-        if self.stand_rush_cooldown > 0:
-            self.stand_rush_cooldown -= 1
-        if self.dash_cooldown > 0:
-            self.dash_cooldown -= 1
-        if self.hit_cooldown > 0:
-            self.hit_cooldown -= 1
-        else:
-            self.is_hit = False
-        if self.hit_timer > 0:
-            self.hit_timer -= 1
-            if self.hit_timer <= 0:
-                self.is_hit_animating = False
-        if self.is_blocking:
-            self.block_timer -= 1
-            if self.block_timer <= 0:
-                self.is_blocking = False
-        if not self.stand_active:
-            self.stand_meter = min(self.stand_meter_max, self.stand_meter + STAND_METER_PASSIVE_GAIN)
-        if self.knockback_timer > 0:
-            self.knockback_timer -= 1
-            self.center_x += self.knockback_velocity
-            self.knockback_velocity *= 0.8
-        if self.is_attacking and not self.stand_active and "attack" in self.current_action and "stand" not in self.current_action:
-            self.check_attack_hit()
-        if self.is_attacking and self.current_attack == "stand_rush" and self.stand_active and self.stand:
-            self.check_stand_rush_hit()
-        if self.stand_active and self.stand:
-            if not self.stand.is_attacking and self.is_attacking:
-                if "stand_attack" in self.current_attack or self.current_attack == "stand_rush":
-                    self.is_attacking = False
-                    self.current_attack = None
-                    if not self.is_jumping and not self.is_dashing:
-                        self.set_action("idle")
-        if not self.is_attacking and not self.is_blocking and not self.is_hit_animating:
-            self.update_facing_direction()
-        if self.can_move() and not self.is_hit_animating:
-            self.center_x += self.change_x
-        else:
-            self.change_x = 0
-        if self.is_dashing and self.dash_target_x is not None:
-            distance = self.dash_target_x - self.center_x
-            if abs(distance) > self.dash_speed:
-                self.center_x += self.dash_speed if distance > 0 else -self.dash_speed
-            else:
-                self.center_x = self.dash_target_x
-                if not self.is_dashing:
-                    self.dash_target_x = None
-                    self.dash_start_x = None
-                    self.dash_direction = 0
-        else:
-            if not self.is_crouching and not self.is_dashing and not self.is_hit:
-                self.change_y -= GRAVITY
-        self.center_y += self.change_y
-        if self.center_y <= GROUND_LEVEL:
-            self.center_y = GROUND_LEVEL
-            self.change_y = 0
-            self.double_jump_used = False
-            if self.current_action == "jump" and not self.jump_loop:
-                self.is_jumping = False
-                self.set_action("idle")
-            elif self.current_action != "jump":
-                self.is_jumping = False
-        if self.left < 0:
-            self.left = 0
-            if self.is_dashing:
-                self.is_dashing = False
-                self.dash_target_x = None
-                self.set_action("idle")
-        if self.right > SCREEN_WIDTH:
-            self.right = SCREEN_WIDTH
-            if self.is_dashing:
-                self.is_dashing = False
-                self.dash_target_x = None
-                self.set_action("idle")
-        if self.top > SCREEN_HEIGHT:
-            self.top = SCREEN_HEIGHT
-            self.change_y = 0
-        self.update_animation()
+                hud.rect(f"{prefix}_summon_cost", summon_cost_x - 1, y - height, 2, 2 * height,
+                         arcade.color.WHITE)
+        stand_text = "STAND" if fighter.stand_active else "STAND METER"
+        hud.text(f"{prefix}_stand", stand_text, x, y - height - 10,
+                 arcade.color.WHITE, 12, anchor_x="center")
+        percent = int(fighter.stand_meter)
+        hud.text(f"{prefix}_meter", f"{percent}%", x, y,
+                 arcade.color.WHITE, 10, anchor_x="center", anchor_y="center")
+        if fighter.stand_rush_cooldown > 0:
+            cd_text = f"RUSH: {fighter.stand_rush_cooldown//60}.{fighter.stand_rush_cooldown%60:02d}"
+            hud.text(f"{prefix}_rush", cd_text, x, y - 30,
+                     arcade.color.RED, 12, anchor_x="center")
 
 class ModeMenuView(arcade.View):
     def __init__(self):
         super().__init__()
-        self.bg_sprite_list = arcade.SpriteList()
+        self.background = MenuBackground()
         self.ui_sprite_list = arcade.SpriteList()
         self.side_rams_list = arcade.SpriteList()
         self.select_sound = None
         self.confirm_sound = None
         self.music_manager = None
-        bg_path = Path("Лого") / "fon_menu.png"
-        orig_w, orig_h = 128, 64
-        self.bg_scale = SCREEN_WIDTH / (5 * orig_w)
-        self.tile_w, self.tile_h = orig_w * self.bg_scale, orig_h * self.bg_scale
-        if bg_path.exists():
-            for r in range(8):
-                for c in range(5):
-                    s = arcade.Sprite(str(bg_path), scale=self.bg_scale)
-                    s.center_x = c * self.tile_w + (self.tile_w / 2)
-                    s.center_y = r * self.tile_h + (self.tile_h / 2)
-                    self.bg_sprite_list.append(s)
         self.ramka = None
         ramka_path = Path("Лого") / "ramka.png"
         if ramka_path.exists():
@@ -1505,6 +1167,10 @@ class ModeMenuView(arcade.View):
         self.right_ram.bottom = bottom_gap
         self.side_rams_list.append(self.left_ram)
         self.side_rams_list.append(self.right_ram)
+        self.modes = ["БОЙ", "ТАБЛИЦА ЛИДЕРОВ"]
+        self.reset()
+
+    def reset(self):
         self.anim_state = "intro"
         self.selected_index = 0
         self.current_frame = 0
@@ -1512,17 +1178,17 @@ class ModeMenuView(arcade.View):
         self.timer = 0.0
         self.ram_timer = 0.0
         self.last_selected_index = 0
-        self.modes = ["БОЙ", "ТАБЛИЦА ЛИДЕРОВ"]
+        if self.darby_textures:
+            self.darby_sprite.texture = self.darby_textures[0]
 
-    def on_show(self):
+    def on_show_view(self):
+        self.reset()
         if self.music_manager:
             self.music_manager.play_menu_music()
 
     def on_update(self, delta_time):
-        for s in self.bg_sprite_list:
-            s.center_y -= 3.0
-            if s.top < 0:
-                s.center_y += 8 * self.tile_h
+        AssetPreloader().pump()
+        self.background.update(delta_time)
         if self.anim_state in ["intro", "outro"]:
             self.timer += delta_time
             if self.timer >= 0.1:
@@ -1534,17 +1200,9 @@ class ModeMenuView(arcade.View):
                 elif self.anim_state == "outro" and self.current_frame >= 13:
                     self.current_frame = 13
                     if self.selected_index == 0:
-                        next_view = PlayerNameInputView(is_p1=True)  # С параметром
-                        next_view.select_sound = self.select_sound
-                        next_view.confirm_sound = self.confirm_sound
-                        next_view.music_manager = self.music_manager
-                        self.window.show_view(next_view)
+                        ViewNavigator().show(PlayerNameInputView, is_p1=True, p1_name="")
                     else:
-                        next_view = LeaderboardView()
-                        next_view.select_sound = self.select_sound
-                        next_view.confirm_sound = self.confirm_sound
-                        next_view.music_manager = self.music_manager
-                        self.window.show_view(next_view)
+                        ViewNavigator().show(LeaderboardView)
                 if self.current_frame < len(self.darby_textures):
                     self.darby_sprite.texture = self.darby_textures[self.current_frame]
         self.ram_timer += delta_time
@@ -1561,7 +1219,7 @@ class ModeMenuView(arcade.View):
 
     def on_draw(self):
         self.clear()
-        self.bg_sprite_list.draw()
+        self.background.draw()
         arcade.draw_rect_filled(arcade.LRBT(0, SCREEN_WIDTH, 0, SCREEN_HEIGHT), (0, 0, 0, 160))
         self.ui_sprite_list.draw()
         self.side_rams_list.draw()
@@ -1606,29 +1264,18 @@ class PlayerNameInputView(arcade.View):
         self.select_sound = None
         self.confirm_sound = None
         self.music_manager = None
-        self.bg_sprite_list = arcade.SpriteList()
-        bg_path = Path("Лого") / "fon_menu.png"
-        orig_w, orig_h = 128, 64
-        self.bg_scale = SCREEN_WIDTH / (5 * orig_w)
-        self.tile_w, self.tile_h = orig_w * self.bg_scale, orig_h * self.bg_scale
-        self.rows = 8
-        if bg_path.exists():
-            for r in range(self.rows):
-                for c in range(5):
-                    s = arcade.Sprite(str(bg_path), scale=self.bg_scale)
-                    s.center_x = c * self.tile_w + (self.tile_w / 2)
-                    s.center_y = r * self.tile_h + (self.tile_h / 2)
-                    self.bg_sprite_list.append(s)
-
-    def on_show(self):
+        self.background = MenuBackground()
+
+    def on_show_view(self):
+        self.player_name = ""
+        self.cursor_timer = 0
+        self.show_cursor = True
         if self.music_manager:
             self.music_manager.play_menu_music()
 
     def on_update(self, delta_time):
-        for s in self.bg_sprite_list:
-            s.center_y -= 3.0
-            if s.top < 0:
-                s.center_y += self.rows * self.tile_h
+        AssetPreloader().pump()
+        self.background.update(delta_time)
         self.cursor_timer += delta_time
         if self.cursor_timer >= 0.5:
             self.cursor_timer = 0
@@ -1636,7 +1283,7 @@ class PlayerNameInputView(arcade.View):
 
     def on_draw(self):
         self.clear()
-        self.bg_sprite_list.draw()
+        self.background.draw()
         arcade.draw_rect_filled(arcade.LRBT(0, SCREEN_WIDTH, 0, SCREEN_HEIGHT), (0, 0, 0, 200))
 
         if self.is_p1:
@@ -1672,25 +1319,17 @@ class PlayerNameInputView(arcade.View):
         if key == arcade.key.ESCAPE:
             if self.select_sound:
                 arcade.play_sound(self.select_sound)
-            self.window.show_view(ModeMenuView())
+            ViewNavigator().show(ModeMenuView)
         elif key == arcade.key.ENTER:
             if self.player_name.strip():
                 if self.confirm_sound:
                     arcade.play_sound(self.confirm_sound)
                 if self.is_p1:
-                    next_view = PlayerNameInputView(is_p1=False, p1_name=self.player_name)
-                    next_view.select_sound = self.select_sound
-                    next_view.confirm_sound = self.confirm_sound
-                    next_view.music_manager = self.music_manager
-                    self.window.show_view(next_view)
+                    # Тот же вид показывается снова уже для второго игрока
+                    ViewNavigator().show(PlayerNameInputView, is_p1=False, p1_name=self.player_name)
                 else:
-                    if self.music_manager:
-                        self.music_manager.stop_music()
-                    next_view = CharacterSelectView(self.p1_name, self.player_name)
-                    next_view.select_sound = self.select_sound
-                    next_view.confirm_sound = self.confirm_sound
-                    next_view.music_manager = self.music_manager
-                    self.window.show_view(next_view)
+                    # Музыка меню не прерывается: выбор персонажа играет тот же трек
+                    ViewNavigator().show(CharacterSelectView, p1_name=self.p1_name, p2_name=self.player_name)
         elif key == arcade.key.BACKSPACE:
             if self.player_name:
                 self.player_name = self.player_name[:-1]
@@ -1712,32 +1351,22 @@ class PlayerNameInputView(arcade.View):
                     arcade.play_sound(self.select_sound)
 
 class CharacterSelectView(arcade.View):
-    def __init__(self, p1_name, p2_name):  # Только имена
+    def __init__(self, p1_name="", p2_name=""):  # Только имена
         super().__init__()
         self.p1_name = p1_name
         self.p2_name = p2_name
         self.select_sound = None
         self.confirm_sound = None
         self.music_manager = None
-        self.bg_sprite_list = arcade.SpriteList()
-        bg_path = Path("Лого") / "fon_menu.png"
-        orig_w, orig_h = 128, 64
-        self.bg_scale = SCREEN_WIDTH / (5 * orig_w)
-        self.tile_w, self.tile_h = orig_w * self.bg_scale, orig_h * self.bg_scale
-        self.rows = 8
-        if bg_path.exists():
-            for r in range(self.rows):
-                for c in range(5):
-                    s = arcade.Sprite(str(bg_path), scale=self.bg_scale)
-                    s.center_x = c * self.tile_w + (self.tile_w / 2)
-                    s.center_y = r * self.tile_h + (self.tile_h / 2)
-                    self.bg_sprite_list.append(s)
+        self.background = MenuBackground()
         self.characters = get_available_characters()
         self.p1_selected = 0
         self.p2_selected = 0
         self.selection_step = 1
         self.logos = {}
         self.load_logos()
+        self.preloader = AssetPreloader()
+        self.preloader.request(self.characters[self.p1_selected])
         self.title_text = arcade.Text(
             "ВЫБОР ПЕРСОНАЖЕЙ",
             SCREEN_WIDTH // 2, SCREEN_HEIGHT - 100,
@@ -1759,19 +1388,23 @@ class CharacterSelectView(arcade.View):
                 except:
                     pass
 
-    def on_show(self):
+    def on_show_view(self):
+        self.p1_selected = 0
+        self.p2_selected = 0
+        self.selection_step = 1
+        self.preloader.request(self.characters[self.p1_selected])
+        self.p1_text.text = f"ИГРОК 1: {self.p1_name}"
+        self.p2_text.text = f"ИГРОК 2: {self.p2_name}"
         if self.music_manager:
             self.music_manager.play_menu_music()
 
     def on_update(self, delta_time):
-        for s in self.bg_sprite_list:
-            s.center_y -= 3.0
-            if s.top < 0:
-                s.center_y += self.rows * self.tile_h
+        self.preloader.pump()
+        self.background.update(delta_time)
 
     def on_draw(self):
         self.clear()
-        self.bg_sprite_list.draw()
+        self.background.draw()
         arcade.draw_rect_filled(arcade.LRBT(0, SCREEN_WIDTH, 0, SCREEN_HEIGHT), (0, 0, 0, 180))
         self.title_text.draw()
         self.p1_text.draw()
@@ -1806,6 +1439,9 @@ class CharacterSelectView(arcade.View):
         arcade.draw_text(character if character == "DIO" else "Jotaro Kujo", x, y - 40, color, 20, anchor_x="center")
         if i == selected_idx:
             arcade.draw_lrbt_rectangle_outline(x - 120, x + 120, y - 70, y + 110, color, 3)
+            progress = self.preloader.progress(character)
+            if progress < 1.0:
+                arcade.draw_text(f"ЗАГРУЗКА {int(progress * 100)}%", x, y - 62, arcade.color.GRAY, 12, anchor_x="center")
 
     def on_key_press(self, key, modifiers):
         old_p1 = self.p1_selected
@@ -1820,31 +1456,23 @@ class CharacterSelectView(arcade.View):
                 self.p1_selected = (self.p1_selected + 1) % len(self.characters)
             else:
                 self.p2_selected = (self.p2_selected + 1) % len(self.characters)
-        elif key == arcade.key.ENTER:
+        if key in [arcade.key.UP, arcade.key.DOWN]:
+            hovered = self.p1_selected if self.selection_step == 1 else self.p2_selected
+            self.preloader.request(self.characters[hovered])
+        if key == arcade.key.ENTER:
             if self.selection_step == 1:
                 p1_char = self.characters[self.p1_selected]
-                folder = get_sound_folder(p1_char)
-                snd_path = Path("Звук") / folder / "Character Select.wav"
-                if snd_path.exists():
-                    snd = arcade.load_sound(str(snd_path))
-                    arcade.play_sound(snd)
+                SoundBank().play(Path("Звук") / get_sound_folder(p1_char) / "Character Select.wav")
                 self.selection_step = 2
+                self.preloader.request(self.characters[self.p2_selected])
             else:
                 p2_char = self.characters[self.p2_selected]
-                folder = get_sound_folder(p2_char)
-                snd_path = Path("Звук") / folder / "Character Select.wav"
-                if snd_path.exists():
-                    snd = arcade.load_sound(str(snd_path))
-                    arcade.play_sound(snd)
+                SoundBank().play(Path("Звук") / get_sound_folder(p2_char) / "Character Select.wav")
                 if self.music_manager:
                     self.music_manager.stop_music()
                 p1_char = self.characters[self.p1_selected]
 
-                game_view = GameView(self.p1_name, self.p2_name, p1_char, p2_char)
-                game_view.select_sound = self.select_sound
-                game_view.confirm_sound = self.confirm_sound
-                game_view.music_manager = self.music_manager
-                self.window.show_view(game_view)
+                ViewNavigator().show_new(GameView(self.p1_name, self.p2_name, p1_char, p2_char))
 
         elif key == arcade.key.ESCAPE:
             if self.selection_step == 2:
@@ -1854,7 +1482,7 @@ class CharacterSelectView(arcade.View):
             else:
                 if self.select_sound:
                     arcade.play_sound(self.select_sound)
-                self.window.show_view(ModeMenuView())
+                ViewNavigator().show(ModeMenuView)
         if (self.selection_step == 1 and old_p1 != self.p1_selected) or \
                 (self.selection_step == 2 and old_p2 != self.p2_selected):
             if self.select_sound:
@@ -1867,7 +1495,6 @@ class GameView(arcade.View):
         self.p2_name = p2_name
         self.p1_character_name = p1_character
         self.p2_character_name = p2_character
-        self.db = Database()
         self.p1_stats = PlayerStats(p1_name)
         self.p2_stats = PlayerStats(p2_name)
         map_index = random.randint(0, 3)
@@ -1875,61 +1502,25 @@ class GameView(arcade.View):
         self.background = None
         if map_path.exists():
             self.background = arcade.load_texture(str(map_path))
-        self.intro_mode = True
-        self.intro_timer = 0
-        self.victory_mode = False
-        self.victory_timer = 0
-        self.winner = None
-        self.loser = None
-        self.show_stats = False
-        self.p1_left = False
-        self.p1_right = False
-        self.p1_up = False
-        self.p1_down = False
-        self.p1_w_was_pressed = False
-        self.p1_s_was_pressed = False
-        self.p1_shift_was_pressed = False
-        self.p1_attack1_pressed = False
-        self.p1_attack2_pressed = False
-        self.p1_attack3_pressed = False
-        self.p1_stand_pressed = False
-        self.p1_rush_pressed = False
-        self.p2_left = False
-        self.p2_right = False
-        self.p2_up = False
-        self.p2_down = False
-        self.p2_up_was_pressed = False
-        self.p2_down_was_pressed = False
-        self.p2_shift_was_pressed = False
-        self.p2_attack1_pressed = False
-        self.p2_attack2_pressed = False
-        self.p2_attack3_pressed = False
-        self.p2_stand_pressed = False
-        self.p2_rush_pressed = False
+        self.pressed_keys = set()
+        self.stick_input = 0
+        self.dpad_input = 0
+        self.button_input = 0
         self.controller = None
         self.init_controller()
-        self.stand_key_processed = False
-        self.attack1_key_processed = False
-        self.attack2_key_processed = False
-        self.attack3_key_processed = False
-        self.rush_key_processed = False
+        self.match = None
+        self.time_accumulator = 0.0
         self.player1 = None
         self.player2 = None
-        self.player1_list = None
-        self.player2_list = None
-        self.physics1 = None
-        self.physics2 = None
-        self.round_start_sound_1 = None
-        self.round_start_sound_2 = None
-        try:
-            p1 = Path("Звук") / "Battle" / "Round Start Voiceline.wav"
-            if p1.exists():
-                self.round_start_sound_1 = arcade.load_sound(str(p1))
-            p2 = Path("Звук") / "Battle" / "Round Start Voiceline 2.wav"
-            if p2.exists():
-                self.round_start_sound_2 = arcade.load_sound(str(p2))
-        except Exception as e:
-            pass
+        # Бойцы, стенды и эффекты раша - один список, отсортированный по слоям
+        self.scene = arcade.SpriteList()
+        # Надписи под затемнением заставки и над ним
+        self.hud = Hud()
+        self.overlay_hud = Hud()
+        # Линия земли не меняется - её геометрия собирается один раз
+        self.ground_shapes = arcade.shape_list.ShapeElementList()
+        self.ground_shapes.append(arcade.shape_list.create_line(0, GROUND_LEVEL, SCREEN_WIDTH, GROUND_LEVEL,
+                                                                arcade.color.GREEN, 3))
         self.setup()
 
     def init_controller(self):
@@ -1940,552 +1531,259 @@ class GameView(arcade.View):
             self.controller.push_handlers(self)
 
     def on_stick_motion(self, controller, stick_name, vector):
-        if not self.player2 or self.intro_mode or self.victory_mode:
-            return
         if stick_name == "leftstick":
+            self.stick_input = 0
             if abs(vector.x) > STICK_DEAD_ZONE:
-                if vector.x < 0:
-                    self.p2_left = True
-                    self.p2_right = False
-                else:
-                    self.p2_right = True
-                    self.p2_left = False
-            else:
-                self.p2_left = False
-                self.p2_right = False
+                self.stick_input |= INPUT_LEFT if vector.x < 0 else INPUT_RIGHT
             if abs(vector.y) > STICK_DEAD_ZONE:
-                if vector.y > 0:
-                    if not self.p2_up_was_pressed and not self.player2.is_jumping:
-                        self.player2.jump()
-                        self.p2_up_was_pressed = True
-                    self.p2_up = True
-                elif vector.y < 0:
-                    if not self.p2_down_was_pressed and not self.player2.is_crouching:
-                        self.player2.crouch(True)
-                        self.p2_down_was_pressed = True
-                    self.p2_down = True
-            else:
-                self.p2_up = False
-                self.p2_down = False
-                if self.p2_up_was_pressed:
-                    self.p2_up_was_pressed = False
-                if self.p2_down_was_pressed:
-                    self.player2.crouch(False)
-                    self.p2_down_was_pressed = False
+                self.stick_input |= INPUT_UP if vector.y > 0 else INPUT_DOWN
 
     def on_dpad_motion(self, controller, vector):
-        if not self.player2 or self.intro_mode or self.victory_mode:
-            return
+        self.dpad_input = 0
         if vector.x < 0:
-            self.p2_left = True
-            self.p2_right = False
+            self.dpad_input |= INPUT_LEFT
         elif vector.x > 0:
-            self.p2_right = True
-            self.p2_left = False
-        else:
-            if not (abs(self.controller.leftx) > 0.1 if self.controller else False):
-                self.p2_left = False
-                self.p2_right = False
+            self.dpad_input |= INPUT_RIGHT
         if vector.y > 0:
-            if not self.p2_up_was_pressed and not self.player2.is_jumping:
-                self.player2.jump()
-                self.p2_up_was_pressed = True
+            self.dpad_input |= INPUT_UP
         elif vector.y < 0:
-            if not self.p2_down_was_pressed and not self.player2.is_crouching:
-                self.player2.crouch(True)
-                self.p2_down_was_pressed = True
-        else:
-            if self.p2_up_was_pressed:
-                self.p2_up_was_pressed = False
-            if self.p2_down_was_pressed:
-                self.player2.crouch(False)
-                self.p2_down_was_pressed = False
+            self.dpad_input |= INPUT_DOWN
 
     def on_button_press(self, controller, button_name):
-        if not self.player2 or self.intro_mode or self.victory_mode:
-            return
-        if button_name == 'a' and not self.stand_key_processed:
-            self.player2.toggle_stand()
-            self.stand_key_processed = True
-        elif button_name == 'x' and not self.attack1_key_processed:
-            self.player2.attack1()
-            self.attack1_key_processed = True
-        elif button_name == 'y' and not self.attack2_key_processed:
-            self.player2.attack2()
-            self.attack2_key_processed = True
-        elif button_name == 'b' and not self.attack3_key_processed:
-            self.player2.attack3()
-            self.attack3_key_processed = True
-        elif button_name == 'rightshoulder' and not self.rush_key_processed:
-            self.player2.stand_rush()
-            self.rush_key_processed = True
-        elif button_name in ['leftshoulder', 'rightshoulder'] and not self.p2_shift_was_pressed:
-            self.p2_shift_was_pressed = True
+        self.button_input |= PAD_BUTTON_MAP.get(button_name, 0)
 
     def on_button_release(self, controller, button_name):
-        if not self.player2:
-            return
-        if button_name == 'a':
-            self.stand_key_processed = False
-        elif button_name == 'x':
-            self.attack1_key_processed = False
-        elif button_name == 'y':
-            self.attack2_key_processed = False
-        elif button_name == 'b':
-            self.attack3_key_processed = False
-        elif button_name == 'rightshoulder':
-            self.rush_key_processed = False
-        elif button_name in ['leftshoulder', 'rightshoulder']:
-            self.p2_shift_was_pressed = False
+        self.button_input &= ~PAD_BUTTON_MAP.get(button_name, 0)
 
     def on_trigger_motion(self, controller, trigger_name, value):
-        if not self.player2 or self.intro_mode or self.victory_mode:
-            return
         if value > 0.5:
-            if not self.p2_shift_was_pressed:
-                self.p2_shift_was_pressed = True
+            self.button_input |= INPUT_DASH
         else:
-            self.p2_shift_was_pressed = False
+            self.button_input &= ~INPUT_DASH
+
+    def get_player_input(self, key_map):
+        bits = 0
+        for key in self.pressed_keys:
+            bits |= key_map.get(key, 0)
+        return bits
 
     def setup(self):
-        self.player1 = Character(self.p1_character_name, SCREEN_WIDTH // 4, GROUND_LEVEL, player_number=1)
-        self.player2 = Character(self.p2_character_name, 3 * SCREEN_WIDTH // 4, GROUND_LEVEL, player_number=2)
-        self.player1.stats = self.p1_stats
-        self.player2.stats = self.p2_stats
-        self.player1.set_opponent(self.player2)
-        self.player2.set_opponent(self.player1)
-        self.player1_list = arcade.SpriteList()
-        self.player1_list.append(self.player1)
-        self.physics1 = arcade.PhysicsEngineSimple(self.player1, None)
-        self.player2_list = arcade.SpriteList()
-        self.player2_list.append(self.player2)
-        self.physics2 = arcade.PhysicsEngineSimple(self.player2, None)
-        if self.intro_mode:
-            if "intro" in self.player1.frame_ranges:
-                self.player1.set_action("intro")
-            else:
-                self.player1.set_action("idle")
-            if "intro" in self.player2.frame_ranges:
-                self.player2.set_action("intro")
-            else:
-                self.player2.set_action("idle")
-            self.player1.facing_right = True
-            self.player2.facing_right = False
+        # Догружаем то, что не успел фоновый загрузчик, сразу в несколько потоков
+        AssetPreloader().finish([self.p1_character_name, self.p2_character_name])
+        self.match = Match(self.p1_character_name, self.p2_character_name, self.p1_stats, self.p2_stats)
+        self.time_accumulator = 0.0
+        self.scene.clear()
+        self.player1 = Character(self.match.fighter1, self.scene)
+        self.player2 = Character(self.match.fighter2, self.scene)
 
     def on_draw(self):
         self.clear()
+        match = self.match
         if self.background:
             arcade.draw_texture_rect(self.background, arcade.XYWH(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2, SCREEN_WIDTH, SCREEN_HEIGHT))
         else:
             arcade.set_background_color(arcade.color.BLACK)
-        arcade.draw_line(0, GROUND_LEVEL, SCREEN_WIDTH, GROUND_LEVEL, arcade.color.GREEN, 3)
-        arcade.draw_text(self.p1_name, SCREEN_WIDTH // 4, SCREEN_HEIGHT - 20,
-                         arcade.color.CYAN, 18, anchor_x="center", bold=True)
-        arcade.draw_text(self.p2_name, 3 * SCREEN_WIDTH // 4, SCREEN_HEIGHT - 20,
-                         arcade.color.ORANGE, 18, anchor_x="center", bold=True)
-        if self.player1:
-            self.player1.draw_stand()
-        if self.player2:
-            self.player2.draw_stand()
-        if self.player1:
-            self.player1_list.draw()
-        if self.player2:
-            self.player2_list.draw()
+        self.ground_shapes.draw()
+        hud = self.hud
+        overlay_hud = self.overlay_hud
+        hud.begin()
+        overlay_hud.begin()
+        hud.text("p1_name", self.p1_name, SCREEN_WIDTH // 4, SCREEN_HEIGHT - 20,
+                 arcade.color.CYAN, 18, anchor_x="center", bold=True)
+        hud.text("p2_name", self.p2_name, 3 * SCREEN_WIDTH // 4, SCREEN_HEIGHT - 20,
+                 arcade.color.ORANGE, 18, anchor_x="center", bold=True)
+        self.scene.draw()
         if self.player1:
-            self.player1.draw_health_bar()
-            self.player1.draw_stand_meter()
+            self.player1.draw_health_bar(hud)
+            self.player1.draw_stand_meter(hud)
         if self.player2:
-            self.player2.draw_health_bar()
-            self.player2.draw_stand_meter()
-        if self.intro_mode:
-            arcade.draw_rect_filled(arcade.LRBT(0, SCREEN_WIDTH, 0, SCREEN_HEIGHT), (0, 0, 0, 150))
+            self.player2.draw_health_bar(hud)
+            self.player2.draw_stand_meter(hud)
+        if match.intro_mode:
+            hud.draw()
+            overlay_hud.rect("dim", 0, 0, SCREEN_WIDTH, SCREEN_HEIGHT, (0, 0, 0, 150))
             if self.player1:
-                arcade.draw_text(f"{self.player1.character_data['display_name']}", self.player1.center_x, self.player1.center_y + 120, arcade.color.CYAN, 24, anchor_x="center", bold=True)
+                overlay_hud.text("p1_intro", self.player1.character_data['display_name'], self.player1.fighter.center_x, self.player1.fighter.center_y + 120, arcade.color.CYAN, 24, anchor_x="center", bold=True)
             if self.player2:
-                arcade.draw_text(f"{self.player2.character_data['display_name']}", self.player2.center_x, self.player2.center_y + 120, arcade.color.ORANGE, 24, anchor_x="center", bold=True)
-            if self.intro_timer < 180:
-                arcade.draw_text("VS", SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 50, arcade.color.RED, 48, anchor_x="center", bold=True)
+                overlay_hud.text("p2_intro", self.player2.character_data['display_name'], self.player2.fighter.center_x, self.player2.fighter.center_y + 120, arcade.color.ORANGE, 24, anchor_x="center", bold=True)
+            if match.intro_timer < 180:
+                overlay_hud.text("vs", "VS", SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 50, arcade.color.RED, 48, anchor_x="center", bold=True)
             else:
-                alpha = min(255, (self.intro_timer - 180) * 8)
-                arcade.draw_text("FIGHT!", SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2, (255, 0, 0, alpha), 64, anchor_x="center", bold=True)
-        elif self.victory_mode and self.winner and self.loser:
-            arcade.draw_rect_filled(arcade.LRBT(0, SCREEN_WIDTH, 0, SCREEN_HEIGHT), (0, 0, 0, 150))
-            if self.victory_timer < 30:
-                alpha = min(255, self.victory_timer * 8)
-                arcade.draw_text("K.O.!", SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2, (255, 0, 0, alpha), 64, anchor_x="center", bold=True)
-            elif self.victory_timer > 60:
-                winner_name = self.winner.character_data['display_name']
-                player_name = self.player_name if self.winner == self.player1 else "Opponent"
-                arcade.draw_text(f"{player_name} WINS!", SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 50, arcade.color.GOLD, 48, anchor_x="center", bold=True)
-                if self.show_stats:
+                alpha = min(255, (match.intro_timer - 180) * 8)
+                overlay_hud.text("fight", "FIGHT!", SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2, (255, 0, 0, alpha), 64, anchor_x="center", bold=True)
+        elif match.victory_mode and match.winner and match.loser:
+            hud.draw()
+            overlay_hud.rect("dim", 0, 0, SCREEN_WIDTH, SCREEN_HEIGHT, (0, 0, 0, 150))
+            if match.victory_timer < 30:
+                alpha = min(255, match.victory_timer * 8)
+                overlay_hud.text("ko", "K.O.!", SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2, (255, 0, 0, alpha), 64, anchor_x="center", bold=True)
+            elif match.victory_timer > 60:
+                player_name = self.p1_name if match.winner is match.fighter1 else self.p2_name
+                overlay_hud.text("winner", f"{player_name} WINS!", SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 50, arcade.color.GOLD, 48, anchor_x="center", bold=True)
+                if match.show_stats:
                     self.draw_match_stats()
         else:
-            arcade.draw_text("WASD + Shift | J - Атака 1 | I - Атака 2 | L - Атака 3 | K - Стенд | U - Раш", SCREEN_WIDTH // 4, 80, arcade.color.CYAN, 14, anchor_x="center")
+            hud.text("p1_controls", "WASD + Shift | J - Атака 1 | I - Атака 2 | L - Атака 3 | K - Стенд | U - Раш", SCREEN_WIDTH // 4, 80, arcade.color.CYAN, 14, anchor_x="center")
             if self.controller:
-                arcade.draw_text("ГЕЙМПАД: Стик + LB/RB | A - Стенд | X - Атака 1 | Y - Атака 2 | B - Атака 3 | RB - Раш", 3 * SCREEN_WIDTH // 4, 80, arcade.color.ORANGE, 14, anchor_x="center")
+                hud.text("p2_controls", "ГЕЙМПАД: Стик + LB/RB | A - Стенд | X - Атака 1 | Y - Атака 2 | B - Атака 3 | RB - Раш", 3 * SCREEN_WIDTH // 4, 80, arcade.color.ORANGE, 14, anchor_x="center")
             else:
-                arcade.draw_text("Стрелки + Shift | Пробел - Атака | NUM 1 - Стенд | NUM 2 - Раш", 3 * SCREEN_WIDTH // 4, 80, arcade.color.ORANGE, 14, anchor_x="center")
-        arcade.draw_text("ESC - меню", SCREEN_WIDTH - 120, 30, arcade.color.GRAY, 14)
+                hud.text("p2_controls", "Стрелки + Shift | Пробел - Атака | NUM 1 - Стенд | NUM 2 - Раш", 3 * SCREEN_WIDTH // 4, 80, arcade.color.ORANGE, 14, anchor_x="center")
+            hud.draw()
+        overlay_hud.text("menu_hint", "ESC - меню", SCREEN_WIDTH - 120, 30, arcade.color.GRAY, 14)
+        overlay_hud.draw()
 
     def draw_match_stats(self):
+        hud = self.overlay_hud
         y_start = SCREEN_HEIGHT // 2 - 50
-        arcade.draw_text("СТАТИСТИКА МАТЧА", SCREEN_WIDTH // 2, y_start + 100, arcade.color.GOLD, 24, anchor_x="center",
-                         bold=True)
-        arcade.draw_text(self.p1_name, SCREEN_WIDTH // 4, y_start + 50, arcade.color.CYAN, 18, anchor_x="center",
-                         bold=True)
-        arcade.draw_text(f"Попаданий: {self.p1_stats.hits_landed}", SCREEN_WIDTH // 4, y_start + 20, arcade.color.WHITE,
-                         16, anchor_x="center")
-        arcade.draw_text(f"Блоков: {self.p1_stats.blocks_successful}", SCREEN_WIDTH // 4, y_start - 10,
-                         arcade.color.WHITE, 16, anchor_x="center")
-        arcade.draw_text(f"Рывков: {self.p1_stats.dashes_used}", SCREEN_WIDTH // 4, y_start - 40, arcade.color.WHITE,
-                         16, anchor_x="center")
-        arcade.draw_text(f"Очки: {self.p1_stats.points_earned}", SCREEN_WIDTH // 4, y_start - 70, arcade.color.GOLD, 18,
-                         anchor_x="center", bold=True)
-        arcade.draw_text(self.p2_name, 3 * SCREEN_WIDTH // 4, y_start + 50, arcade.color.ORANGE, 18, anchor_x="center",
-                         bold=True)
-        arcade.draw_text(f"Попаданий: {self.p2_stats.hits_landed}", 3 * SCREEN_WIDTH // 4, y_start + 20,
-                         arcade.color.WHITE, 16, anchor_x="center")
-        arcade.draw_text(f"Блоков: {self.p2_stats.blocks_successful}", 3 * SCREEN_WIDTH // 4, y_start - 10,
-                         arcade.color.WHITE, 16, anchor_x="center")
-        arcade.draw_text(f"Рывков: {self.p2_stats.dashes_used}", 3 * SCREEN_WIDTH // 4, y_start - 40,
-                         arcade.color.WHITE, 16, anchor_x="center")
-        arcade.draw_text(f"Очки: {self.p2_stats.points_earned}", 3 * SCREEN_WIDTH // 4, y_start - 70, arcade.color.GOLD,
-                         18, anchor_x="center", bold=True)
-        arcade.draw_text("Нажмите ENTER для продолжения", SCREEN_WIDTH // 2, y_start - 150, arcade.color.GRAY, 16,
-                         anchor_x="center")
+        hud.text("stats_title", "СТАТИСТИКА МАТЧА", SCREEN_WIDTH // 2, y_start + 100, arcade.color.GOLD, 24,
+                 anchor_x="center", bold=True)
+        sides = ((1, self.p1_name, self.p1_stats, SCREEN_WIDTH // 4, arcade.color.CYAN),
+                 (2, self.p2_name, self.p2_stats, 3 * SCREEN_WIDTH // 4, arcade.color.ORANGE))
+        for number, name, stats, x, color in sides:
+            prefix = f"p{number}_stats"
+            hud.text(f"{prefix}_name", name, x, y_start + 50, color, 18, anchor_x="center", bold=True)
+            hud.text(f"{prefix}_hits", f"Попаданий: {stats.hits_landed}", x, y_start + 20, arcade.color.WHITE,
+                     16, anchor_x="center")
+            hud.text(f"{prefix}_blocks", f"Блоков: {stats.blocks_successful}", x, y_start - 10,
+                     arcade.color.WHITE, 16, anchor_x="center")
+            hud.text(f"{prefix}_dashes", f"Рывков: {stats.dashes_used}", x, y_start - 40, arcade.color.WHITE,
+                     16, anchor_x="center")
+            hud.text(f"{prefix}_points", f"Очки: {stats.points_earned}", x, y_start - 70, arcade.color.GOLD, 18,
+                     anchor_x="center", bold=True)
+        hud.text("stats_continue", "Нажмите ENTER для продолжения", SCREEN_WIDTH // 2, y_start - 150,
+                 arcade.color.GRAY, 16, anchor_x="center")
 
     def on_update(self, delta_time):
-        if not self.player1 or not self.player2:
-            return
-        if self.intro_mode:
-            self.intro_timer += 1
-            if self.intro_timer == 60 and self.round_start_sound_1:
-                arcade.play_sound(self.round_start_sound_1)
-            elif self.intro_timer == 140 and self.round_start_sound_2:
-                arcade.play_sound(self.round_start_sound_2)
-            self.player1.update()
-            self.player2.update()
-            if self.intro_timer >= INTRO_ANIMATION_DURATION:
-                self.intro_mode = False
-                self.intro_timer = 0
-                self.player1.set_action("idle")
-                self.player2.set_action("idle")
+        if not self.match:
             return
-        if self.victory_mode:
-            self.victory_timer += 1
-            if self.winner:
-                self.winner.update()
-            if self.loser:
-                self.loser.update()
-            if self.victory_timer >= VICTORY_ANIMATION_DURATION and not self.show_stats:
-                self.show_stats = True
-                self.victory_timer = VICTORY_ANIMATION_DURATION
-            return
-        if self.player1.current_health <= 0:
-            self.show_game_over(self.player2, self.player1)
-            return
-        if self.player2.current_health <= 0:
-            self.show_game_over(self.player1, self.player2)
-            return
-        if not self.player1.is_summoning and not self.player1.is_hit:
-            if not self.player1.is_dashing and not self.player1.is_attacking:
-                self.player1.change_x = 0
-                if not self.player1.is_crouching:
-                    if self.p1_left:
-                        self.player1.change_x = -self.player1.movement_speed
-                        if not self.player1.is_jumping:
-                            action = self.player1.get_action_for_movement(True, False)
-                            if action:
-                                self.player1.set_action(action)
-                    if self.p1_right:
-                        self.player1.change_x = self.player1.movement_speed
-                        if not self.player1.is_jumping:
-                            action = self.player1.get_action_for_movement(False, True)
-                            if action:
-                                self.player1.set_action(action)
-                if (not self.p1_left and not self.p1_right and
-                        not self.player1.is_jumping and
-                        not self.player1.is_attacking and
-                        self.player1.current_action not in ["crouch"]):
-                    self.player1.set_action("idle")
-            if self.p1_up and not self.p1_w_was_pressed:
-                if not self.player1.is_crouching and not self.player1.is_dashing and not self.player1.is_attacking:
-                    self.player1.jump()
-                self.p1_w_was_pressed = True
-            if self.p1_down and not self.p1_s_was_pressed:
-                self.player1.crouch(True)
-                self.p1_s_was_pressed = True
-            if not self.p1_down and self.p1_s_was_pressed:
-                self.player1.crouch(False)
-                self.p1_s_was_pressed = False
-            if self.p1_shift_was_pressed and not self.player1.is_dashing and self.player1.dash_cooldown == 0:
-                if self.p1_left:
-                    self.player1.dash(-1)
-                elif self.p1_right:
-                    self.player1.dash(1)
-                else:
-                    self.player1.dash()
-            if self.p1_attack1_pressed:
-                self.player1.attack1()
-            if self.p1_attack2_pressed:
-                self.player1.attack2()
-            if self.p1_attack3_pressed:
-                self.player1.attack3()
-            if self.p1_rush_pressed:
-                self.player1.stand_rush()
-                self.p1_rush_pressed = False
-            if self.p1_stand_pressed and not self.player1.is_summoning and not self.player1.is_attacking:
-                self.player1.toggle_stand()
-                self.p1_stand_pressed = False
-        else:
-            self.player1.change_x = 0
-        if not self.player2.is_summoning and not self.player2.is_hit:
-            if not self.player2.is_dashing and not self.player2.is_attacking:
-                self.player2.change_x = 0
-                if not self.player2.is_crouching:
-                    if self.p2_left:
-                        self.player2.change_x = -self.player2.movement_speed
-                        if not self.player2.is_jumping:
-                            action = self.player2.get_action_for_movement(True, False)
-                            if action:
-                                self.player2.set_action(action)
-                    if self.p2_right:
-                        self.player2.change_x = self.player2.movement_speed
-                        if not self.player2.is_jumping:
-                            action = self.player2.get_action_for_movement(False, True)
-                            if action:
-                                self.player2.set_action(action)
-                if (not self.p2_left and not self.p2_right and
-                        not self.player2.is_jumping and
-                        not self.player2.is_attacking and
-                        self.player2.current_action not in ["crouch"]):
-                    self.player2.set_action("idle")
-            if (self.p2_up or self.p2_up_was_pressed) and not self.p2_up_was_pressed:
-                if not self.player2.is_crouching and not self.player2.is_dashing and not self.player2.is_attacking:
-                    self.player2.jump()
-                self.p2_up_was_pressed = True
-            if (self.p2_down or self.p2_down_was_pressed) and not self.p2_down_was_pressed:
-                self.player2.crouch(True)
-                self.p2_down_was_pressed = True
-            if not self.p2_down and self.p2_down_was_pressed and not (self.controller and abs(self.controller.lefty) > 0.1):
-                self.player2.crouch(False)
-                self.p2_down_was_pressed = False
-            if self.p2_shift_was_pressed and not self.player2.is_dashing and self.player2.dash_cooldown == 0:
-                if self.p2_left:
-                    self.player2.dash(-1)
-                elif self.p2_right:
-                    self.player2.dash(1)
-                else:
-                    self.player2.dash()
-            if self.p2_attack1_pressed:
-                self.player2.attack1()
-            if self.p2_attack2_pressed:
-                self.player2.attack2()
-            if self.p2_attack3_pressed:
-                self.player2.attack3()
-            if self.p2_rush_pressed:
-                self.player2.stand_rush()
-                self.p2_rush_pressed = False
-            if self.p2_stand_pressed and not self.player2.is_summoning and not self.player2.is_attacking:
-                self.player2.toggle_stand()
-                self.p2_stand_pressed = False
-        else:
-            self.player2.change_x = 0
-        if self.physics1 and self.physics2:
-            self.physics1.update()
-            self.physics2.update()
-        if self.player1:
-            self.player1.update()
-            if self.player1.stand_active and self.player1.stand:
-                self.player1.stand.update()
-        if self.player2:
-            self.player2.update()
-            if self.player2.stand_active and self.player2.stand:
-                self.player2.stand.update()
-
-    def show_game_over(self, winner, loser):
-        self.winner = winner
-        self.loser = loser
-        winner.stats.add_kill()
-        winner.stats.add_win_bonus()
-        self.victory_mode = True
-        self.victory_timer = 0
-        if "victory" in winner.frame_ranges:
-            winner.set_action("victory")
-        else:
-            winner.set_action("idle")
-        if "defeat" in loser.frame_ranges:
-            loser.set_action("defeat")
-        else:
-            loser.set_action("crouch")
-        if winner.stand_active:
-            winner.stand_active = False
-            winner.stand = None
-            winner.stand_sprite_list.clear()
-        if loser.stand_active:
-            loser.stand_active = False
-            loser.stand = None
-            loser.stand_sprite_list.clear()
-        if winner.center_x < loser.center_x:
-            winner.facing_right = True
-            loser.facing_right = False
-        else:
-            winner.facing_right = False
-            loser.facing_right = True
+        # Шаги симуляции идут по накопленному времени, а не по числу вызовов: скорость боя
+        # не зависит ни от нагрузки, ни от частоты монитора
+        self.time_accumulator += delta_time
+        steps = 0
+        while self.time_accumulator >= SIMULATION_STEP and steps < MAX_SIMULATION_STEPS:
+            p1_input = self.get_player_input(P1_KEY_MAP)
+            p2_input = self.get_player_input(P2_KEY_MAP) | self.stick_input | self.dpad_input | self.button_input
+            self.player1.remember_position()
+            self.player2.remember_position()
+            self.play_events(self.match.step(p1_input, p2_input))
+            self.time_accumulator -= SIMULATION_STEP
+            steps += 1
+        if steps == MAX_SIMULATION_STEPS:
+            # После долгой паузы не ускоряем бой, а продолжаем с текущего момента
+            self.time_accumulator %= SIMULATION_STEP
+        alpha = self.time_accumulator / SIMULATION_STEP
+        self.player1.sync(alpha)
+        self.player2.sync(alpha)
+
+    def play_events(self, events):
+        for player_number, sound_name in events:
+            if player_number == 1:
+                self.player1.play_sound(sound_name)
+            elif player_number == 2:
+                self.player2.play_sound(sound_name)
+            else:
+                SfxMixer().play(SoundBank().open_stream(Path("Звук") / "Battle" / sound_name), "voice")
 
     def save_stats_to_db(self):
-        self.db.get_or_create_player(self.p1_name)
-        self.db.get_or_create_player(self.p2_name)
-        self.db.update_player_stats(self.p1_name, self.p1_stats.get_stats_dict())
-        self.db.update_player_stats(self.p2_name, self.p2_stats.get_stats_dict())
-        winner_name = self.p1_name if self.winner == self.player1 else self.p2_name
-        self.db.save_match(self.p1_name, self.p2_name, winner_name, self.p1_stats.points_earned,
-                           self.p2_stats.points_earned)
+        # Запись в базу идёт в фоновом потоке, меню открывается сразу
+        winner_name = self.p1_name if self.match.winner is self.match.fighter1 else self.p2_name
+        MatchWriter().submit({
+            "p1_name": self.p1_name,
+            "p2_name": self.p2_name,
+            "winner_name": winner_name,
+            "p1_stats": self.p1_stats.get_stats_dict(),
+            "p2_stats": self.p2_stats.get_stats_dict(),
+            "p1_points": self.p1_stats.points_earned,
+            "p2_points": self.p2_stats.points_earned,
+            "p1_character": self.p1_character_name,
+            "p2_character": self.p2_character_name,
+        })
+
+    def toggle_mirror_mode(self):
+        # Режим сравнения: переключает способ отражения кадров и печатает расход текстур
+        cache = TextureCache()
+        before = cache.memory_report()
+        cache.mirror_at_draw_time = not cache.mirror_at_draw_time
+        if cache.mirror_at_draw_time:
+            cache.drop_mirrored()
+        for player in (self.player1, self.player2):
+            if player:
+                player.reload_textures()
+        after = cache.memory_report()
+        for report in (before, after):
+            print(f"Отражение [{report['mode']}]: текстур {report['textures']} "
+                  f"(обычных {report['normal']}, отражённых {report['mirrored']}), "
+                  f"изображения {report['image_bytes'] / (1024 * 1024):.1f} МБ")
 
     def on_key_press(self, key, modifiers):
-        if self.intro_mode:
+        if key == arcade.key.F9:
+            self.toggle_mirror_mode()
             return
-        if self.victory_mode and self.show_stats:
+        # Ввод бойцов собирается в маски на каждом кадре, заставку и победу учитывает Match
+        self.pressed_keys.add(key)
+        if self.match.intro_mode:
+            return
+        if self.match.victory_mode and self.match.show_stats:
             if key == arcade.key.ENTER:
                 self.save_stats_to_db()
-                self.window.show_view(ModeMenuView())
+                ViewNavigator().show(ModeMenuView)
             return
-        if key == arcade.key.A:
-            self.p1_left = True
-        elif key == arcade.key.D:
-            self.p1_right = True
-        elif key == arcade.key.W:
-            self.p1_up = True
-        elif key == arcade.key.S:
-            self.p1_down = True
-        elif key == arcade.key.LSHIFT or key == arcade.key.RSHIFT:
-            self.p1_shift_was_pressed = True
-        elif key == arcade.key.J:
-            self.p1_attack1_pressed = True
-        elif key == arcade.key.I:
-            self.p1_attack2_pressed = True
-        elif key == arcade.key.L:
-            self.p1_attack3_pressed = True
-        elif key == arcade.key.U:
-            if self.player1:
-                self.p1_rush_pressed = True
-        elif key == arcade.key.K:
-            if self.player1:
-                self.p1_stand_pressed = True
-        elif key == arcade.key.LEFT:
-            self.p2_left = True
-        elif key == arcade.key.RIGHT:
-            self.p2_right = True
-        elif key == arcade.key.UP:
-            self.p2_up = True
-        elif key == arcade.key.DOWN:
-            self.p2_down = True
-        elif key == arcade.key.SPACE:
-            if self.player2 and not self.p2_attack_pressed:
-                self.player2.attack()
-                self.p2_attack_pressed = True
-        elif key == arcade.key.NUM_2:
-            if self.player2:
-                self.p2_rush_pressed = True
-        elif key == arcade.key.NUM_1:
-            if self.player2:
-                self.p2_stand_pressed = True
-        elif key == arcade.key.RCTRL:
-            self.p2_shift_was_pressed = True
-        elif key == arcade.key.ESCAPE:
-            self.window.show_view(ModeMenuView())
+        if key == arcade.key.ESCAPE:
+            ViewNavigator().show(ModeMenuView)
 
     def on_key_release(self, key, modifiers):
-        if self.intro_mode or self.victory_mode:
-            return
-        if key == arcade.key.A:
-            self.p1_left = False
-        elif key == arcade.key.D:
-            self.p1_right = False
-        elif key == arcade.key.W:
-            self.p1_up = False
-            self.p1_w_was_pressed = False
-        elif key == arcade.key.S:
-            self.p1_down = False
-        elif key == arcade.key.J:
-            self.p1_attack1_pressed = False
-        elif key == arcade.key.I:
-            self.p1_attack2_pressed = False
-        elif key == arcade.key.L:
-            self.p1_attack3_pressed = False
-        elif key == arcade.key.U:
-            self.p1_rush_pressed = False
-        elif key == arcade.key.K:
-            self.p1_stand_pressed = False
-        elif key == arcade.key.LSHIFT or key == arcade.key.RSHIFT:
-            self.p1_shift_was_pressed = False
-        elif key == arcade.key.LEFT:
-            self.p2_left = False
-        elif key == arcade.key.RIGHT:
-            self.p2_right = False
-        elif key == arcade.key.UP:
-            self.p2_up = False
-            self.p2_up_was_pressed = False
-        elif key == arcade.key.DOWN:
-            self.p2_down = False
-        elif key == arcade.key.SPACE:
-            self.p2_attack_pressed = False
-        elif key == arcade.key.NUM_2:
-            self.p2_rush_pressed = False
-        elif key == arcade.key.NUM_1:
-            self.p2_stand_pressed = False
-        elif key == arcade.key.RCTRL:
-            self.p2_shift_was_pressed = False
+        self.pressed_keys.discard(key)
+
+    def on_hide_view(self):
+        # Звуки боя отпускаются, но остаются в банке до вытеснения - реванш их не перечитывает
+        for player in (self.player1, self.player2):
+            if player:
+                player.release_sounds()
 
 class LeaderboardView(arcade.View):
     def __init__(self):
         super().__init__()
         self.db = Database()
-        self.leaders = self.db.get_leaderboard(15)
-        self.bg_sprite_list = arcade.SpriteList()
-        bg_path = Path("Лого") / "fon_menu.png"
-        orig_w, orig_h = 128, 64
-        self.bg_scale = SCREEN_WIDTH / (5 * orig_w)
-        self.tile_w, self.tile_h = orig_w * self.bg_scale, orig_h * self.bg_scale
-        self.rows = 8
-        if bg_path.exists():
-            for r in range(self.rows):
-                for c in range(5):
-                    s = arcade.Sprite(str(bg_path), scale=self.bg_scale)
-                    s.center_x = c * self.tile_w + (self.tile_w / 2)
-                    s.center_y = r * self.tile_h + (self.tile_h / 2)
-                    self.bg_sprite_list.append(s)
+        self.scroll = 0
+        self.leaders = []
+        self.player_count = 0
+        self.show_characters = False
+        self.character_stats = []
+        self.hud = Hud()
+        self.background = MenuBackground()
         self.select_sound = None
         self.confirm_sound = None
         self.music_manager = None
 
-    def on_show(self):
+    def on_show_view(self):
+        # Таблица берётся из кэша базы; после нового матча кэш уже сброшен записью
+        self.show_characters = False
+        self.scroll_to(0)
         if self.music_manager:
             self.music_manager.play_menu_music()
 
     def on_update(self, delta_time):
-        for s in self.bg_sprite_list:
-            s.center_y -= 3.0
-            if s.top < 0:
-                s.center_y += self.rows * self.tile_h
+        self.background.update(delta_time)
 
     def on_draw(self):
         self.clear()
-        self.bg_sprite_list.draw()
-        arcade.draw_rect_filled(arcade.LRBT(0, SCREEN_WIDTH, 0, SCREEN_HEIGHT), (0, 0, 0, 200))
-        arcade.draw_text("ТАБЛИЦА ЛИДЕРОВ", SCREEN_WIDTH // 2, SCREEN_HEIGHT - 100, arcade.color.GOLD, 40, anchor_x="center", bold=True)
+        self.background.draw()
+        hud = self.hud
+        hud.begin()
+        hud.rect("dim", 0, 0, SCREEN_WIDTH, SCREEN_HEIGHT, (0, 0, 0, 200))
+        if self.show_characters:
+            self.draw_character_stats()
+            hud.draw()
+            return
+        hud.text("title", "ТАБЛИЦА ЛИДЕРОВ", SCREEN_WIDTH // 2, SCREEN_HEIGHT - 100, arcade.color.GOLD, 40, anchor_x="center", bold=True)
         if not self.leaders:
-            arcade.draw_text("Пока нет игроков", SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2, arcade.color.GRAY, 24, anchor_x="center")
+            hud.text("empty", "Пока нет игроков", SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2, arcade.color.GRAY, 24, anchor_x="center")
         else:
-            arcade.draw_text("№", SCREEN_WIDTH // 2 - 350, SCREEN_HEIGHT - 180, arcade.color.CYAN, 18, anchor_x="center")
-            arcade.draw_text("ИМЯ", SCREEN_WIDTH // 2 - 250, SCREEN_HEIGHT - 180, arcade.color.CYAN, 18, anchor_x="center")
-            arcade.draw_text("ОЧКИ", SCREEN_WIDTH // 2 - 100, SCREEN_HEIGHT - 180, arcade.color.CYAN, 18, anchor_x="center")
-            arcade.draw_text("ИГРЫ", SCREEN_WIDTH // 2, SCREEN_HEIGHT - 180, arcade.color.CYAN, 18, anchor_x="center")
-            arcade.draw_text("ПОБЕДЫ", SCREEN_WIDTH // 2 + 100, SCREEN_HEIGHT - 180, arcade.color.CYAN, 18, anchor_x="center")
-            arcade.draw_text("УБИЙСТВА", SCREEN_WIDTH // 2 + 200, SCREEN_HEIGHT - 180, arcade.color.CYAN, 18, anchor_x="center")
-            arcade.draw_text("КОМБО", SCREEN_WIDTH // 2 + 300, SCREEN_HEIGHT - 180, arcade.color.CYAN, 18, anchor_x="center")
-            for i, leader in enumerate(self.leaders):
-                y = SCREEN_HEIGHT - 220 - i * 35
+            for title, offset in LEADERBOARD_COLUMNS:
+                hud.text(("header", title), title, SCREEN_WIDTH // 2 + offset, SCREEN_HEIGHT - 180, arcade.color.CYAN, 18, anchor_x="center")
+            for row, leader in enumerate(self.leaders):
+                y = SCREEN_HEIGHT - 220 - row * 35
+                i = self.scroll + row
                 if i == 0:
                     color = arcade.color.GOLD
                 elif i == 1:
@@ -2494,30 +1792,90 @@ class LeaderboardView(arcade.View):
                     color = arcade.color.BROWN
                 else:
                     color = arcade.color.WHITE
-                arcade.draw_text(f"{i + 1}", SCREEN_WIDTH // 2 - 350, y, color, 16, anchor_x="center")
-                arcade.draw_text(leader[0], SCREEN_WIDTH // 2 - 250, y, color, 16, anchor_x="center")
-                arcade.draw_text(str(leader[1]), SCREEN_WIDTH // 2 - 100, y, color, 16, anchor_x="center")
-                arcade.draw_text(str(leader[2]), SCREEN_WIDTH // 2, y, color, 16, anchor_x="center")
-                arcade.draw_text(str(leader[3]), SCREEN_WIDTH // 2 + 100, y, color, 16, anchor_x="center")
-                arcade.draw_text(str(leader[5]), SCREEN_WIDTH // 2 + 200, y, color, 16, anchor_x="center")
-                arcade.draw_text(str(leader[7]), SCREEN_WIDTH // 2 + 300, y, color, 16, anchor_x="center")
-        arcade.draw_text("ESC - назад | R - обновить", SCREEN_WIDTH // 2, 100, arcade.color.GRAY, 18, anchor_x="center")
+                values = (i + 1, leader[0], leader[1], leader[2], leader[3], leader[5], leader[7])
+                for column, value in enumerate(values):
+                    offset = LEADERBOARD_COLUMNS[column][1]
+                    hud.text(("cell", row, column), value, SCREEN_WIDTH // 2 + offset, y, color, 16, anchor_x="center")
+            hud.text("position", f"{self.scroll + 1}-{self.scroll + len(self.leaders)} из {self.player_count}",
+                     SCREEN_WIDTH // 2, 140, arcade.color.GRAY, 16, anchor_x="center")
+        hud.text("hint", "ESC - назад | ↑↓ PgUp PgDn - листать | R - обновить | C - персонажи",
+                 SCREEN_WIDTH // 2, 100, arcade.color.GRAY, 18, anchor_x="center")
+        hud.draw()
+
+    def draw_character_stats(self):
+        hud = self.hud
+        hud.text("characters_title", "ПЕРСОНАЖИ", SCREEN_WIDTH // 2, SCREEN_HEIGHT - 100, arcade.color.GOLD, 40, anchor_x="center", bold=True)
+        if not self.character_stats:
+            hud.text("characters_empty", "Пока нет матчей", SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2, arcade.color.GRAY, 24, anchor_x="center")
+        else:
+            hud.text("characters_name", "ПЕРСОНАЖ", SCREEN_WIDTH // 2 - 200, SCREEN_HEIGHT - 180, arcade.color.CYAN, 18, anchor_x="center")
+            hud.text("characters_games", "ИГРЫ", SCREEN_WIDTH // 2, SCREEN_HEIGHT - 180, arcade.color.CYAN, 18, anchor_x="center")
+            hud.text("characters_wins", "ПОБЕДЫ", SCREEN_WIDTH // 2 + 150, SCREEN_HEIGHT - 180, arcade.color.CYAN, 18, anchor_x="center")
+            hud.text("characters_rate", "% ПОБЕД", SCREEN_WIDTH // 2 + 300, SCREEN_HEIGHT - 180, arcade.color.CYAN, 18, anchor_x="center")
+            for i, (character, games, wins, win_rate) in enumerate(self.character_stats):
+                y = SCREEN_HEIGHT - 220 - i * 35
+                name = get_character_data(character)["display_name"] if character_exists(character) else character
+                hud.text(("character", i, 0), name, SCREEN_WIDTH // 2 - 200, y, arcade.color.WHITE, 16, anchor_x="center")
+                hud.text(("character", i, 1), games, SCREEN_WIDTH // 2, y, arcade.color.WHITE, 16, anchor_x="center")
+                hud.text(("character", i, 2), wins, SCREEN_WIDTH // 2 + 150, y, arcade.color.WHITE, 16, anchor_x="center")
+                hud.text(("character", i, 3), f"{win_rate:.0%}", SCREEN_WIDTH // 2 + 300, y, arcade.color.GOLD, 16, anchor_x="center")
+        hud.text("characters_hint", "ESC - назад | R - обновить | C - игроки", SCREEN_WIDTH // 2, 100, arcade.color.GRAY, 18, anchor_x="center")
+
+    def scroll_to(self, position):
+        # Число игроков запоминается здесь, а не спрашивается у базы каждый кадр
+        self.player_count = self.db.get_player_count()
+        last = max(0, self.player_count - LEADERBOARD_PAGE_SIZE)
+        self.scroll = max(0, min(position, last))
+        self.leaders = self.db.get_leaderboard(LEADERBOARD_PAGE_SIZE, self.scroll)
+
+    def on_mouse_scroll(self, x, y, scroll_x, scroll_y):
+        if not self.show_characters:
+            self.scroll_to(self.scroll - int(scroll_y) * 3)
 
     def on_key_press(self, key, modifiers):
         if key == arcade.key.ESCAPE:
             if self.select_sound:
                 arcade.play_sound(self.select_sound)
-            self.window.show_view(ModeMenuView())
+            ViewNavigator().show(ModeMenuView)
         elif key == arcade.key.R:
             if self.select_sound:
                 arcade.play_sound(self.select_sound)
-            self.leaders = self.db.get_leaderboard(15)
+            self.scroll_to(self.scroll)
+            self.character_stats = self.db.get_character_stats()
+        elif key in (arcade.key.UP, arcade.key.DOWN, arcade.key.PAGEUP, arcade.key.PAGEDOWN, arcade.key.HOME, arcade.key.END):
+            if self.show_characters:
+                return
+            steps = {
+                arcade.key.UP: -1,
+                arcade.key.DOWN: 1,
+                arcade.key.PAGEUP: -LEADERBOARD_PAGE_SIZE,
+                arcade.key.PAGEDOWN: LEADERBOARD_PAGE_SIZE,
+            }
+            if key == arcade.key.HOME:
+                self.scroll_to(0)
+            elif key == arcade.key.END:
+                self.scroll_to(self.db.get_player_count())
+            else:
+                self.scroll_to(self.scroll + steps[key])
+        elif key == arcade.key.C:
+            if self.select_sound:
+                arcade.play_sound(self.select_sound)
+            self.show_characters = not self.show_characters
+            if self.show_characters:
+                self.character_stats = self.db.get_character_stats()
 
 def main():
-    window = arcade.Window(SCREEN_WIDTH, SCREEN_HEIGHT, SCREEN_TITLE)
+    window = arcade.Window(SCREEN_WIDTH, SCREEN_HEIGHT, SCREEN_TITLE,
+                           update_rate=1 / RENDER_FPS, draw_rate=1 / RENDER_FPS, vsync=True)
+    # Записи из журнала, не попавшие в базу при прошлом запуске, переносятся сразу
+    MatchWriter()
     start_view = StartView()
     window.show_view(start_view)
     arcade.run()
+    AssetPreloader().shutdown()
+    if MatchWriter._instance:
+        MatchWriter._instance.shutdown()
+    Database.close_all()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,5 +1,3 @@
-import arcade
-
 POLNAREFF_CHARACTER = {
     "display_name": "Jean Pierre Polnareff",
     "file_prefix": "Pol",
@@ -100,6 +98,20 @@ POLNAREFF_CHARACTER = {
             "active_frames": (180, 181),
         },
     },
+    "sound_cues": {
+        "attack1": "Attack 1.wav",
+        "attack2": "Attack 1.wav",
+        "attack3": "Attack 1.wav",
+        "stand_attack1": "Attack 2.wav",
+        "stand_attack2": "Attack 3.wav",
+        "stand_attack3": "Attack 4.wav",
+        "stand_summon": "Stand On.wav",
+        "hit": ("Hurt 1.wav", "Hurt 2.wav", "Hurt 3.wav"),
+        "death": "Death scream.wav",
+        "victory": ("Win 1.wav", "Win 2.wav"),
+        "defeat": "Death scream.wav",
+    },
+
     "combo_window": 30,
     "crouch_freeze_frame": 45,
     "movement_speed": 2,
@@ -108,7 +120,7 @@ POLNAREFF_CHARACTER = {
     "dash_distance": 250,
     "dash_cooldown": 35,
     "sprite_scale": 2,
-    "color": arcade.color.LIGHT_GRAY
+    "color": (211, 211, 211, 255)
 }
 
 POLNAREFF_STAND = {
@@ -134,5 +146,5 @@ POLNAREFF_STAND = {
     "sprite_scale": 2,
     "offset_x": 0,
     "offset_y": 0,
-    "color": arcade.color.SILVER
+    "color": (192, 192, 192, 255)
 }
\ No newline at end of file
@@ -0,0 +1,50 @@
+"""Проверка голосов микшера звуков.
+
+Запуск: python sfx_check.py
+Проигрывает несколько коротких синусов через SfxVoice на беззвучном драйвере
+pyglet (звуковая карта не нужна) и проверяет, что плеер драйвера голоса не
+пересоздаётся ни при смене звука, ни после естественного конца звука, ни
+после stop(). Если пересоздаётся, скрипт завершается с кодом 1.
+"""
+import sys
+
+import pyglet
+
+pyglet.options["audio"] = ("silent",)
+
+from main import SfxVoice
+from pyglet.media import synthesis
+
+
+class Sound:
+    """Заменитель arcade.Sound: голосу нужен только источник pyglet"""
+
+    def __init__(self, duration):
+        self.source = synthesis.Sine(duration)
+
+
+def main():
+    voice = SfxVoice()
+    voice.start(Sound(0.05), "attack", 1.0, 1)
+    driver_player = voice.player._audio_player
+    checks = []
+    voice.start(Sound(0.05), "hurt", 1.0, 2)
+    checks.append(("смена звука", voice.player._audio_player))
+    # Так pyglet сообщает о конце звука
+    voice.player.dispatch_event("on_eos")
+    checks.append(("конец звука", voice.player._audio_player))
+    voice.start(Sound(0.05), "voice", 1.0, 3)
+    checks.append(("звук после конца", voice.player._audio_player))
+    voice.stop()
+    voice.start(Sound(0.05), "attack", 1.0, 4)
+    checks.append(("звук после stop()", voice.player._audio_player))
+    failed = False
+    for name, current in checks:
+        ok = driver_player is not None and current is driver_player
+        failed = failed or not ok
+        print(f"{name}: {'OK' if ok else 'плеер драйвера пересоздан'}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
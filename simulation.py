@@ -0,0 +1,1258 @@
+"""Логика боя без отрисовки.
+
+Матч продвигается по кадрам из битовых масок ввода и не зависит от arcade,
+pyglet и OpenGL: его можно гонять без окна (балансные прогоны, боты, CI),
+а GameView только рисует состояние бойцов и проигрывает звуки из событий.
+"""
+import random
+
+from harakteristici import (
+    SCREEN_WIDTH, SCREEN_HEIGHT, GRAVITY, GROUND_LEVEL,
+    character_exists,
+    get_character_data,
+    get_stand_data,
+    get_attack_data,
+    get_frame_sizes,
+    get_sound_cues
+)
+
+ATTACK_COOLDOWN = 20
+HIT_COOLDOWN = 30
+KNOCKBACK_DURATION = 10
+COMBO_WINDOW = 30
+BLOCK_DURATION = 30
+INTRO_ANIMATION_DURATION = 240
+VICTORY_ANIMATION_DURATION = 200
+
+STAND_METER_MAX = 100
+STAND_METER_SUMMON_COST = 10
+STAND_METER_BLOCK_DRAIN = 20
+STAND_METER_BLOCK_DRAIN_NO_STAND = 10
+STAND_METER_GAIN_ON_HIT = 15
+STAND_METER_GAIN_ON_BLOCK = 5
+STAND_METER_GAIN_ON_ATTACK = 2
+STAND_METER_PASSIVE_GAIN = 0.1
+
+POINTS_PER_KILL = 100
+POINTS_PER_HIT = 10
+POINTS_PER_COMBO = 25
+POINTS_PER_BLOCK = 5
+POINTS_PER_DASH = 2
+POINTS_PER_JUMP = 1
+POINTS_PER_STAND_SUMMON = 15
+POINTS_WIN_BONUS = 50
+
+STAND_DAMAGE_DRAIN = 15
+STAND_DAMAGE_DRAIN_NO_STAND = 5
+
+# Размер исходного кадра спрайта, по нему бойцы упираются в края экрана
+DEFAULT_FRAME_SIZE = (384, 224)
+_frame_sizes_cache = {}
+
+# Биты ввода одного игрока за кадр
+INPUT_LEFT = 1
+INPUT_RIGHT = 2
+INPUT_UP = 4
+INPUT_DOWN = 8
+INPUT_DASH = 16
+INPUT_ATTACK1 = 32
+INPUT_ATTACK2 = 64
+INPUT_ATTACK3 = 128
+INPUT_STAND = 256
+INPUT_RUSH = 512
+
+# Звуки матча (не конкретного бойца) приходят в событиях с номером игрока 0
+ROUND_START_SOUND_1 = "Round Start Voiceline.wav"
+ROUND_START_SOUND_2 = "Round Start Voiceline 2.wav"
+
+
+def get_fighter_frame_sizes(character_name):
+    # Размеры читаются с диска один раз на персонажа и общие для всех матчей
+    if character_name not in _frame_sizes_cache:
+        _frame_sizes_cache[character_name] = get_frame_sizes(character_name)
+    return _frame_sizes_cache[character_name]
+
+
+class PlayerStats:
+    def __init__(self, player_name):
+        self.player_name = player_name
+        self.hits_landed = 0
+        self.blocks_successful = 0
+        self.dashes_used = 0
+        self.jumps_used = 0
+        self.stands_summoned = 0
+        self.combos_completed = 0
+        self.kills = 0
+        self.points_earned = 0
+
+    def add_hit(self):
+        self.hits_landed += 1
+        self.points_earned += POINTS_PER_HIT
+
+    def add_block(self):
+        self.blocks_successful += 1
+        self.points_earned += POINTS_PER_BLOCK
+
+    def add_dash(self):
+        self.dashes_used += 1
+        self.points_earned += POINTS_PER_DASH
+
+    def add_jump(self):
+        self.jumps_used += 1
+        self.points_earned += POINTS_PER_JUMP
+
+    def add_stand_summon(self):
+        self.stands_summoned += 1
+        self.points_earned += POINTS_PER_STAND_SUMMON
+
+    def add_combo(self):
+        self.combos_completed += 1
+        self.points_earned += POINTS_PER_COMBO
+
+    def add_kill(self):
+        self.kills += 1
+        self.points_earned += POINTS_PER_KILL
+
+    def add_win_bonus(self):
+        self.points_earned += POINTS_WIN_BONUS
+
+    def get_stats_dict(self):
+        return {
+            "total_points": self.points_earned,
+            "games_played": 1,
+            "wins": 1 if self.kills > 0 else 0,
+            "losses": 1 if self.kills == 0 else 0,
+            "kills": self.kills,
+            "hits_landed": self.hits_landed,
+            "blocks_successful": self.blocks_successful,
+            "dashes_used": self.dashes_used,
+            "jumps_used": self.jumps_used,
+            "stands_summoned": self.stands_summoned,
+            "combos_completed": self.combos_completed
+        }
+
+
+class StandAttackState:
+    def __init__(self, owner_stand):
+        self.owner_stand = owner_stand
+        self.owner = owner_stand.owner
+        self.stand_data = owner_stand.stand_data
+        self.rush_data = self.stand_data.get("rush_data", {})
+        self.attack_frames = self.rush_data.get("attack_frames", (296, 319))
+        self.offset_x = self.rush_data.get("attack_offset_x", 150)
+        self.offset_y = self.rush_data.get("attack_offset_y", 50)
+        self.center_x = 0
+        self.center_y = 0
+        self.current_frame = self.attack_frames[0]
+        self.frame_counter = 0
+        self.is_active = False
+        self.animation_speed = 2
+        self.loop_count = 0
+        self.max_loops = 2
+
+    def activate(self):
+        self.is_active = True
+        self.current_frame = self.attack_frames[0]
+        self.frame_counter = 0
+        self.loop_count = 0
+        self.update_position()
+
+    def deactivate(self):
+        self.is_active = False
+
+    def update_position(self):
+        if not self.owner:
+            return
+        dir_mult = 1 if self.owner.facing_right else -1
+        self.center_x = self.owner.center_x + (self.offset_x * dir_mult)
+        self.center_y = self.owner.center_y + self.offset_y
+
+    def update_animation(self):
+        if not self.is_active:
+            return
+        self.frame_counter += 1
+        if self.frame_counter >= self.animation_speed:
+            self.frame_counter = 0
+            self.current_frame += 1
+            if self.current_frame > self.attack_frames[1]:
+                self.loop_count += 1
+                if self.loop_count < self.max_loops:
+                    self.current_frame = self.attack_frames[0]
+                else:
+                    self.current_frame = self.attack_frames[1]
+        self.update_position()
+
+
+class StandState:
+    def __init__(self, owner):
+        self.owner = owner
+        self.stand_data = get_stand_data(owner.character_name)
+        self.animations = self.stand_data["animations"]
+        self.frame_ranges = {}
+        self.animation_speeds = {}
+        for anim_name, (frames, speed) in self.animations.items():
+            self.frame_ranges[anim_name] = frames
+            self.animation_speeds[anim_name] = speed
+        self.jump_loop = self.stand_data.get("jump_loop", None)
+        self.center_x = 0
+        self.center_y = 0
+        self.current_direction = owner.current_direction
+        self.current_action = "summon"
+        self.current_frame = self.frame_ranges["summon"][0]
+        self.frame_counter = 0
+        self.is_summoning = True
+        self.is_attacking = False
+        self.is_rushing = False
+        self.current_combo = 0
+        self.attack_timer = 0
+        self.has_hit_in_this_attack = False
+        self.attack_duration = 0
+        self.rush_data = self.stand_data.get("rush_data", {})
+        self.rush_main_frames = self.rush_data.get("main_frames", (237, 255))
+        self.rush_active_frames = self.rush_data.get("active_frames", (240, 251))
+        self.stand_attack = StandAttackState(self)
+        self.attack_activated = False
+
+    def set_action(self, new_action):
+        if new_action == self.current_action or new_action not in self.frame_ranges:
+            return
+        self.current_action = new_action
+        self.current_frame = self.frame_ranges[new_action][0]
+        self.frame_counter = 0
+
+    def start_attack(self, combo_number):
+        attack_name = f"attack{combo_number}"
+        if attack_name not in self.frame_ranges:
+            return False
+        self.current_combo = combo_number
+        self.is_attacking = True
+        self.has_hit_in_this_attack = False
+        self.is_rushing = False
+        self.set_action(attack_name)
+        start_frame, end_frame = self.frame_ranges[attack_name]
+        frame_count = end_frame - start_frame + 1
+        anim_speed = self.animation_speeds.get(attack_name, 5)
+        self.attack_duration = frame_count * anim_speed
+        self.attack_timer = self.attack_duration
+        return True
+
+    def start_rush(self):
+        if not self.rush_main_frames:
+            return False
+        self.is_rushing = True
+        self.is_attacking = True
+        self.has_hit_in_this_attack = False
+        self.current_combo = 0
+        self.attack_activated = False
+        self.current_action = "rush"
+        self.current_frame = self.rush_main_frames[0]
+        self.frame_counter = 0
+        frame_count = self.rush_main_frames[1] - self.rush_main_frames[0] + 1
+        anim_speed = 3
+        self.attack_duration = frame_count * anim_speed
+        self.attack_timer = self.attack_duration
+        return True
+
+    def check_attack_hit(self, opponent):
+        if not self.is_attacking or self.has_hit_in_this_attack or not opponent or self.is_rushing:
+            return False
+        stand_attack_name = f"stand_attack{self.current_combo}"
+        attack_data = get_attack_data(self.owner.character_name, stand_attack_name)
+        if not attack_data:
+            return False
+        active_frames = attack_data.get("active_frames", (0, 0))
+        if self.current_frame < active_frames[0] or self.current_frame > active_frames[1]:
+            return False
+        if opponent.hit_cooldown > 0:
+            return False
+        hitbox_width, hitbox_height = attack_data.get("hitbox", (80, 100))
+        offset_x = attack_data.get("offset_x", 80)
+        offset_y = attack_data.get("offset_y", 0)
+        if self.owner.facing_right:
+            hitbox_left = self.owner.center_x + offset_x - hitbox_width // 2
+        else:
+            hitbox_left = self.owner.center_x - offset_x - hitbox_width // 2
+        hitbox_right = hitbox_left + hitbox_width
+        hitbox_center_y = self.owner.center_y + offset_y
+        hitbox_bottom = hitbox_center_y - hitbox_height // 2
+        hitbox_top = hitbox_center_y + hitbox_height // 2
+        opponent_left, opponent_right, opponent_bottom, opponent_top = opponent.get_hurtbox()
+        if (hitbox_right > opponent_left and hitbox_left < opponent_right and
+                hitbox_top > opponent_bottom and hitbox_bottom < opponent_top):
+            self.has_hit_in_this_attack = True
+            damage = attack_data.get("damage", 15)
+            knockback = attack_data.get("knockback", 10)
+            knockback_dir = 1 if self.owner.facing_right else -1
+            opponent.take_damage(damage, knockback * knockback_dir)
+            self.owner.attack_hit = True
+            if self.owner.stats is not None:
+                self.owner.stats.add_hit()
+            return True
+        return False
+
+    def update_animation(self):
+        self.frame_counter += 1
+        if self.is_rushing:
+            anim_speed = 3
+        else:
+            anim_speed = self.animation_speeds.get(self.current_action, 5)
+        if self.frame_counter >= anim_speed:
+            self.frame_counter = 0
+            if self.is_rushing:
+                start_frame, end_frame = self.rush_main_frames
+                self.current_frame += 1
+                if not self.attack_activated and self.current_frame >= self.rush_active_frames[0]:
+                    self.attack_activated = True
+                    self.stand_attack.activate()
+                if self.current_frame > end_frame:
+                    self.is_attacking = False
+                    self.is_rushing = False
+                    self.current_action = "idle"
+                    if "idle" in self.frame_ranges:
+                        self.current_frame = self.frame_ranges["idle"][0]
+                    self.stand_attack.deactivate()
+                    self.attack_activated = False
+            else:
+                if self.current_action in self.frame_ranges:
+                    start_frame, end_frame = self.frame_ranges[self.current_action]
+                    if self.current_action == "jump" and self.jump_loop:
+                        loop_start, loop_end = self.jump_loop
+                        if self.current_frame < loop_start:
+                            self.current_frame += 1
+                        elif self.owner.center_y > GROUND_LEVEL + 5:
+                            if self.current_frame >= loop_end:
+                                self.current_frame = loop_start
+                            else:
+                                self.current_frame += 1
+                        elif self.owner.center_y <= GROUND_LEVEL:
+                            if self.current_frame < end_frame:
+                                self.current_frame += 1
+                            else:
+                                self.set_action("idle")
+                    else:
+                        self.current_frame += 1
+                        if self.current_frame > end_frame:
+                            if self.is_summoning and self.current_action == "summon":
+                                self.is_summoning = False
+                                self.set_action("idle")
+                            elif "attack" in self.current_action:
+                                self.is_attacking = False
+                                self.set_action("idle")
+                            else:
+                                self.current_frame = start_frame
+
+    def update(self):
+        if self.attack_timer > 0:
+            self.attack_timer -= 1
+            if self.attack_timer <= 0:
+                self.is_attacking = False
+                self.is_rushing = False
+        self.current_direction = self.owner.current_direction
+        self.stand_attack.update_animation()
+        if self.is_attacking and not self.is_rushing and self.owner.opponent:
+            self.check_attack_hit(self.owner.opponent)
+        if self.owner.is_blocking and self.owner.is_crouching:
+            if self.current_action != "block" and "block" in self.frame_ranges:
+                self.set_action("block")
+        elif not self.is_summoning and not self.is_attacking:
+            owner_action = self.owner.current_action
+            if owner_action in ["idle", "move_left", "move_right", "jump", "crouch", "dash_forward", "dash_backward"]:
+                if owner_action == "move_left":
+                    stand_action = "move_backward"
+                elif owner_action == "move_right":
+                    stand_action = "move_forward"
+                elif owner_action == "jump":
+                    stand_action = "jump"
+                elif owner_action in ["dash_forward", "dash_backward"]:
+                    stand_action = owner_action
+                else:
+                    stand_action = "idle"
+                self.set_action(stand_action)
+        self.update_animation()
+        dir_mult = 1 if self.owner.facing_right else -1
+        self.center_x = self.owner.center_x - (self.stand_data["offset_x"] * dir_mult)
+        self.center_y = self.owner.center_y + self.stand_data["offset_y"]
+
+
+class FighterState:
+    def __init__(self, character_name, start_pos_x, start_pos_y, player_number=1, opponent=None, rng=None):
+        if not character_exists(character_name):
+            raise ValueError(f"Персонаж {character_name} не найден!")
+        self.character_data = get_character_data(character_name)
+        self.character_name = character_name
+        self.player_number = player_number
+        self.opponent = opponent
+        self.rng = rng or random.Random()
+        # Звуки, которые боец запросил за кадр; их проигрывает отрисовка
+        self.events = []
+        self.sound_cues = get_sound_cues(character_name)
+        self.has_frame_cues = any(isinstance(trigger, tuple) for trigger in self.sound_cues)
+        self.cued_frame = None
+        self.combo_cooldown = 0
+        self.stats = None
+        self.hitbox_size = self.character_data.get("hitbox_size", (60, 120))
+        self.sprite_scale = self.character_data.get("sprite_scale", 0.5)
+        self.frame_sizes = get_fighter_frame_sizes(character_name)
+        self.animations = self.character_data["animations"]
+        self.frame_ranges = {}
+        self.animation_speeds = {}
+        for anim_name, (frames, speed) in self.animations.items():
+            self.frame_ranges[anim_name] = frames
+            self.animation_speeds[anim_name] = speed
+        self.max_health = self.character_data.get("health", 100)
+        self.current_health = self.max_health
+        self.movement_speed = self.character_data.get("movement_speed", 3)
+        self.jump_speed = self.character_data.get("jump_speed", 15)
+        self.base_animation_speed = self.character_data.get("animation_speed", 5)
+        self.crouch_freeze_frame = self.character_data.get("crouch_freeze_frame", None)
+        self.jump_loop = self.character_data.get("jump_loop", None)
+        self.attacks_data = self.character_data.get("attacks", {})
+        self.attack1_cooldown_max = 15
+        self.attack2_cooldown_max = 30
+        self.attack3_cooldown_max = 45
+        self.attack1_cooldown = 0
+        self.attack2_cooldown = 0
+        self.attack3_cooldown = 0
+        self.stand_rush_cooldown = 0
+        self.stand_rush_data = self.character_data.get("stand_rush_data", {})
+        self.last_rush_hit_frame = -1
+        self.rush_hit_counter = 0
+        self.rush_max_hits = 12
+        self.is_attacking = False
+        self.current_attack = None
+        self.attack_hit = False
+        self.has_hit_in_this_attack = False
+        self.hit_cooldown = 0
+        self.is_hit = False
+        self.knockback_velocity = 0
+        self.knockback_timer = 0
+        self.is_hit_animating = False
+        self.hit_timer = 0
+        self.dash_speed = self.character_data.get("dash_speed", 8)
+        self.dash_distance = self.character_data.get("dash_distance", 100)
+        self.dash_cooldown_max = self.character_data.get("dash_cooldown", 45)
+        self.dash_cooldown = 0
+        self.is_dashing = False
+        self.dash_direction = 0
+        self.dash_target_x = None
+        self.dash_start_x = None
+        self.stand = None
+        self.stand_active = False
+        self.is_summoning = False
+        self.double_jump_used = False
+        self.is_blocking = False
+        self.block_timer = 0
+        self.stand_meter = 0
+        self.stand_meter_max = STAND_METER_MAX
+        self.center_x = start_pos_x
+        self.center_y = start_pos_y
+        self.facing_right = True if player_number == 1 else False
+        self.current_direction = 0
+        self.current_frame = 0
+        self.frame_counter = 0
+        self.current_action = "idle"
+        self.current_animation_speed = self.get_action_animation_speed("idle")
+        self.is_jumping = False
+        self.is_crouching = False
+        self.crouch_freeze_frame_active = None
+        self.crouch_resume_frame = None
+        self.change_x = 0
+        self.change_y = 0
+
+    def play_sound(self, sound_name):
+        self.events.append(sound_name)
+
+    def play_cue(self, trigger):
+        sounds = self.sound_cues.get(trigger)
+        if sounds:
+            self.play_sound(sounds[0] if len(sounds) == 1 else self.rng.choice(sounds))
+
+    def play_frame_cues(self):
+        """Звуки, привязанные к кадрам анимаций: срабатывают один раз, когда кадр показан"""
+        if not self.has_frame_cues:
+            return
+        frame = (self.current_action, self.current_frame)
+        if frame != self.cued_frame:
+            self.cued_frame = frame
+            self.play_cue(frame)
+
+    def get_hurtbox(self):
+        width, height = self.hitbox_size
+        return (self.center_x - width // 2, self.center_x + width // 2,
+                self.center_y - height // 2, self.center_y + height // 2)
+
+    def get_action_animation_speed(self, action):
+        if action in self.animation_speeds:
+            return self.animation_speeds[action]
+        return self.base_animation_speed
+
+    def set_opponent(self, opponent):
+        self.opponent = opponent
+
+    def update_facing_direction(self):
+        if self.opponent and not self.is_attacking and not self.is_dashing and not self.is_blocking:
+            if self.opponent.center_x > self.center_x:
+                self.facing_right = True
+                self.current_direction = 0
+            else:
+                self.facing_right = False
+                self.current_direction = 1
+
+    def get_action_for_movement(self, moving_left, moving_right):
+        if self.facing_right:
+            if moving_left:
+                return "move_left"
+            elif moving_right:
+                return "move_right"
+        else:
+            if moving_left:
+                return "move_right"
+            elif moving_right:
+                return "move_left"
+        return None
+
+    def dismiss_stand(self):
+        self.stand_active = False
+        self.stand = None
+
+    def jump(self):
+        if self.is_summoning or self.is_attacking or self.is_blocking:
+            return False
+        if not self.is_jumping and not self.is_crouching and not self.is_dashing and self.center_y <= GROUND_LEVEL:
+            self.change_y = self.jump_speed
+            self.is_jumping = True
+            self.double_jump_used = False
+            self.set_action("jump")
+            if self.stats is not None:
+                self.stats.add_jump()
+            return True
+        elif self.stand_active and self.is_jumping and not self.double_jump_used and not self.is_dashing:
+            self.change_y = self.jump_speed
+            self.double_jump_used = True
+            if "jump" in self.frame_ranges:
+                self.current_frame = self.frame_ranges["jump"][0]
+            if self.stats is not None:
+                self.stats.add_jump()
+            return True
+        return False
+
+    def crouch(self, start_crouch=True):
+        if "crouch" not in self.frame_ranges or self.is_dashing or self.is_summoning or self.is_attacking:
+            return
+        start_frame, end_frame = self.frame_ranges["crouch"]
+        if start_crouch:
+            if not self.is_jumping and not self.is_crouching and not self.is_dashing:
+                self.is_crouching = True
+                self.is_blocking = True
+                self.block_timer = BLOCK_DURATION
+                self.set_action("crouch")
+                if self.crouch_freeze_frame and start_frame <= self.crouch_freeze_frame <= end_frame:
+                    self.crouch_freeze_frame_active = self.crouch_freeze_frame
+                else:
+                    self.crouch_freeze_frame_active = (start_frame + end_frame) // 2
+        else:
+            if self.is_crouching:
+                self.crouch_resume_frame = self.current_frame
+                self.is_crouching = False
+                self.crouch_freeze_frame_active = None
+                self.is_blocking = False
+
+    def dash(self, move_direction=None):
+        if self.is_dashing or self.is_jumping or self.is_crouching or self.dash_cooldown > 0 or self.is_summoning or self.is_attacking or self.is_blocking:
+            return False
+        if move_direction is not None:
+            self.dash_direction = move_direction
+        else:
+            if self.facing_right:
+                self.dash_direction = 1
+            else:
+                self.dash_direction = -1
+        if self.facing_right:
+            dash_action = "dash_forward" if self.dash_direction > 0 else "dash_backward"
+        else:
+            dash_action = "dash_forward" if self.dash_direction < 0 else "dash_backward"
+        if dash_action not in self.frame_ranges:
+            return False
+        self.dash_start_x = self.center_x
+        self.dash_target_x = self.center_x + (self.dash_distance * self.dash_direction)
+        if self.dash_target_x < 0:
+            self.dash_target_x = 0
+        elif self.dash_target_x > SCREEN_WIDTH:
+            self.dash_target_x = SCREEN_WIDTH
+        self.is_dashing = True
+        self.set_action(dash_action)
+        self.dash_cooldown = self.dash_cooldown_max
+        if self.stats is not None:
+            self.stats.add_dash()
+        return True
+
+    def toggle_stand(self):
+        if self.is_jumping or self.is_dashing or self.is_blocking:
+            return
+        if self.is_attacking and "stand_attack" not in self.current_action:
+            return
+        if self.stand_active:
+            self.dismiss_stand()
+            return True
+        else:
+            if self.stand_meter >= STAND_METER_SUMMON_COST:
+                self.play_cue("stand_summon")
+                self.stand_meter -= STAND_METER_SUMMON_COST
+                self.stand_active = True
+                self.is_summoning = True
+                self.set_action("stand_summon")
+                self.stand = StandState(self)
+                if self.stats is not None:
+                    self.stats.add_stand_summon()
+                return True
+            else:
+                return False
+
+    def stand_rush(self):
+        if not self.stand_active:
+            return False
+        if self.is_summoning or self.is_dashing or self.is_jumping or self.is_blocking or self.is_attacking:
+            return False
+        if not self.stand_rush_data:
+            return False
+        if self.stand_rush_cooldown > 0:
+            return False
+        self.is_attacking = True
+        self.current_attack = "stand_rush"
+        self.attack_hit = False
+        self.has_hit_in_this_attack = False
+        self.change_x = 0
+        self.last_rush_hit_frame = -1
+        self.rush_hit_counter = 0
+        self.rush_max_hits = 12
+        self.set_action("idle")
+        if self.stand:
+            self.stand.start_rush()
+        self.stand_rush_cooldown = self.stand_rush_data["cooldown"]
+        return True
+
+    def check_stand_rush_hit(self):
+        if not self.opponent or not self.stand:
+            return
+        if not self.stand_rush_data:
+            return
+        if not self.stand.stand_attack.is_active:
+            return
+        if self.rush_hit_counter >= self.rush_max_hits:
+            return
+        current_attack_frame = self.stand.stand_attack.current_frame
+        if self.last_rush_hit_frame == current_attack_frame:
+            return
+        frame_index = current_attack_frame - self.stand.stand_attack.attack_frames[0]
+        if frame_index % 2 != 0:
+            return
+        hitbox_data = self.stand_rush_data["attack_hitbox"]
+        hitbox_width = hitbox_data["width"]
+        hitbox_height = hitbox_data["height"]
+        attack = self.stand.stand_attack
+        hitbox_left = attack.center_x - hitbox_width // 2
+        hitbox_right = attack.center_x + hitbox_width // 2
+        hitbox_bottom = attack.center_y - hitbox_height // 2
+        hitbox_top = attack.center_y + hitbox_height // 2
+        opponent_left, opponent_right, opponent_bottom, opponent_top = self.opponent.get_hurtbox()
+        if (hitbox_right > opponent_left and hitbox_left < opponent_right and
+                hitbox_top > opponent_bottom and hitbox_bottom < opponent_top):
+            damage = self.stand_rush_data["damage_per_hit"]
+            knockback = self.stand_rush_data["knockback_per_hit"]
+            self.opponent.take_damage(damage, knockback)
+            self.last_rush_hit_frame = current_attack_frame
+            self.rush_hit_counter += 1
+            self.attack_hit = True
+            if self.stats is not None:
+                self.stats.add_hit()
+
+    def attack1(self):
+        if self.attack1_cooldown > 0 or self.is_summoning or self.is_dashing or self.is_jumping or self.is_blocking:
+            return False
+        if self.stand_active:
+            if self.stand and not self.stand.is_attacking:
+                self.stand.start_attack(1)
+                self.start_attack("stand_attack1")
+                return True
+        else:
+            if "attack1" not in self.frame_ranges:
+                return False
+            self.start_attack("attack1")
+            return True
+        return False
+
+    def attack2(self):
+        if self.attack2_cooldown > 0 or self.is_summoning or self.is_dashing or self.is_jumping or self.is_blocking:
+            return False
+        if self.stand_active:
+            if self.stand and not self.stand.is_attacking:
+                self.stand.start_attack(2)
+                self.start_attack("stand_attack2")
+                return True
+        else:
+            if "attack2" not in self.frame_ranges:
+                return False
+            self.start_attack("attack2")
+            return True
+        return False
+
+    def attack3(self):
+        if self.attack3_cooldown > 0 or self.is_summoning or self.is_dashing or self.is_jumping or self.is_blocking:
+            return False
+        if self.stand_active:
+            if self.stand and not self.stand.is_attacking:
+                self.stand.start_attack(3)
+                self.start_attack("stand_attack3")
+                return True
+        else:
+            if "attack3" not in self.frame_ranges:
+                return False
+            self.start_attack("attack3")
+            return True
+        return False
+
+    def start_attack(self, attack_name):
+        self.current_attack = attack_name
+        self.is_attacking = True
+        self.attack_hit = False
+        self.has_hit_in_this_attack = False
+        self.change_x = 0
+        self.play_cue(attack_name)
+        if attack_name == "attack1" or attack_name == "stand_attack1":
+            self.attack1_cooldown = self.attack1_cooldown_max
+        elif attack_name == "attack2" or attack_name == "stand_attack2":
+            self.attack2_cooldown = self.attack2_cooldown_max
+        elif attack_name == "attack3" or attack_name == "stand_attack3":
+            self.attack3_cooldown = self.attack3_cooldown_max
+        self.set_action(attack_name)
+        if "stand_" not in attack_name:
+            self.stand_meter = min(self.stand_meter_max, self.stand_meter + STAND_METER_GAIN_ON_ATTACK)
+        return True
+
+    def check_attack_hit(self):
+        if not self.is_attacking or self.has_hit_in_this_attack or not self.opponent:
+            return False
+        if "stand_" in self.current_action:
+            return False
+        attack_data = get_attack_data(self.character_name, self.current_action)
+        if not attack_data:
+            return False
+        active_frames = attack_data.get("active_frames", (0, 0))
+        if self.current_frame < active_frames[0] or self.current_frame > active_frames[1]:
+            return False
+        if self.opponent.hit_cooldown > 0:
+            return False
+        hitbox_width, hitbox_height = attack_data.get("hitbox", (50, 50))
+        offset_x = attack_data.get("offset_x", 50)
+        offset_y = attack_data.get("offset_y", 0)
+        if self.facing_right:
+            hitbox_left = self.center_x + offset_x - hitbox_width // 2
+        else:
+            hitbox_left = self.center_x - offset_x - hitbox_width // 2
+        hitbox_right = hitbox_left + hitbox_width
+        hitbox_center_y = self.center_y + offset_y
+        hitbox_bottom = hitbox_center_y - hitbox_height // 2
+        hitbox_top = hitbox_center_y + hitbox_height // 2
+        opponent_left, opponent_right, opponent_bottom, opponent_top = self.opponent.get_hurtbox()
+        if (hitbox_right > opponent_left and hitbox_left < opponent_right and
+                hitbox_top > opponent_bottom and hitbox_bottom < opponent_top):
+            self.attack_hit = True
+            self.has_hit_in_this_attack = True
+            damage = attack_data.get("damage", 10)
+            knockback = attack_data.get("knockback", 5)
+            knockback_dir = 1 if self.facing_right else -1
+            self.opponent.take_damage(damage, knockback * knockback_dir)
+            self.stand_meter = min(self.stand_meter_max, self.stand_meter + STAND_METER_GAIN_ON_ATTACK)
+            if self.stats is not None:
+                self.stats.add_hit()
+            return True
+        return False
+
+    def start_hit_animation(self):
+        if "hit" in self.animations:
+            self.is_hit_animating = True
+            self.hit_timer = 15
+            self.set_action("hit")
+            self.play_cue("hit")
+
+    def take_damage(self, damage, knockback_force):
+        if self.hit_cooldown > 0:
+            return
+        if self.stand_active:
+            drain_amount = self.character_data.get("stand_damage_drain", STAND_DAMAGE_DRAIN)
+            self.stand_meter = max(0, self.stand_meter - drain_amount)
+            if self.stand_meter <= 0:
+                self.stand_meter = 0
+                self.dismiss_stand()
+        else:
+            drain_amount = self.character_data.get("stand_damage_drain_no_stand", STAND_DAMAGE_DRAIN_NO_STAND)
+            self.stand_meter = max(0, self.stand_meter - drain_amount)
+        if not self.is_blocking:
+            self.stand_meter = min(self.stand_meter_max, self.stand_meter + STAND_METER_GAIN_ON_HIT)
+        self.start_hit_animation()
+        if self.is_blocking:
+            if self.stand_active:
+                if self.stand_meter >= STAND_METER_BLOCK_DRAIN:
+                    self.stand_meter -= STAND_METER_BLOCK_DRAIN
+                    self.stand_meter = min(self.stand_meter_max, self.stand_meter + STAND_METER_GAIN_ON_BLOCK)
+                    if self.stats is not None:
+                        self.stats.add_block()
+                    if self.stand_meter <= 0:
+                        self.stand_meter = 0
+                        self.dismiss_stand()
+                    # ИСПРАВЛЕНО: отталкивание в сторону атакующего
+                    self.center_x += knockback_force * 0.3
+                    self.hit_cooldown = 10
+                    return
+                else:
+                    self.is_blocking = False
+            else:
+                if self.stand_meter >= STAND_METER_BLOCK_DRAIN_NO_STAND:
+                    self.stand_meter -= STAND_METER_BLOCK_DRAIN_NO_STAND
+                    if self.stats is not None:
+                        self.stats.add_block()
+                    reduced_damage = int(damage * 0.5)
+                    reduced_knockback = int(knockback_force * 0.5)
+                    self.current_health -= reduced_damage
+                    if self.current_health < 0:
+                        self.current_health = 0
+                    self.stand_meter = min(self.stand_meter_max, self.stand_meter + STAND_METER_GAIN_ON_BLOCK)
+                    self.hit_cooldown = 10
+                    self.is_hit = True
+                    # ИСПРАВЛЕНО: отталкивание в сторону атакующего
+                    self.knockback_velocity = reduced_knockback
+                    self.knockback_timer = KNOCKBACK_DURATION // 2
+                    self.is_attacking = False
+                    self.is_dashing = False
+                    return
+                else:
+                    self.is_blocking = False
+        self.current_health -= damage
+        if self.current_health < 0:
+            self.current_health = 0
+        self.hit_cooldown = 5
+        self.is_hit = True
+        # ИСПРАВЛЕНО: отталкивание в сторону атакующего (убран множитель направления)
+        self.knockback_velocity = knockback_force
+        self.knockback_timer = KNOCKBACK_DURATION
+        self.is_attacking = False
+        self.is_dashing = False
+        self.change_x = 0
+        if self.current_health <= 0:
+            self.play_cue("death")
+
+    def can_move(self):
+        if self.is_attacking:
+            return False
+        if self.is_hit:
+            return False
+        if self.is_summoning:
+            return False
+        if self.is_dashing:
+            return False
+        if self.is_blocking:
+            return False
+        return True
+
+    def set_action(self, new_action):
+        if new_action == self.current_action:
+            return
+        if new_action in ["intro", "victory", "defeat"]:
+            pass
+        elif self.is_summoning and new_action not in ["stand_summon", "idle"]:
+            if new_action != "stand_summon":
+                return
+        elif self.is_jumping and new_action not in ["jump", "idle"]:
+            return
+        elif self.is_dashing and new_action not in ["dash_forward", "dash_backward", "idle"]:
+            return
+        if new_action in self.frame_ranges:
+            self.current_action = new_action
+            self.current_frame = self.frame_ranges[new_action][0]
+            self.frame_counter = 0
+            self.current_animation_speed = self.get_action_animation_speed(new_action)
+            if "attack" in new_action:
+                self.change_x = 0
+
+    def update_animation(self):
+        self.frame_counter += 1
+        if self.current_action not in self.frame_ranges:
+            return
+        start_frame, end_frame = self.frame_ranges[self.current_action]
+        if self.frame_counter >= self.current_animation_speed:
+            self.frame_counter = 0
+            if self.current_action == "jump":
+                if self.jump_loop:
+                    loop_start, loop_end = self.jump_loop
+                    if self.current_frame < loop_start:
+                        self.current_frame += 1
+                    elif self.center_y > GROUND_LEVEL + 5:
+                        if self.current_frame >= loop_end:
+                            self.current_frame = loop_start
+                        else:
+                            self.current_frame += 1
+                    elif self.center_y <= GROUND_LEVEL:
+                        if self.current_frame < end_frame:
+                            self.current_frame += 1
+                        else:
+                            self.current_frame = end_frame
+                            self.is_jumping = False
+                            self.set_action("idle")
+                else:
+                    self.current_frame += 1
+                    if self.current_frame > end_frame:
+                        self.current_frame = end_frame
+                        self.is_jumping = False
+                        self.set_action("idle")
+            elif self.current_action in ["intro", "victory", "defeat"]:
+                self.current_frame += 1
+                if self.current_frame > end_frame:
+                    self.current_frame = end_frame
+            elif self.current_action == "stand_summon":
+                self.current_frame += 1
+                if self.current_frame > end_frame:
+                    self.current_frame = end_frame
+                    self.is_summoning = False
+                    self.set_action("idle")
+            elif self.current_action == "crouch":
+                if self.is_crouching:
+                    self.block_timer = BLOCK_DURATION
+                    if self.crouch_freeze_frame_active is not None:
+                        if self.current_frame < self.crouch_freeze_frame_active:
+                            self.current_frame += 1
+                        else:
+                            self.current_frame = self.crouch_freeze_frame_active
+                    else:
+                        self.current_frame += 1
+                        if self.current_frame > end_frame:
+                            self.current_frame = end_frame
+                else:
+                    if self.crouch_resume_frame is not None:
+                        self.current_frame = self.crouch_resume_frame
+                        self.crouch_resume_frame = None
+                    self.current_frame += 1
+                    if self.current_frame > end_frame:
+                        self.current_frame = end_frame
+                        self.set_action("idle")
+            elif self.current_action in ["dash_forward", "dash_backward"]:
+                self.current_frame += 1
+                if self.current_frame > end_frame:
+                    if self.is_dashing:
+                        self.is_dashing = False
+                        self.dash_target_x = None
+                        self.dash_start_x = None
+                        self.dash_direction = 0
+                    self.set_action("idle")
+            elif "attack" in self.current_action:
+                self.current_frame += 1
+                if self.current_frame > end_frame:
+                    self.current_frame = end_frame
+                    self.is_attacking = False
+                    self.set_action("idle")
+            elif self.current_action == "hit":
+                self.current_frame += 1
+                if self.current_frame > end_frame:
+                    self.current_frame = end_frame
+                    if self.is_hit_animating:
+                        self.is_hit_animating = False
+                    if not self.is_attacking and not self.is_dashing and not self.is_jumping:
+                        self.set_action("idle")
+            else:
+                self.current_frame += 1
+                if self.current_frame > end_frame:
+                    self.current_frame = start_frame
+
+    def apply_physics(self):
+        # То же, что делал arcade.PhysicsEngineSimple без стен: сдвиг на скорость до update()
+        self.center_y += self.change_y
+        self.center_x += self.change_x
+
+    def update(self):
+        if self.attack1_cooldown > 0:
+            self.attack1_cooldown -= 1
+        if self.attack2_cooldown > 0:
+            self.attack2_cooldown -= 1
+        if self.attack3_cooldown > 0:
+            self.attack3_cooldown -= 1
+        if self.stand_rush_cooldown > 0:
+            self.stand_rush_cooldown -= 1
+        if self.dash_cooldown > 0:
+            self.dash_cooldown -= 1
+        if self.hit_cooldown > 0:
+            self.hit_cooldown -= 1
+        else:
+            self.is_hit = False
+        if self.hit_timer > 0:
+            self.hit_timer -= 1
+            if self.hit_timer <= 0:
+                self.is_hit_animating = False
+        if self.is_blocking:
+            self.block_timer -= 1
+            if self.block_timer <= 0:
+                self.is_blocking = False
+        if not self.stand_active:
+            self.stand_meter = min(self.stand_meter_max, self.stand_meter + STAND_METER_PASSIVE_GAIN)
+        if self.knockback_timer > 0:
+            self.knockback_timer -= 1
+            self.center_x += self.knockback_velocity
+            self.knockback_velocity *= 0.8
+        if self.is_attacking and not self.stand_active and "attack" in self.current_action and "stand" not in self.current_action:
+            self.check_attack_hit()
+        if self.is_attacking and self.current_attack == "stand_rush" and self.stand_active and self.stand:
+            self.check_stand_rush_hit()
+        if self.stand_active and self.stand:
+            if not self.stand.is_attacking and self.is_attacking:
+                if "stand_attack" in self.current_attack or self.current_attack == "stand_rush":
+                    self.is_attacking = False
+                    self.current_attack = None
+                    if not self.is_jumping and not self.is_dashing:
+                        self.set_action("idle")
+        if not self.is_attacking and not self.is_blocking and not self.is_hit_animating:
+            self.update_facing_direction()
+        if self.can_move() and not self.is_hit_animating:
+            self.center_x += self.change_x
+        else:
+            self.change_x = 0
+        if self.is_dashing and self.dash_target_x is not None:
+            distance = self.dash_target_x - self.center_x
+            if abs(distance) > self.dash_speed:
+                self.center_x += self.dash_speed if distance > 0 else -self.dash_speed
+            else:
+                self.center_x = self.dash_target_x
+                if not self.is_dashing:
+                    self.dash_target_x = None
+                    self.dash_start_x = None
+                    self.dash_direction = 0
+        else:
+            if not self.is_crouching and not self.is_dashing and not self.is_hit:
+                self.change_y -= GRAVITY
+        self.center_y += self.change_y
+        if self.center_y <= GROUND_LEVEL:
+            self.center_y = GROUND_LEVEL
+            self.change_y = 0
+            self.double_jump_used = False
+            if self.current_action == "jump" and not self.jump_loop:
+                self.is_jumping = False
+                self.set_action("idle")
+            elif self.current_action != "jump":
+                self.is_jumping = False
+        frame_width, frame_height = self.frame_sizes.get(self.current_frame, DEFAULT_FRAME_SIZE)
+        frame_width *= self.sprite_scale
+        frame_height *= self.sprite_scale
+        half_width = frame_width / 2
+        if self.center_x - half_width < 0:
+            self.center_x = half_width
+            if self.is_dashing:
+                self.is_dashing = False
+                self.dash_target_x = None
+                self.set_action("idle")
+        if self.center_x + half_width > SCREEN_WIDTH:
+            self.center_x = SCREEN_WIDTH - half_width
+            if self.is_dashing:
+                self.is_dashing = False
+                self.dash_target_x = None
+                self.set_action("idle")
+        if self.center_y + frame_height / 2 > SCREEN_HEIGHT:
+            self.center_y = SCREEN_HEIGHT - frame_height / 2
+            self.change_y = 0
+        self.update_animation()
+
+
+class Match:
+    """Один бой двух бойцов; step() продвигает его на кадр по маскам ввода игроков"""
+
+    def __init__(self, p1_character, p2_character, p1_stats=None, p2_stats=None, seed=None):
+        self.rng = random.Random(seed)
+        self.fighter1 = FighterState(p1_character, SCREEN_WIDTH // 4, GROUND_LEVEL, player_number=1, rng=self.rng)
+        self.fighter2 = FighterState(p2_character, 3 * SCREEN_WIDTH // 4, GROUND_LEVEL, player_number=2, rng=self.rng)
+        self.fighters = (self.fighter1, self.fighter2)
+        self.fighter1.stats = p1_stats
+        self.fighter2.stats = p2_stats
+        self.fighter1.set_opponent(self.fighter2)
+        self.fighter2.set_opponent(self.fighter1)
+        # События кадра: (номер игрока или 0 для звуков матча, имя звука)
+        self.events = []
+        self.frame = 0
+        self.intro_mode = True
+        self.intro_timer = 0
+        self.victory_mode = False
+        self.victory_timer = 0
+        self.show_stats = False
+        self.winner = None
+        self.loser = None
+        # Клавиши, зажатые во время заставки, не засчитываются до повторного нажатия
+        self._ignored_input = [0, 0]
+        self._previous_input = [0, 0]
+        self._up_latched = [False, False]
+        self._down_latched = [False, False]
+        self._stand_pending = [False, False]
+        self._rush_pending = [False, False]
+        for fighter in self.fighters:
+            if "intro" in fighter.frame_ranges:
+                fighter.set_action("intro")
+            else:
+                fighter.set_action("idle")
+        self.fighter1.facing_right = True
+        self.fighter2.facing_right = False
+
+    @property
+    def is_over(self):
+        return self.victory_mode
+
+    def step(self, p1_input=0, p2_input=0):
+        self.frame += 1
+        self.events = []
+        inputs = (p1_input, p2_input)
+        if self.intro_mode or self.victory_mode:
+            for i in range(2):
+                self._ignored_input[i] |= inputs[i]
+        else:
+            for i in range(2):
+                self._ignored_input[i] &= inputs[i]
+        self._step_frame([inputs[i] & ~self._ignored_input[i] for i in range(2)])
+        self._previous_input = list(inputs)
+        for fighter in self.fighters:
+            fighter.play_frame_cues()
+            for sound_name in fighter.events:
+                self.events.append((fighter.player_number, sound_name))
+            fighter.events.clear()
+        return self.events
+
+    def _step_frame(self, inputs):
+        fighter1, fighter2 = self.fighters
+        if self.intro_mode:
+            self.intro_timer += 1
+            if self.intro_timer == 60:
+                self.events.append((0, ROUND_START_SOUND_1))
+            elif self.intro_timer == 140:
+                self.events.append((0, ROUND_START_SOUND_2))
+            fighter1.update()
+            fighter2.update()
+            if self.intro_timer >= INTRO_ANIMATION_DURATION:
+                self.intro_mode = False
+                self.intro_timer = 0
+                fighter1.set_action("idle")
+                fighter2.set_action("idle")
+            return
+        if self.victory_mode:
+            self.victory_timer += 1
+            if self.winner:
+                self.winner.update()
+            if self.loser:
+                self.loser.update()
+            if self.victory_timer >= VICTORY_ANIMATION_DURATION and not self.show_stats:
+                self.show_stats = True
+                self.victory_timer = VICTORY_ANIMATION_DURATION
+            return
+        if fighter1.current_health <= 0:
+            self.finish(fighter2, fighter1)
+            return
+        if fighter2.current_health <= 0:
+            self.finish(fighter1, fighter2)
+            return
+        for i, fighter in enumerate(self.fighters):
+            self._apply_input(i, fighter, inputs[i])
+        fighter1.apply_physics()
+        fighter2.apply_physics()
+        for fighter in self.fighters:
+            fighter.update()
+            if fighter.stand_active and fighter.stand:
+                fighter.stand.update()
+
+    def _apply_input(self, i, fighter, bits):
+        left = bool(bits & INPUT_LEFT)
+        right = bool(bits & INPUT_RIGHT)
+        up = bool(bits & INPUT_UP)
+        down = bool(bits & INPUT_DOWN)
+        pressed = bits & ~self._previous_input[i]
+        if pressed & INPUT_STAND:
+            self._stand_pending[i] = True
+        if pressed & INPUT_RUSH:
+            self._rush_pending[i] = True
+        if not bits & INPUT_STAND:
+            self._stand_pending[i] = False
+        if not bits & INPUT_RUSH:
+            self._rush_pending[i] = False
+        if not up:
+            self._up_latched[i] = False
+        if fighter.is_summoning or fighter.is_hit:
+            fighter.change_x = 0
+            return
+        if not fighter.is_dashing and not fighter.is_attacking:
+            fighter.change_x = 0
+            if not fighter.is_crouching:
+                if left:
+                    fighter.change_x = -fighter.movement_speed
+                    if not fighter.is_jumping:
+                        action = fighter.get_action_for_movement(True, False)
+                        if action:
+                            fighter.set_action(action)
+                if right:
+                    fighter.change_x = fighter.movement_speed
+                    if not fighter.is_jumping:
+                        action = fighter.get_action_for_movement(False, True)
+                        if action:
+                            fighter.set_action(action)
+            if (not left and not right and
+                    not fighter.is_jumping and
+                    not fighter.is_attacking and
+                    fighter.current_action not in ["crouch"]):
+                fighter.set_action("idle")
+        if up and not self._up_latched[i]:
+            if not fighter.is_crouching and not fighter.is_dashing and not fighter.is_attacking:
+                fighter.jump()
+            self._up_latched[i] = True
+        if down and not self._down_latched[i]:
+            fighter.crouch(True)
+            self._down_latched[i] = True
+        if not down and self._down_latched[i]:
+            fighter.crouch(False)
+            self._down_latched[i] = False
+        if bits & INPUT_DASH and not fighter.is_dashing and fighter.dash_cooldown == 0:
+            if left:
+                fighter.dash(-1)
+            elif right:
+                fighter.dash(1)
+            else:
+                fighter.dash()
+        if bits & INPUT_ATTACK1:
+            fighter.attack1()
+        if bits & INPUT_ATTACK2:
+            fighter.attack2()
+        if bits & INPUT_ATTACK3:
+            fighter.attack3()
+        if self._rush_pending[i]:
+            fighter.stand_rush()
+            self._rush_pending[i] = False
+        if self._stand_pending[i] and not fighter.is_summoning and not fighter.is_attacking:
+            fighter.toggle_stand()
+            self._stand_pending[i] = False
+
+    def finish(self, winner, loser):
+        self.winner = winner
+        self.loser = loser
+        if winner.stats is not None:
+            winner.stats.add_kill()
+            winner.stats.add_win_bonus()
+        self.victory_mode = True
+        self.victory_timer = 0
+        if "victory" in winner.frame_ranges:
+            winner.play_cue("victory")
+            winner.set_action("victory")
+        else:
+            winner.set_action("idle")
+        if "defeat" in loser.frame_ranges:
+            loser.play_cue("defeat")
+            loser.set_action("defeat")
+        else:
+            loser.set_action("crouch")
+        if winner.stand_active:
+            winner.dismiss_stand()
+        if loser.stand_active:
+            loser.dismiss_stand()
+        if winner.center_x < loser.center_x:
+            winner.facing_right = True
+            loser.facing_right = False
+        else:
+            winner.facing_right = False
+            loser.facing_right = True
@@ -0,0 +1,189 @@
+"""Сборка звуков: поиск дубликатов, перекодирование и манифест.
+
+Запуск: python sound_builder.py [--check]
+Просматривает папки Звук и звук и находит одинаковые файлы по хэшу содержимого.
+Каждый уникальный WAV с 32/64-битными float-сэмплами перекодируется в 16-битный
+PCM с той же частотой и числом каналов: файл вдвое меньше, и его без
+преобразований читает стандартный декодер. Готовые файлы кладутся в
+Звук/build/<хэш>.wav, а Звук/sound_manifest.json сопоставляет пути, которые
+запрашивает игра (относительно папки Звук), с файлами для загрузки. Файлы,
+которые есть только в папке звук, тоже попадают в манифест. Звуки, нужные
+персонажам, меню и бою, которых нет ни в одной папке, печатаются при сборке и
+записываются в список missing. С флагом --check ничего не записывается.
+После изменения звуков сборку нужно повторить.
+"""
+import hashlib
+import json
+import struct
+import sys
+import wave
+from array import array
+from pathlib import Path
+
+from harakteristici import (
+    SOUNDS_ROOT,
+    SOUND_MANIFEST_NAME,
+    get_available_characters,
+    get_sound_folder,
+    get_used_sounds
+)
+from simulation import ROUND_START_SOUND_1, ROUND_START_SOUND_2
+
+# Первая папка главная: при совпадении путей берётся файл из неё
+SOUND_SOURCE_ROOTS = (Path(SOUNDS_ROOT), Path("звук"))
+SOUND_BUILD_DIR = Path(SOUNDS_ROOT) / "build"
+SOUND_MANIFEST_VERSION = 1
+WAVE_FORMAT_PCM = 1
+WAVE_FORMAT_IEEE_FLOAT = 3
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+
+def get_required_sounds():
+    """Пути (относительно папки Звук), которые запрашивает игра"""
+    required = [
+        "Menu/Menu Select.wav",
+        "Menu/Menu Confirm.wav",
+        "Menu/jojo_menu.mp3",
+        f"Battle/{ROUND_START_SOUND_1}",
+        f"Battle/{ROUND_START_SOUND_2}",
+    ]
+    for name in get_available_characters():
+        folder = get_sound_folder(name)
+        for sound_name in get_used_sounds(name) + ["Character Select.wav"]:
+            required.append(f"{folder}/{sound_name}")
+    return required
+
+
+def collect_sources():
+    """[(путь относительно корня звуков, файл)] по всем папкам, кроме папки сборки"""
+    sources = []
+    for root in SOUND_SOURCE_ROOTS:
+        if not root.exists():
+            continue
+        for file_path in sorted(root.rglob("*")):
+            if not file_path.is_file() or SOUND_BUILD_DIR in file_path.parents:
+                continue
+            if file_path.name == SOUND_MANIFEST_NAME:
+                continue
+            sources.append((file_path.relative_to(root).as_posix(), file_path))
+    return sources
+
+
+def file_hash(file_path):
+    digest = hashlib.sha1()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def read_wav_chunks(file_path):
+    """(формат, каналы, частота, бит на сэмпл, данные) из RIFF/WAVE или None"""
+    data = Path(file_path).read_bytes()
+    if data[:4] != b"RIFF" or data[8:12] != b"WAVE":
+        return None
+    fmt = None
+    samples = None
+    i = 12
+    while i + 8 <= len(data):
+        chunk_id = data[i:i + 4]
+        size = struct.unpack("<I", data[i + 4:i + 8])[0]
+        body = data[i + 8:i + 8 + size]
+        if chunk_id == b"fmt ":
+            fmt = struct.unpack("<HHIIHH", body[:16])
+            if fmt[0] == WAVE_FORMAT_EXTENSIBLE and len(body) >= 26:
+                # Настоящий формат - первые два байта GUID подформата
+                fmt = (struct.unpack("<H", body[24:26])[0],) + fmt[1:]
+        elif chunk_id == b"data":
+            samples = body
+        i += 8 + size + (size & 1)
+    if fmt is None or samples is None:
+        return None
+    format_tag, channels, rate, byte_rate, block_align, bits = fmt
+    return format_tag, channels, rate, bits, samples
+
+
+def transcode_wav(file_path, output_path):
+    """Перекодирует WAV в 16-битный PCM; False, если формат не поддерживается"""
+    wav = read_wav_chunks(file_path)
+    if wav is None:
+        return False
+    format_tag, channels, rate, bits, samples = wav
+    if format_tag == WAVE_FORMAT_IEEE_FLOAT and bits in (32, 64):
+        values = array("f" if bits == 32 else "d")
+        values.frombytes(samples[:len(samples) - len(samples) % values.itemsize])
+        if sys.byteorder != "little":
+            values.byteswap()
+        pcm = array("h", [int(max(-1.0, min(1.0, v)) * 32767) for v in values])
+    elif format_tag == WAVE_FORMAT_PCM and bits == 16:
+        pcm = array("h")
+        pcm.frombytes(samples[:len(samples) - len(samples) % 2])
+        if sys.byteorder != "little":
+            pcm.byteswap()
+    else:
+        return False
+    # Отсчёты в порядке байт машины: wave сам пишет их в файл little-endian
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with wave.open(str(output_path), "wb") as out:
+        out.setnchannels(channels)
+        out.setsampwidth(2)
+        out.setframerate(rate)
+        out.writeframes(pcm.tobytes())
+    return True
+
+
+def build_sounds(write=True):
+    sources = collect_sources()
+    by_hash = {}
+    for relative, file_path in sources:
+        by_hash.setdefault(file_hash(file_path), []).append((relative, file_path))
+    targets = {}
+    duplicates = {}
+    source_bytes = sum(file_path.stat().st_size for relative, file_path in sources)
+    build_bytes = 0
+    transcoded = 0
+    for digest, files in by_hash.items():
+        original = files[0][1]
+        target = original
+        if original.suffix.lower() == ".wav":
+            output_path = SOUND_BUILD_DIR / f"{digest[:16]}.wav"
+            if output_path.exists() or (write and transcode_wav(original, output_path)):
+                target = output_path
+                transcoded += 1
+        build_bytes += target.stat().st_size
+        for relative, file_path in files:
+            targets[file_path] = target.as_posix()
+        if len(files) > 1:
+            duplicates[digest] = [file_path.as_posix() for relative, file_path in files]
+    # Одинаковый путь в обеих папках - берётся файл из главной
+    sounds = {}
+    for relative, file_path in sources:
+        sounds.setdefault(relative, targets[file_path])
+    missing = [relative for relative in get_required_sounds() if relative not in sounds]
+    manifest = {
+        "version": SOUND_MANIFEST_VERSION,
+        "sounds": sounds,
+        "duplicates": duplicates,
+        "missing": missing,
+    }
+    if write:
+        with open(Path(SOUNDS_ROOT) / SOUND_MANIFEST_NAME, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=1)
+    return manifest, len(sources), len(by_hash), source_bytes, build_bytes, transcoded
+
+
+def main(write=True):
+    manifest, file_count, unique_count, source_bytes, build_bytes, transcoded = build_sounds(write)
+    only_secondary = [relative for relative in get_required_sounds()
+                      if relative in manifest["sounds"] and not (Path(SOUNDS_ROOT) / relative).exists()]
+    print(f"Файлов: {file_count}, уникальных: {unique_count}, "
+          f"групп дубликатов: {len(manifest['duplicates'])}, перекодировано: {transcoded}")
+    print(f"Размер: {source_bytes / (1024 * 1024):.1f} МБ -> {build_bytes / (1024 * 1024):.1f} МБ")
+    for relative in only_secondary:
+        print(f"Есть только в папке {SOUND_SOURCE_ROOTS[1]}: {relative}")
+    for relative in manifest["missing"]:
+        print(f"Нет звука: {SOUNDS_ROOT}/{relative}")
+
+
+if __name__ == "__main__":
+    main(write="--check" not in sys.argv[1:])
@@ -0,0 +1,210 @@
+"""Турнир ботов по всем парам персонажей на нескольких процессах.
+
+Запуск: python tournament.py [--rounds N] [--workers N] [--bot имя] [--p2-bot имя]
+                             [--output файл] [--seed N]
+Каждая упорядоченная пара персонажей из get_available_characters() (включая
+зеркальные) играет N матчей на simulation.Match. Результат каждого матча сразу
+дописывается строкой JSON в файл, в конце печатается матрица побед: строка -
+персонаж, столбец - соперник, в ячейке доля побед строки с обеих сторон.
+Матчи независимы, поэтому время падает почти пропорционально числу ядер.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import time
+
+from harakteristici import get_available_characters
+from simulation import (
+    STAND_METER_SUMMON_COST,
+    INPUT_LEFT, INPUT_RIGHT, INPUT_UP, INPUT_DOWN, INPUT_DASH,
+    INPUT_ATTACK1, INPUT_ATTACK2, INPUT_ATTACK3, INPUT_STAND, INPUT_RUSH,
+    PlayerStats,
+    Match
+)
+
+ALL_INPUTS = (INPUT_LEFT, INPUT_RIGHT, INPUT_UP, INPUT_DOWN, INPUT_DASH,
+              INPUT_ATTACK1, INPUT_ATTACK2, INPUT_ATTACK3, INPUT_STAND, INPUT_RUSH)
+# Бой дольше пяти минут (плюс заставка) записывается как ничья
+TOURNAMENT_MAX_FRAMES = 5 * 60 * 60 + 240
+TOURNAMENT_CHUNK_SIZE = 8
+
+
+class RandomBot:
+    """Жмёт случайный набор кнопок и держит его несколько кадров"""
+
+    def __init__(self, rng):
+        self.rng = rng
+        self.bits = 0
+        self.hold = 0
+
+    def __call__(self, match, me, opponent):
+        if self.hold <= 0:
+            self.bits = sum(bit for bit in ALL_INPUTS if self.rng.random() < 0.2)
+            self.hold = self.rng.randint(4, 12)
+        self.hold -= 1
+        return self.bits
+
+
+class AggressiveBot:
+    """Идёт на сближение, бьёт вблизи, иногда блокирует, вызывает стенд и делает раш"""
+
+    def __init__(self, rng, reach=150, block_chance=0.4):
+        self.rng = rng
+        self.reach = reach
+        self.block_chance = block_chance
+        self.frame = 0
+
+    def __call__(self, match, me, opponent):
+        self.frame += 1
+        bits = 0
+        distance = opponent.center_x - me.center_x
+        if abs(distance) > self.reach:
+            bits |= INPUT_RIGHT if distance > 0 else INPUT_LEFT
+            if abs(distance) > 3 * self.reach and me.dash_cooldown == 0:
+                bits |= INPUT_DASH
+        elif opponent.is_attacking and self.rng.random() < self.block_chance:
+            bits |= INPUT_DOWN
+        else:
+            bits |= self.rng.choice((INPUT_ATTACK1, INPUT_ATTACK2, INPUT_ATTACK3))
+        # Стенд и раш срабатывают по нажатию, поэтому кнопку отпускаем через кадр
+        if self.frame % 2 == 0:
+            if not me.stand_active and me.stand_meter >= 3 * STAND_METER_SUMMON_COST:
+                bits |= INPUT_STAND
+            elif me.stand_active and me.stand_rush_cooldown == 0 and abs(distance) < 2 * self.reach:
+                bits |= INPUT_RUSH
+        if opponent.is_jumping and abs(distance) < self.reach and self.rng.random() < 0.1:
+            bits |= INPUT_UP
+        return bits
+
+
+BOTS = {
+    "random": RandomBot,
+    "aggressive": AggressiveBot,
+}
+
+
+def play_match(task):
+    """Один матч без окна; task - (номер, персонаж P1, персонаж P2, бот P1, бот P2, seed)"""
+    match_id, p1_character, p2_character, p1_bot, p2_bot, seed = task
+    rng = random.Random(seed)
+    p1_stats = PlayerStats("P1")
+    p2_stats = PlayerStats("P2")
+    match = Match(p1_character, p2_character, p1_stats, p2_stats, seed=seed)
+    bot1 = BOTS[p1_bot](random.Random(rng.random()))
+    bot2 = BOTS[p2_bot](random.Random(rng.random()))
+    while not match.is_over and match.frame < TOURNAMENT_MAX_FRAMES:
+        # Кнопки, зажатые во время заставки, игра не засчитывает до повторного нажатия
+        if match.intro_mode or match.victory_mode:
+            match.step(0, 0)
+            continue
+        match.step(bot1(match, match.fighter1, match.fighter2),
+                   bot2(match, match.fighter2, match.fighter1))
+    winner = 0
+    if match.winner is match.fighter1:
+        winner = 1
+    elif match.winner is match.fighter2:
+        winner = 2
+    return {
+        "match": match_id,
+        "p1": p1_character,
+        "p2": p2_character,
+        "p1_bot": p1_bot,
+        "p2_bot": p2_bot,
+        "seed": seed,
+        "winner": winner,
+        "frames": match.frame,
+        "p1_health": match.fighter1.current_health,
+        "p2_health": match.fighter2.current_health,
+        "p1_stats": p1_stats.get_stats_dict(),
+        "p2_stats": p2_stats.get_stats_dict(),
+    }
+
+
+def make_tasks(characters, rounds, p1_bot, p2_bot, seed):
+    tasks = []
+    for p1_character in characters:
+        for p2_character in characters:
+            for _ in range(rounds):
+                match_id = len(tasks)
+                tasks.append((match_id, p1_character, p2_character, p1_bot, p2_bot, seed * 1000003 + match_id))
+    return tasks
+
+
+def matchup_matrix(results, characters):
+    """{(персонаж, соперник): [побед, матчей]} - с обеих сторон экрана.
+
+    Зеркальный матч считается один раз, победа - только за игрока 1: иначе клетка (A, A)
+    всегда была бы около 50%, а так показывает перевес первой стороны
+    """
+    matrix = {(a, b): [0, 0] for a in characters for b in characters}
+    for result in results:
+        p1, p2 = result["p1"], result["p2"]
+        matrix[(p1, p2)][1] += 1
+        if p1 == p2:
+            if result["winner"] == 1:
+                matrix[(p1, p2)][0] += 1
+            continue
+        matrix[(p2, p1)][1] += 1
+        if result["winner"] == 1:
+            matrix[(p1, p2)][0] += 1
+        elif result["winner"] == 2:
+            matrix[(p2, p1)][0] += 1
+    return matrix
+
+
+def print_matrix(matrix, characters):
+    width = max(len(name) for name in characters) + 2
+    print(" " * width + "".join(f"{name:>{width}}" for name in characters))
+    for a in characters:
+        cells = []
+        for b in characters:
+            wins, played = matrix[(a, b)]
+            cells.append(f"{(wins / played if played else 0):>{width}.1%}")
+        print(f"{a:<{width}}" + "".join(cells))
+
+
+def run_tournament(rounds=20, workers=None, p1_bot="aggressive", p2_bot=None, output="tournament_results.jsonl", seed=0):
+    characters = get_available_characters()
+    tasks = make_tasks(characters, rounds, p1_bot, p2_bot or p1_bot, seed)
+    workers = workers or os.cpu_count() or 1
+    results = []
+    started = time.time()
+    with open(output, "w", encoding="utf-8") as f:
+        if workers == 1:
+            stream = map(play_match, tasks)
+            pool = None
+        else:
+            pool = multiprocessing.Pool(workers)
+            stream = pool.imap_unordered(play_match, tasks, chunksize=TOURNAMENT_CHUNK_SIZE)
+        try:
+            for result in stream:
+                f.write(json.dumps(result, ensure_ascii=False) + "\n")
+                f.flush()
+                results.append(result)
+        finally:
+            if pool:
+                pool.close()
+                pool.join()
+    elapsed = time.time() - started
+    print(f"Матчей: {len(results)}, процессов: {workers}, время: {elapsed:.1f} с, результаты: {output}")
+    matrix = matchup_matrix(results, characters)
+    print_matrix(matrix, characters)
+    return matrix
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Турнир ботов по всем парам персонажей")
+    parser.add_argument("--rounds", type=int, default=20, help="матчей на каждую пару")
+    parser.add_argument("--workers", type=int, default=None, help="число процессов (по умолчанию - все ядра)")
+    parser.add_argument("--bot", choices=sorted(BOTS), default="aggressive", help="бот игрока 1 (и 2, если не задан)")
+    parser.add_argument("--p2-bot", choices=sorted(BOTS), default=None, help="бот игрока 2")
+    parser.add_argument("--output", default="tournament_results.jsonl", help="файл для результатов матчей")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    run_tournament(args.rounds, args.workers, args.bot, args.p2_bot, args.output, args.seed)
+
+
+if __name__ == "__main__":
+    main()